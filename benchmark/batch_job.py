@@ -2,6 +2,27 @@
 import sys
 import time
 
+def run_job(duration):
+    """
+    Simulate a CPU-intensive job for the given number of seconds
+
+    The job stops once the calling thread has used duration seconds of CPU
+    time, so a job suspended with SIGSTOP still owes the rest of its work
+    when it is resumed.
+
+    Args:
+        duration (float): How much CPU time to burn
+
+    Returns:
+        Actual elapsed time in seconds
+    """
+    start_time = time.time()
+    cpu_start = time.thread_time()
+    while time.thread_time() - cpu_start < duration:
+        # Perform some CPU-intensive calculations
+        _ = sum(i * i for i in range(1000))
+    return time.time() - start_time
+
 def main():
     """
     Simulate a CPU-intensive job
@@ -18,12 +39,9 @@ def main():
         sys.exit(1)
     
     # Simulate CPU-intensive work
-    start_time = time.time()
-    while time.time() - start_time < duration:
-        # Perform some CPU-intensive calculations
-        _ = sum(i * i for i in range(1000))
+    elapsed = run_job(duration)
     
-    print(f"Job completed in {time.time() - start_time:.2f} seconds")
+    print(f"Job completed in {elapsed:.2f} seconds")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,210 @@
+import sys
+import os
+import math
+import operator
+from array import array
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# NumPy is the declared requirement for large result sets (pip install
+# .[analysis]); with it a million-job run is analyzed in a fraction of a
+# second. Without it, columns are array('d') and each is sorted once for its
+# percentiles, which takes a few seconds per million jobs.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Lower bound on exec_time when computing bounded slowdown, so near-zero
+# jobs do not dominate the metric
+SLOWDOWN_THRESHOLD = 0.1
+
+PERCENTILES = (50, 95, 99)
+
+# Two-sided 95% Student t critical values by degrees of freedom; between
+# entries the value for fewer degrees is used, which widens the interval slightly
+T_CRITICAL_95 = ((1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (5, 2.571), (6, 2.447),
+                 (7, 2.365), (8, 2.306), (9, 2.262), (10, 2.228), (12, 2.179), (15, 2.131),
+                 (20, 2.086), (30, 2.042), (60, 2.000), (120, 1.980))
+
+def to_column(values):
+    """
+    Convert a sequence of numbers to a float column
+
+    Args:
+        values: Iterable of numbers
+
+    Returns:
+        A NumPy float64 array if NumPy is installed, otherwise array('d')
+    """
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    return array('d', values)
+
+def subtract(a, b):
+    """
+    Element-wise a - b
+    """
+    if np is not None:
+        return a - b
+    return array('d', map(operator.sub, a, b))
+
+def bounded_slowdown(turnaround, exec_times):
+    """
+    Element-wise turnaround / max(exec_time, SLOWDOWN_THRESHOLD), at least 1
+    """
+    if np is not None:
+        return np.maximum(turnaround / np.maximum(exec_times, SLOWDOWN_THRESHOLD), 1.0)
+    threshold = SLOWDOWN_THRESHOLD
+    ratios = [value / (exec_time if exec_time > threshold else threshold)
+              for value, exec_time in zip(turnaround, exec_times)]
+    return array('d', [ratio if ratio > 1.0 else 1.0 for ratio in ratios])
+
+def concatenate(columns):
+    """
+    Join several columns end to end
+    """
+    if np is not None:
+        return np.concatenate(columns) if columns else np.empty(0)
+    joined = array('d')
+    for column in columns:
+        joined.extend(column)
+    return joined
+
+def summarize(column):
+    """
+    Summarize a column
+
+    Args:
+        column: Float column
+
+    Returns:
+        Dictionary with count, mean, max, p50/p95/p99 and Jain's fairness index
+    """
+    count = len(column)
+    if count == 0:
+        summary = {"count": 0, "mean": 0, "max": 0, "fairness": 1.0}
+        summary.update({f"p{p}": 0 for p in PERCENTILES})
+        return summary
+
+    if np is not None:
+        total = float(column.sum())
+        squares = float(np.dot(column, column))
+        maximum = float(column.max())
+        values = np.percentile(column, PERCENTILES)
+    else:
+        total = math.fsum(column)
+        squares = sum(map(operator.mul, column, column))
+        ordered = sorted(column)
+        maximum = ordered[-1]
+        values = [_interpolate(ordered, p) for p in PERCENTILES]
+
+    summary = {
+        "count": count,
+        "mean": total / count,
+        "max": maximum,
+        # Jain's index: 1.0 when every job sees the same value
+        "fairness": total * total / (count * squares) if squares > 0 else 1.0,
+    }
+    for p, value in zip(PERCENTILES, values):
+        summary[f"p{p}"] = float(value)
+    return summary
+
+def confidence_interval(values):
+    """
+    Mean of independent samples with the half-width of its 95% confidence interval
+
+    Args:
+        values: Sequence of numbers, e.g. one metric over several seeds
+
+    Returns:
+        Tuple (mean, half-width); the half-width is None with fewer than two values
+    """
+    count = len(values)
+    if count == 0:
+        return 0, None
+    mean = math.fsum(values) / count
+    if count < 2:
+        return mean, None
+    variance = math.fsum((value - mean) ** 2 for value in values) / (count - 1)
+    critical = min(t for degrees, t in T_CRITICAL_95 if degrees <= count - 1)
+    return mean, critical * math.sqrt(variance / count)
+
+def _interpolate(ordered, percent):
+    """
+    Linearly interpolated percentile of a sorted list, matching numpy.percentile
+    """
+    position = (len(ordered) - 1) * percent / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def load_columns(result):
+    """
+    Load the per-job timing columns of one run
+
+    Runs recorded with arrival, start, end and exec times get waiting,
+    turnaround and slowdown columns; older runs only have response_times,
+    which are used as the turnaround column.
+
+    Args:
+        result: A result dictionary from the test runner or simulator
+
+    Returns:
+        Dictionary mapping metric name to a float column
+    """
+    if "arrival_times" in result and "end_times" in result:
+        arrival = to_column(result["arrival_times"])
+        start = to_column(result["start_times"])
+        end = to_column(result["end_times"])
+        turnaround = subtract(end, arrival)
+        columns = {
+            "waiting_time": subtract(start, arrival),
+            "turnaround_time": turnaround,
+            "service_time": subtract(end, start),
+        }
+        if "exec_times" in result:
+            columns["slowdown"] = bounded_slowdown(turnaround, to_column(result["exec_times"]))
+        return columns
+
+    columns = {"turnaround_time": to_column(result.get("response_times", []))}
+    if "waiting_times" in result:
+        columns["waiting_time"] = to_column(result["waiting_times"])
+    return columns
+
+def analyze_run(result):
+    """
+    Compute every metric for one run
+
+    Args:
+        result: A result dictionary from the test runner or simulator
+
+    Returns:
+        Dictionary mapping metric name to its summary
+    """
+    return {name: summarize(column) for name, column in load_columns(result).items()}
+
+def analyze_by_policy(results):
+    """
+    Compute every metric per policy, pooling the jobs of all runs of a policy
+
+    Args:
+        results: Iterable of result dictionaries
+
+    Returns:
+        Dictionary mapping policy to {metric name: summary}
+    """
+    pooled = {}
+    for result in results:
+        columns = load_columns(result)
+        policy_columns = pooled.setdefault(result["policy"], {})
+        for name, column in columns.items():
+            policy_columns.setdefault(name, []).append(column)
+
+    return {
+        policy: {name: summarize(concatenate(parts)) for name, parts in columns.items()}
+        for policy, columns in pooled.items()
+    }
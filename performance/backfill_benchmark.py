@@ -0,0 +1,130 @@
+import sys
+import os
+import time
+import random
+import argparse
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+from src.resources import ResourcePool, Node, BACKFILL_MODES
+from src.metrics import Histogram
+from performance.simulator import simulate
+
+CPU_CHOICES = (1, 1, 1, 2, 4, 8, 16, 32, 64)
+
+def measure_decisions(mode, num_queued, num_decisions, cpus=64, seed=1):
+    """
+    Time single scheduling decisions against a deep queue and a busy node
+
+    Every decision is one get_job call that scans up to BACKFILL_DEPTH jobs,
+    building the reservation profile on the way. A placed job is released
+    and queued again so every decision sees the same load.
+
+    Args:
+        mode: Backfill mode
+        num_queued: Number of jobs waiting in the queue
+        num_decisions: Number of decisions to time
+        cpus: CPUs of the single node
+        seed: Random seed for the job mix
+
+    Returns:
+        Dictionary with decision latency percentiles in microseconds
+    """
+    rng = random.Random(seed)
+    now = [0.0]
+    pool = ResourcePool([Node("node", cpus)], mode, clock=lambda: now[0])
+    # Keep all but a few CPUs busy with jobs ending at different times
+    for i in range(cpus - 3):
+        pool.place(Job(f"running{i}", rng.uniform(1, 100)))
+
+    queue = JobQueue()
+    queue.add_jobs([Job(f"queued{i}", rng.uniform(1, 100), cpus=rng.choice(CPU_CHOICES))
+                    for i in range(num_queued)])
+
+    histogram = Histogram()
+    for _ in range(num_decisions):
+        start = time.perf_counter()
+        job = queue.get_job(pool.place, block=False)
+        histogram.record(time.perf_counter() - start)
+        if job is not None:
+            pool.release(job)
+            queue.add_job(job)
+
+    summary = histogram.summary()
+    return {
+        "mode": mode,
+        "num_queued": num_queued,
+        "mean_us": summary["mean"] * 1e6,
+        "p99_us": summary["p99"] * 1e6,
+        "max_us": summary["max"] * 1e6,
+    }
+
+def synthetic_workload(num_jobs, cpus=64, load=0.9, seed=1):
+    """
+    Generate a workload of mixed-width jobs arriving as a Poisson process
+
+    Args:
+        num_jobs: Number of jobs
+        cpus: CPUs of the node the load is relative to
+        load: Offered load as a fraction of the node's capacity
+        seed: Random seed
+
+    Returns:
+        List of (name, exec_time, priority, arrival_time, cpus) tuples
+    """
+    rng = random.Random(seed)
+    mean_work = sum(CPU_CHOICES) / len(CPU_CHOICES) * 10.5  # mean cpus * mean exec time
+    rate = load * cpus / mean_work
+    workload = []
+    arrival = 0.0
+    for i in range(num_jobs):
+        arrival += rng.expovariate(rate)
+        workload.append((f"job{i}", rng.uniform(1, 20), 0, arrival, rng.choice(CPU_CHOICES)))
+    return workload
+
+def run_backfill_benchmark(num_queued=5000, num_decisions=2000, num_jobs=2000, cpus=64):
+    """
+    Compare backfill modes on decision latency and simulated schedule quality
+
+    Args:
+        num_queued: Jobs waiting during the latency measurement
+        num_decisions: Decisions timed per mode
+        num_jobs: Jobs in the simulated workload
+        cpus: CPUs of the node
+
+    Returns:
+        Tuple (latency results, simulation results), one entry per mode
+    """
+    workload = synthetic_workload(num_jobs, cpus)
+    latencies, simulations = [], []
+
+    print(f"\nBackfilling on one {cpus}-CPU node ({num_queued} queued jobs, {num_jobs} simulated jobs):")
+    print(f"  {'Mode':<14}{'Decision':>12}{'p99':>10}{'Avg resp':>11}{'Max wait':>11}{'Util':>7}")
+    for mode in BACKFILL_MODES:
+        latency = measure_decisions(mode, num_queued, num_decisions, cpus)
+        results = simulate(workload, "FCFS", num_workers=cpus, nodes=[Node("node", cpus)], backfill=mode)
+        latencies.append(latency)
+        simulations.append(results)
+        print(f"  {mode:<14}{latency['mean_us']:>10.1f}us{latency['p99_us']:>8.1f}us"
+              f"{results['avg_response_time']:>10.1f}s{max(results['waiting_times']):>10.1f}s"
+              f"{results['utilization']:>7.2f}")
+    return latencies, simulations
+
+def main():
+    """
+    Main entry point for the backfilling benchmark
+    """
+    parser = argparse.ArgumentParser(description='Compare CSUbatch backfill modes')
+    parser.add_argument('--queued', type=int, default=5000, help='Jobs waiting during the latency measurement')
+    parser.add_argument('--decisions', type=int, default=2000, help='Decisions timed per mode')
+    parser.add_argument('--jobs', type=int, default=2000, help='Jobs in the simulated workload')
+    parser.add_argument('--cpus', type=int, default=64, help='CPUs of the node')
+    args = parser.parse_args()
+
+    run_backfill_benchmark(args.queued, args.decisions, args.jobs, args.cpus)
+
+if __name__ == "__main__":
+    main()
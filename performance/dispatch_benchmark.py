@@ -0,0 +1,117 @@
+import sys
+import os
+import io
+import time
+import argparse
+import contextlib
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool, LEASE_TARGET
+from src.resources import ResourcePool, Node
+
+class SleepExecutor:
+    """Run each job as a sleep, so workers overlap without competing for the CPU"""
+
+    name = "sleep"
+    preemptible = False
+
+    def execute(self, job):
+        if job.exec_time > 0:
+            time.sleep(job.exec_time)
+
+    def shutdown(self):
+        pass
+
+
+def measure_dispatch(num_workers, num_jobs, duration, lease_target, use_resources=True):
+    """
+    Measure the per-job dispatch overhead of a DispatcherPool
+
+    Every job sleeps for duration seconds, so any worker time beyond that
+    is spent getting the job, placing it, releasing it and reporting it.
+
+    Args:
+        num_workers: Number of dispatcher threads
+        num_jobs: Number of jobs queued up front
+        duration: Execution time of every job in seconds
+        lease_target: Seconds of work each worker leases at once (0 for one job at a time)
+        use_resources: Whether jobs are placed in a ResourcePool, as in main.py
+
+    Returns:
+        Dictionary with the measured timings
+    """
+    job_queue = JobQueue()
+    scheduler = Scheduler(job_queue)
+    resources = ResourcePool([Node("bench", num_workers)]) if use_resources else None
+    pool = DispatcherPool(job_queue, scheduler, num_workers, SleepExecutor(), resources, lease_target)
+    job_queue.add_jobs([Job(f"bench_{i}", duration) for i in range(num_jobs)])
+
+    # Dispatchers report every job on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.perf_counter()
+        pool.start()
+        scheduler.wait_for_completions(num_jobs)
+        elapsed = time.perf_counter() - start_time
+        pool.stop()
+        pool.join()
+
+    overhead = (elapsed * num_workers - num_jobs * duration) / num_jobs
+    return {
+        "workers": num_workers,
+        "lease_target": lease_target,
+        "resources": use_resources,
+        "num_jobs": num_jobs,
+        "total_time": elapsed,
+        "throughput": num_jobs / elapsed,
+        "overhead_per_job": overhead,
+    }
+
+def run_dispatch_benchmark(num_jobs=4000, duration=0.001, worker_counts=(1, 4, 16), lease_target=LEASE_TARGET):
+    """
+    Compare per-job dispatch overhead with and without batched leases
+
+    Args:
+        num_jobs: Number of jobs per measurement
+        duration: Execution time of every job in seconds
+        worker_counts: Numbers of dispatcher threads to measure
+        lease_target: Lease size, in seconds of work, of the batched runs
+
+    Returns:
+        List of result dictionaries
+    """
+    results = []
+    print(f"\nDispatch overhead ({num_jobs} jobs of {duration}s, worker time per job beyond the job):")
+    print(f"  {'Workers':>8}{'Resources':>11}{'One at a time':>16}{'Leased':>12}{'Speedup':>10}")
+    for num_workers in worker_counts:
+        for use_resources in (False, True):
+            single = measure_dispatch(num_workers, num_jobs, duration, 0, use_resources)
+            leased = measure_dispatch(num_workers, num_jobs, duration, lease_target, use_resources)
+            results.extend([single, leased])
+            print(f"  {num_workers:>8}{'yes' if use_resources else 'no':>11}"
+                  f"{single['overhead_per_job'] * 1e6:>14.1f}us"
+                  f"{leased['overhead_per_job'] * 1e6:>10.1f}us"
+                  f"{leased['throughput'] / single['throughput']:>9.2f}x")
+    return results
+
+def main():
+    """
+    Main entry point for the dispatch overhead benchmark
+    """
+    parser = argparse.ArgumentParser(description='Measure CSUbatch per-job dispatch overhead with short jobs')
+    parser.add_argument('--jobs', type=int, default=4000, help='Number of jobs per measurement')
+    parser.add_argument('--duration', type=float, default=0.001, help='Execution time of each job in seconds')
+    parser.add_argument('--workers', type=int, action='append',
+                        help='Number of dispatcher threads (repeatable, default: 1, 4 and 16)')
+    parser.add_argument('--lease-target', type=float, default=LEASE_TARGET,
+                        help=f'Seconds of work leased at once in the batched runs (default: {LEASE_TARGET})')
+    args = parser.parse_args()
+
+    run_dispatch_benchmark(args.jobs, args.duration, args.workers or (1, 4, 16), args.lease_target)
+
+if __name__ == "__main__":
+    main()
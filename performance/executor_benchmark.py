@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+import argparse
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.executor import EXECUTORS, create_executor
+
+def measure_executor(name, num_jobs, duration):
+    """
+    Measure the per-job overhead of one executor backend
+
+    Args:
+        name: Executor backend name
+        num_jobs: Number of jobs to run back to back
+        duration: Execution time of every job in seconds
+
+    Returns:
+        Dictionary with the measured timings
+    """
+    setup_start = time.perf_counter()
+    executor = create_executor(name, 1)
+    setup_time = time.perf_counter() - setup_start
+
+    try:
+        start_time = time.perf_counter()
+        for i in range(num_jobs):
+            executor.execute(Job(f"bench_{i}", duration))
+        elapsed = time.perf_counter() - start_time
+    finally:
+        executor.shutdown()
+
+    overhead = (elapsed - num_jobs * duration) / num_jobs
+    return {
+        "executor": name,
+        "num_jobs": num_jobs,
+        "job_duration": duration,
+        "setup_time": setup_time,
+        "total_time": elapsed,
+        "overhead_per_job": overhead,
+    }
+
+def run_executor_benchmark(num_jobs=50, duration=0.0, executors=None):
+    """
+    Compare per-job overhead across executor backends
+
+    Args:
+        num_jobs: Number of jobs to run per backend
+        duration: Execution time of every job in seconds
+        executors: Backend names to compare (defaults to all of them)
+
+    Returns:
+        List of result dictionaries, one per backend
+    """
+    results = []
+    for name in executors or sorted(EXECUTORS):
+        results.append(measure_executor(name, num_jobs, duration))
+
+    print(f"\nExecutor overhead ({num_jobs} jobs of {duration}s each):")
+    print(f"  {'Executor':<12}{'Setup':>12}{'Total':>12}{'Per job':>14}")
+    for result in results:
+        print(f"  {result['executor']:<12}"
+              f"{result['setup_time'] * 1000:>10.2f}ms"
+              f"{result['total_time']:>11.3f}s"
+              f"{result['overhead_per_job'] * 1000:>12.3f}ms")
+    return results
+
+def main():
+    """
+    Main entry point for the executor benchmark
+    """
+    parser = argparse.ArgumentParser(description='Compare per-job overhead of CSUbatch executor backends')
+    parser.add_argument('--jobs', type=int, default=50, help='Number of jobs per backend')
+    parser.add_argument('--duration', type=float, default=0.0, help='Execution time of each job in seconds')
+    parser.add_argument('--executor', action='append', choices=sorted(EXECUTORS),
+                        help='Backend to measure (repeatable, default: all)')
+
+    args = parser.parse_args()
+
+    run_executor_benchmark(args.jobs, args.duration, args.executor)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import sys
+import os
+import gc
+import argparse
+import tracemalloc
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+
+class DictJob:
+    """
+    The original Job layout: a regular class with a per-instance __dict__,
+    plus the remaining time and MLFQ level the queue orders jobs by
+    """
+
+    def __init__(self, name, exec_time, priority=0):
+        self.name = name
+        self.exec_time = exec_time
+        self.priority = priority
+        self.arrival_time = None
+        self.start_time = None
+        self.end_time = None
+        self.status = "Waiting"
+        self.remaining_time = exec_time
+        self.level = 0
+
+def measure(factory, num_jobs, queued):
+    """
+    Measure the memory allocated per job
+
+    Args:
+        factory: Callable (i) -> job
+        num_jobs: Number of jobs to create
+        queued: Whether to also add the jobs to a JobQueue
+
+    Returns:
+        Bytes allocated per job
+    """
+    gc.collect()
+    tracemalloc.start()
+    queue = JobQueue() if queued else None
+    jobs = []
+    for i in range(num_jobs):
+        job = factory(i)
+        job.arrival_time = float(i)
+        if queued:
+            queue.add_job(job)
+        else:
+            jobs.append(job)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / num_jobs
+
+def run_memory_benchmark(num_jobs=100000):
+    """
+    Compare bytes per job for each job representation
+
+    Args:
+        num_jobs: Number of jobs to create per representation
+
+    Returns:
+        Dictionary mapping representation to (bytes per job, bytes per queued job)
+    """
+    names = [f"job_{i}" for i in range(num_jobs)]
+    representations = {
+        "dict Job (before)": lambda i: DictJob(names[i], 1.0 + i % 10, i % 5),
+        "__slots__ Job": lambda i: Job(names[i], 1.0 + i % 10, i % 5),
+    }
+
+    results = {}
+    for label, factory in representations.items():
+        per_job = measure(factory, num_jobs, queued=False)
+        per_queued_job = measure(factory, num_jobs, queued=True)
+        results[label] = (per_job, per_queued_job)
+
+    print(f"\nMemory per job ({num_jobs} jobs, job names excluded):")
+    print(f"  {'Representation':<20}{'Job only':>12}{'Queued':>12}")
+    for label, (per_job, per_queued_job) in results.items():
+        print(f"  {label:<20}{per_job:>10.0f} B{per_queued_job:>10.0f} B")
+    return results
+
+def main():
+    """
+    Main entry point for the memory benchmark
+    """
+    parser = argparse.ArgumentParser(description='Measure bytes per queued CSUbatch job')
+    parser.add_argument('--jobs', type=int, default=100000, help='Number of jobs per representation')
+
+    args = parser.parse_args()
+
+    run_memory_benchmark(args.jobs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import sys
+import os
+import time
+import threading
+import argparse
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+from src.shardedQueue import ShardedJobQueue
+
+QUEUES = ("single", "sharded")
+
+def measure_queue(kind, num_threads, num_jobs, policy="SJF"):
+    """
+    Measure queue throughput with concurrent submitters and workers
+
+    num_threads submitter threads add num_jobs jobs between them while
+    num_threads worker threads take them, as dispatcher workers would.
+
+    Args:
+        kind: "single" for JobQueue or "sharded" for ShardedJobQueue
+        num_threads: Number of submitter threads, and of worker threads
+        num_jobs: Total number of jobs passed through the queue
+        policy: Scheduling policy the queue orders jobs by
+
+    Returns:
+        Dictionary with the measured timings
+    """
+    queue = JobQueue() if kind == "single" else ShardedJobQueue(num_shards=num_threads)
+    queue.reorder_queue(policy)
+    per_thread = num_jobs // num_threads
+    jobs = [[Job(f"bench_{t}_{i}", float(i % 97 + 1), i % 5) for i in range(per_thread)]
+            for t in range(num_threads)]
+    taken = [0] * num_threads
+    start = threading.Barrier(2 * num_threads + 1)
+
+    def submit(t):
+        start.wait()
+        for job in jobs[t]:
+            queue.add_job(job)
+
+    def work(t):
+        start.wait()
+        while queue.get_job() is not None:
+            taken[t] += 1
+
+    submitters = [threading.Thread(target=submit, args=(t,)) for t in range(num_threads)]
+    workers = [threading.Thread(target=work, args=(t,)) for t in range(num_threads)]
+    for thread in submitters + workers:
+        thread.start()
+
+    start.wait()
+    start_time = time.perf_counter()
+    for thread in submitters:
+        thread.join()
+    queue.close()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+
+    total = per_thread * num_threads
+    if sum(taken) != total:
+        raise RuntimeError(f"{kind} queue delivered {sum(taken)} of {total} jobs")
+    return {
+        "queue": kind,
+        "threads": num_threads,
+        "num_jobs": total,
+        "total_time": elapsed,
+        "throughput": total / elapsed,
+    }
+
+def measure_add_pop(num_jobs, policy="SJF", queue=None):
+    """
+    Measure the single-threaded cost of adding and then taking jobs
+
+    Args:
+        num_jobs: Number of jobs added, then taken
+        policy: Scheduling policy the queue orders jobs by
+        queue: Optional queue to measure (defaults to a new JobQueue)
+
+    Returns:
+        Dictionary with the time to add every job and to take every job
+    """
+    queue = JobQueue() if queue is None else queue
+    queue.reorder_queue(policy)
+    jobs = [Job(f"bench_{i}", float(i % 97 + 1), i % 5) for i in range(num_jobs)]
+
+    start_time = time.perf_counter()
+    for job in jobs:
+        queue.add_job(job)
+    add_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(num_jobs):
+        queue.get_job(block=False)
+    pop_time = time.perf_counter() - start_time
+
+    if queue.get_queue_size() != 0:
+        raise RuntimeError(f"{queue.get_queue_size()} jobs left in the queue")
+    return {"num_jobs": num_jobs, "policy": policy, "add_time": add_time, "pop_time": pop_time}
+
+def run_queue_benchmark(num_jobs=20000, thread_counts=(1, 2, 4, 8, 16, 32, 64), policy="SJF"):
+    """
+    Compare JobQueue and ShardedJobQueue as the number of threads grows
+
+    Args:
+        num_jobs: Number of jobs per measurement
+        thread_counts: Numbers of submitter (and worker) threads to measure
+        policy: Scheduling policy the queues order jobs by
+
+    Returns:
+        List of result dictionaries, one per queue and thread count
+    """
+    results = []
+    print(f"\nQueue contention ({num_jobs} jobs, {policy}, N submitters + N workers):")
+    print(f"  {'Threads':>8}{'Single':>14}{'Sharded':>14}{'Speedup':>10}")
+    for num_threads in thread_counts:
+        row = {kind: measure_queue(kind, num_threads, num_jobs, policy) for kind in QUEUES}
+        results.extend(row.values())
+        single, sharded = row["single"]["throughput"], row["sharded"]["throughput"]
+        print(f"  {num_threads:>8}{single:>10.0f}/s  {sharded:>10.0f}/s  {sharded / single:>8.2f}x")
+    return results
+
+def main():
+    """
+    Main entry point for the queue contention benchmark
+    """
+    parser = argparse.ArgumentParser(description='Compare the single and sharded CSUbatch job queues under contention')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs per measurement')
+    parser.add_argument('--threads', type=int, action='append',
+                        help='Number of submitter and worker threads (repeatable, default: 1 to 64)')
+    parser.add_argument('--policy', default='SJF', help='Scheduling policy (default: SJF)')
+    parser.add_argument('--add-pop', action='store_true',
+                        help='Measure single-threaded add and get cost instead of contention')
+    args = parser.parse_args()
+
+    if args.add_pop:
+        result = measure_add_pop(args.jobs, args.policy)
+        print(f"\nJobQueue, {result['num_jobs']} jobs, {result['policy']}:")
+        print(f"  add_job: {result['add_time']:.2f} s ({result['add_time'] / result['num_jobs'] * 1e6:.1f} us/job)")
+        print(f"  get_job: {result['pop_time']:.2f} s ({result['pop_time'] / result['num_jobs'] * 1e6:.1f} us/job)")
+        return
+
+    run_queue_benchmark(args.jobs, args.threads or (1, 2, 4, 8, 16, 32, 64), args.policy)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import sys
+import os
+import json
+import mmap
+import argparse
+from array import array
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.analysis import np, subtract, bounded_slowdown, concatenate, summarize
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(__file__), "..", "results", "store")
+
+# Per-job columns, stored as native-endian float64 files of the same name
+JOB_COLUMNS = ("arrival_times", "start_times", "end_times", "exec_times")
+
+# Job names in execution order, one per line
+NAMES_FILE = "names.txt"
+
+# Run index, one JSON object per line in the order runs were appended
+INDEX_FILE = "runs.jsonl"
+
+# Columns each derived metric reads, as (minuend, subtrahend)
+METRIC_COLUMNS = {
+    "waiting_time": ("start_times", "arrival_times"),
+    "turnaround_time": ("end_times", "arrival_times"),
+    "service_time": ("end_times", "start_times"),
+    "slowdown": ("end_times", "arrival_times", "exec_times"),
+}
+
+ITEM_SIZE = array('d').itemsize
+
+class ResultsStore:
+    def __init__(self, directory=None):
+        """
+        Open an append-only columnar store of performance test results
+
+        Every run's per-job timings are appended to one file per column, so
+        the rows of a run are contiguous, and a line describing the run (its
+        scalar results plus where its rows start) is appended to the run
+        index last, which commits it. A query reads the index, then maps
+        only the columns it needs and copies only the rows of matching runs
+        (with NumPy, it views them in place). One process should append at
+        a time; readers may run alongside it.
+
+        Args:
+            directory (str): Store directory (defaults to results/store)
+        """
+        self.directory = directory or DEFAULT_STORE_DIR
+        os.makedirs(self.directory, exist_ok=True)
+        self.index = []         # run records in append order
+        self.by_policy = {}     # policy -> positions in index
+        self.index_size = 0     # bytes of the index file already read
+        self.maps = {}          # column -> (mmap, mapped size)
+        self._refresh()
+
+    def append(self, result):
+        """
+        Append one run
+
+        Args:
+            result: Result dictionary from the test runner or simulator, with
+                per-job arrival, start, end and exec times
+
+        Returns:
+            The run record added to the index
+
+        Raises:
+            ValueError: If the result has no per-job timing columns
+        """
+        missing = [name for name in JOB_COLUMNS if name not in result]
+        if missing:
+            raise ValueError(f"Result has no {', '.join(missing)} column")
+        rows = len(result["arrival_times"])
+        if any(len(result[name]) != rows for name in JOB_COLUMNS):
+            raise ValueError("Per-job columns must have the same length")
+
+        self._refresh()
+        offset, names_offset = self._truncate_uncommitted()
+        for name in JOB_COLUMNS:
+            with open(self._path(name), "ab") as f:
+                f.write(array('d', result[name]).tobytes())
+        names = "".join(f"{name}\n" for name in result.get("execution_order", [])).encode()
+        with open(self._path(NAMES_FILE), "ab") as f:
+            f.write(names)
+
+        record = {key: value for key, value in result.items()
+                  if value is None or isinstance(value, (str, int, float, bool))}
+        record.update({
+            "run_id": len(self.index),
+            "offset": offset,
+            "rows": rows,
+            "names_offset": names_offset,
+            "names_bytes": len(names),
+        })
+        with open(self._path(INDEX_FILE), "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self._refresh()
+        return record
+
+    def import_json(self, path):
+        """
+        Import the runs of a JSON results file written before the store existed
+
+        Legacy files hold a "policy_comparison" list of runs with scalar
+        results and an execution order but no per-job timings, so they are
+        stored with zero rows: they can be loaded and plotted, but add no
+        jobs to metric queries. Runs already imported from a file of the
+        same name are skipped, so importing again is harmless.
+
+        Args:
+            path (str): Path of a performance_results_*.json file
+
+        Returns:
+            Number of runs imported
+        """
+        with open(path) as f:
+            results = json.load(f).get("policy_comparison") or []
+        source = os.path.basename(path)
+        self._refresh()
+        if any(record.get("source") == source for record in self.index):
+            return 0
+        for result in results:
+            result = dict(result, source=source)
+            for name in JOB_COLUMNS:
+                result.setdefault(name, [])
+            self.append(result)
+        return len(results)
+
+    def runs(self, policy=None, test_type=None, since=None, last=None):
+        """
+        Find runs in the index, oldest first
+
+        Args:
+            policy (str): Only runs of this policy
+            test_type (str): Only runs of this test type
+            since (str): Only runs with an ISO timestamp at or after this one
+            last (int): Only the most recent this many matching runs
+
+        Returns:
+            List of run records
+        """
+        self._refresh()
+        if policy is not None:
+            records = [self.index[position] for position in self.by_policy.get(policy, [])]
+        else:
+            records = list(self.index)
+        if test_type is not None:
+            records = [record for record in records if record.get("test_type") == test_type]
+        if since is not None:
+            records = [record for record in records if record.get("timestamp", "") >= since]
+        records.sort(key=lambda record: record.get("timestamp", ""))
+        if last is not None:
+            records = records[-last:] if last > 0 else []
+        return records
+
+    def get_policies(self):
+        """
+        Get every policy with at least one run
+
+        Returns:
+            List of policies, in the order they first appear
+        """
+        self._refresh()
+        return list(self.by_policy)
+
+    def latest(self, policy):
+        """
+        Load the most recent run of a policy
+
+        Args:
+            policy (str): Scheduling policy
+
+        Returns:
+            Result dictionary, or None if the policy has no runs
+        """
+        records = self.runs(policy, last=1)
+        return self.load(records[0]) if records else None
+
+    def column(self, record, name):
+        """
+        Read one per-job column of a run
+
+        Args:
+            record: Run record from runs()
+            name (str): One of JOB_COLUMNS
+
+        Returns:
+            Float column (a NumPy view of the mapped file if NumPy is installed)
+        """
+        start = record["offset"] * ITEM_SIZE
+        end = start + record["rows"] * ITEM_SIZE
+        mapped = self._map(name, end)
+        if np is not None:
+            return np.frombuffer(mapped, dtype=np.float64, count=record["rows"], offset=start)
+        values = array('d')
+        values.frombytes(mapped[start:end])
+        return values
+
+    def load(self, record):
+        """
+        Load a whole run in the shape the test runner produced it
+
+        Args:
+            record: Run record from runs()
+
+        Returns:
+            Result dictionary with the scalar results, execution_order and per-job columns
+        """
+        result = dict(record)
+        for name in JOB_COLUMNS:
+            result[name] = self.column(record, name)
+        start = record["names_offset"]
+        names = self._map(NAMES_FILE, start + record["names_bytes"])[start:start + record["names_bytes"]]
+        result["execution_order"] = names.decode().splitlines()
+        return result
+
+    def metric(self, record, metric):
+        """
+        Compute a per-job metric of a run from the columns it needs
+
+        Args:
+            record: Run record from runs()
+            metric (str): One of METRIC_COLUMNS
+
+        Returns:
+            Float column
+        """
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric}")
+        columns = [self.column(record, name) for name in METRIC_COLUMNS[metric]]
+        values = subtract(columns[0], columns[1])
+        if metric == "slowdown":
+            values = bounded_slowdown(values, columns[2])
+        return values
+
+    def query(self, metric, policy=None, test_type=None, since=None, last=None):
+        """
+        Summarize a per-job metric over the jobs of matching runs
+
+        For example, query("turnaround_time", "SJF", last=30)["p95"] is the
+        p95 turnaround of SJF over its last 30 runs.
+
+        Args:
+            metric (str): One of METRIC_COLUMNS
+            policy, test_type, since, last: Run filters, see runs()
+
+        Returns:
+            Summary dictionary from analysis.summarize, plus the number of runs
+        """
+        records = self.runs(policy, test_type, since, last)
+        summary = summarize(concatenate([self.metric(record, metric) for record in records]))
+        summary["runs"] = len(records)
+        return summary
+
+    def close(self):
+        """
+        Unmap the column files
+        """
+        maps, self.maps = self.maps, {}
+        for mapped, _ in maps.values():
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # a NumPy view still uses it; it is unmapped once the view goes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def _path(self, name):
+        """
+        Get the path of a file in the store
+        """
+        if name in JOB_COLUMNS:
+            name = f"{name}.f64"
+        return os.path.join(self.directory, name)
+
+    def _map(self, name, size):
+        """
+        Map a column file, remapping it if it has grown past the mapped size
+
+        Args:
+            name (str): Column or names file
+            size (int): Bytes that must be mapped
+
+        Returns:
+            The mmap
+        """
+        mapped = self.maps.get(name)
+        if mapped is None or mapped[1] < size:
+            with open(self._path(name), "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size < size:
+                    raise ValueError(f"{self._path(name)} is shorter than the run index says")
+                if file_size == 0:
+                    return b""
+                # The old map is left to be unmapped once nothing views it
+                mapped = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), file_size)
+            self.maps[name] = mapped
+        return mapped[0]
+
+    def _refresh(self):
+        """
+        Read run records appended to the index since it was last read
+        """
+        path = self._path(INDEX_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) == self.index_size:
+            return
+        with open(path, "rb") as f:
+            f.seek(self.index_size)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # an append in progress
+                record = json.loads(line)
+                self.by_policy.setdefault(record.get("policy"), []).append(len(self.index))
+                self.index.append(record)
+                self.index_size += len(line)
+
+    def _truncate_uncommitted(self):
+        """
+        Drop rows a failed append left behind after the last indexed run
+
+        Returns:
+            Tuple (first free row, first free byte of the names file)
+        """
+        rows, names_bytes = 0, 0
+        if self.index:
+            last = self.index[-1]
+            rows = last["offset"] + last["rows"]
+            names_bytes = last["names_offset"] + last["names_bytes"]
+        for name, size in [(name, rows * ITEM_SIZE) for name in JOB_COLUMNS] + [(NAMES_FILE, names_bytes)]:
+            path = self._path(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+        return rows, names_bytes
+
+def main():
+    """
+    Main entry point for querying the results store
+    """
+    parser = argparse.ArgumentParser(description='Query stored CSUbatch performance results')
+    parser.add_argument('--store', default=None, help='Store directory (default: results/store)')
+    parser.add_argument('--metric', choices=sorted(METRIC_COLUMNS), default='turnaround_time')
+    parser.add_argument('--policy', default=None, help='Only runs of this policy')
+    parser.add_argument('--test-type', default=None, help='Only runs of this test type')
+    parser.add_argument('--since', default=None, help='Only runs at or after this ISO timestamp')
+    parser.add_argument('--last', type=int, default=None, help='Only the most recent N matching runs')
+    parser.add_argument('--list', action='store_true', help='List the matching runs instead')
+    parser.add_argument('--import-json', nargs='+', metavar='FILE', default=None,
+                        help='Import legacy performance_results_*.json files into the store')
+    args = parser.parse_args()
+
+    with ResultsStore(args.store) as store:
+        if args.import_json:
+            for path in args.import_json:
+                print(f"Imported {store.import_json(path)} runs from {path}")
+            return
+
+        if args.list:
+            for record in store.runs(args.policy, args.test_type, args.since, args.last):
+                print(f"  {record['run_id']:>5}  {record.get('timestamp', '')}  {record.get('policy', ''):<20}"
+                      f"{record['rows']:>8} jobs  {record.get('name', '')}")
+            return
+
+        summary = store.query(args.metric, args.policy, args.test_type, args.since, args.last)
+        print(f"\n{args.metric} over {summary['runs']} runs ({summary['count']} jobs):")
+        print(f"  mean {summary['mean']:.3f}  p50 {summary['p50']:.3f}  p95 {summary['p95']:.3f}  "
+              f"p99 {summary['p99']:.3f}  max {summary['max']:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+import argparse
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.server import JobServer, DEFAULT_HOST
+from src.client import AsyncJobClient
+from src.metrics import Histogram
+
+def start_local_server():
+    """
+    Start a JobServer on a free localhost port in a background thread
+
+    The server has no dispatcher, so submitted jobs simply stay queued and
+    only the front end and queue are measured.
+
+    Returns:
+        Tuple (port, stop) where stop() shuts the server down
+    """
+    loop = asyncio.new_event_loop()
+    job_queue = JobQueue()
+    server = JobServer(Scheduler(job_queue), job_queue)
+    ready = threading.Event()
+    address = []
+
+    def run():
+        asyncio.set_event_loop(loop)
+        address.append(loop.run_until_complete(server.start(DEFAULT_HOST, 0)))
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(server.stop())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="benchmark-server", daemon=True)
+    thread.start()
+    ready.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return address[0][1], stop
+
+async def _client_load(host, port, num_jobs, window, latencies):
+    """
+    Submit jobs over one connection, keeping up to window requests in flight
+    """
+    client = await AsyncJobClient.connect(host, port)
+    semaphore = asyncio.Semaphore(window)
+
+    async def submit(i):
+        try:
+            start = time.perf_counter()
+            await client.submit(f"load_{i}", 1.0, i % 10)
+            latencies.record(time.perf_counter() - start)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    for i in range(num_jobs):
+        await semaphore.acquire()
+        tasks.append(asyncio.ensure_future(submit(i)))
+    await asyncio.gather(*tasks)
+    await client.close()
+
+async def _generate_load(host, port, num_jobs, connections, window):
+    latencies = Histogram()
+    per_client = num_jobs // connections
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _client_load(host, port, per_client, window, latencies)
+        for _ in range(connections)
+    ])
+    return per_client * connections, time.perf_counter() - start, latencies
+
+def run_server_benchmark(num_jobs=20000, connections=8, window=64, host=DEFAULT_HOST, port=None):
+    """
+    Measure submission throughput and acknowledgement latency of the server
+
+    Args:
+        num_jobs (int): Total number of submissions
+        connections (int): Number of concurrent client connections
+        window (int): Requests each connection keeps in flight
+        host (str): Server address
+        port (int): Server port; if None, a local server is started in-process
+
+    Returns:
+        Dictionary with the measured throughput and latency summary
+    """
+    stop = None
+    if port is None:
+        port, stop = start_local_server()
+
+    loop = asyncio.new_event_loop()
+    try:
+        submitted, elapsed, latencies = loop.run_until_complete(
+            _generate_load(host, port, num_jobs, connections, window))
+    finally:
+        loop.close()
+        if stop is not None:
+            stop()
+
+    result = {
+        "num_jobs": submitted,
+        "connections": connections,
+        "window": window,
+        "total_time": elapsed,
+        "submissions_per_second": submitted / elapsed if elapsed > 0 else 0,
+        "ack_latency": latencies.summary(),
+    }
+
+    print(f"\nServer load ({submitted} submissions, {connections} connections, "
+          f"{window} in flight each):")
+    print(f"  Throughput: {result['submissions_per_second']:.0f} submissions/s")
+    print(f"  Ack latency: p50 {result['ack_latency']['p50'] * 1000:.2f}ms  "
+          f"p99 {result['ack_latency']['p99'] * 1000:.2f}ms  "
+          f"max {result['ack_latency']['max'] * 1000:.2f}ms")
+    return result
+
+def main():
+    """
+    Main entry point for the server load generator
+    """
+    parser = argparse.ArgumentParser(description='Load-test the CSUbatch job-submission server')
+    parser.add_argument('--jobs', type=int, default=20000, help='Total number of submissions')
+    parser.add_argument('--connections', type=int, default=8, help='Number of concurrent connections')
+    parser.add_argument('--window', type=int, default=64, help='Requests in flight per connection')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Server address')
+    parser.add_argument('--port', type=int, default=None,
+                        help='Port of a running server (default: start one in-process)')
+
+    args = parser.parse_args()
+
+    run_server_benchmark(args.jobs, args.connections, args.window, args.host, args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import sys
+import os
+import heapq
+import itertools
+import time
+from array import array
+from datetime import datetime
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import JobStatus
+from src.queueManager import JobQueue, DEFAULT_QUANTUM, POLICY_ORDERS, PREEMPTIVE_POLICIES
+from src.scheduler import Scheduler
+from src.resources import ResourcePool
+from performance.analysis import subtract, summarize, to_column
+
+class SimulationQueue(JobQueue):
+    """
+    JobQueue for the single-threaded simulator
+
+    Nothing else touches the queue while a simulation runs, so this queue
+    skips the mutex, the condition variables and the profiler hooks.
+    Ordering, preemption and time-slice decisions are JobQueue's own.
+    """
+
+    def add_job(self, job):
+        """Add a job without locking"""
+        if job.arrival_time is None:
+            job.arrival_time = time.time()
+        self._push(job)
+
+    def add_jobs(self, jobs):
+        """Add a batch of jobs without locking"""
+        jobs = list(jobs)
+        if jobs:
+            now = time.time()
+            for job in jobs:
+                if job.arrival_time is None:
+                    job.arrival_time = now
+            self._push_many(jobs)
+        return len(jobs)
+
+    def requeue(self, job, slice_time=0.0):
+        """Put a preempted job back without locking"""
+        self._requeue(job, slice_time)
+
+    def should_preempt(self, job, slice_time):
+        """Check whether a running job should yield, without locking"""
+        return self._should_preempt(job, slice_time)
+
+    def get_time_slice(self, job):
+        """Get a job's time slice without locking"""
+        return self._time_slice(job)
+
+    def get_job(self, place=None, block=False):
+        """
+        Take the next job without ever blocking; there is no other thread to wait for
+
+        Args:
+            place: Optional callable that reserves resources for a job, see JobQueue.get_job
+            block: Ignored
+
+        Returns:
+            The next job, or None if the queue is empty or no job fits
+        """
+        if not self.heap:
+            return None
+        if place is None:
+            return self._pop()
+        return self._pop_placeable(place)
+
+    def get_queue_size(self):
+        """Get the number of queued jobs without locking"""
+        return len(self.heap)
+
+    def get_current_policy(self):
+        """Get the current policy without locking"""
+        return self.current_policy
+
+
+class Simulator:
+    def __init__(self, policy="FCFS", num_workers=1, quantum=DEFAULT_QUANTUM, aging_rate=0.0,
+                 nodes=None, backfill="easy"):
+        """
+        Initialize a discrete-event simulator
+
+        Jobs flow through a real Scheduler and a SimulationQueue, which
+        orders them exactly like a JobQueue, but time is a virtual clock that jumps from one arrival or completion to the next,
+        so a workload is evaluated without waiting for any job to run.
+
+        Args:
+            policy (str): Scheduling policy to simulate
+            num_workers (int): Number of simulated dispatcher workers
+            quantum (float): Time slice in virtual seconds under RR and MLFQ
+            aging_rate (float): Queue aging rate, see JobQueue
+            nodes: Optional list of Nodes; jobs then only start once their
+                CPU and memory requests fit, as with a ResourcePool
+            backfill (str): Backfill mode of the resource pool, see BACKFILL_MODES
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.policy = policy
+        self.num_workers = num_workers
+        self.now = 0.0
+        self.resources = None
+        if nodes is not None:
+            self.resources = ResourcePool(nodes, backfill, clock=lambda: self.now)
+        if policy not in POLICY_ORDERS:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+        self.job_queue = SimulationQueue(quantum=quantum, aging_rate=aging_rate)
+        self.scheduler = Scheduler(self.job_queue)
+        self.scheduler.change_policy(policy)
+
+    def run(self, workload, name=None):
+        """
+        Replay a workload and collect results
+
+        Under a preemptive policy a running job is preempted at the first
+        arrival, completion or time-slice expiry at which the queue says a
+        waiting job should run instead, exactly as a dispatcher would.
+
+        Args:
+            workload: Iterable of (name, exec_time, priority, arrival_time)
+                tuples, sorted by arrival_time in virtual seconds; with
+                nodes, tuples may add cpus and memory requests
+            name (str): Name of the test, stored in the results
+
+        Returns:
+            Dictionary with the same schema as PerformanceTestRunner results
+        """
+        wall_start = time.perf_counter()
+        self.execution_order = []
+        response_times = array('d')
+        # Per-job timing columns, indexed by first-start order
+        self.arrival_times = array('d')
+        self.start_times = array('d')
+        self.end_times = array('d')
+        self.exec_times = array('d')
+        self.columns = {}  # job -> index into the timing columns
+        # job -> [slice start, remaining time at slice start, event token,
+        #         time slice, time slice used up]
+        self.running = {}
+        self.events = []   # heap of (time, token, finished, job)
+        self.tokens = itertools.count()
+        self.preemptions = 0
+        self.busy_time = 0.0  # CPU-seconds of work run
+
+        arrivals = iter(workload)
+        pending = next(arrivals, None)
+        self.idle = self.num_workers
+        now = 0.0
+        first_arrival = pending[3] if pending else 0.0
+
+        while pending is not None or self.events:
+            next_arrival = pending[3] if pending is not None else float('inf')
+            next_event = self.events[0][0] if self.events else float('inf')
+            now = self.now = min(next_arrival, next_event)
+
+            # Free workers first so jobs arriving now can start now
+            while self.events and self.events[0][0] <= now:
+                _, token, finished, job = heapq.heappop(self.events)
+                if job not in self.running or self.running[job][2] != token:
+                    continue  # the job was preempted after this event was scheduled
+                if not finished:
+                    self.running[job][4] = True
+                else:
+                    del self.running[job]
+                    job.remaining_time = 0.0
+                    job.state = JobStatus.COMPLETED
+                    job.end_time = now
+                    self.end_times[self.columns.pop(job)] = now
+                    self.busy_time += job.exec_time * job.cpus
+                    if self.resources is not None:
+                        self.resources.release(job)
+                    self.scheduler.register_job_completion(job)
+                    response_times.append(job.get_response_time())
+                    self.idle += 1
+
+            while pending is not None and pending[3] <= now:
+                job_name, exec_time, priority, arrival_time = pending[:4]
+                self.scheduler.submit_job(job_name, exec_time, priority, arrival_time, *pending[4:])
+                pending = next(arrivals, None)
+
+            self._preempt(now)
+
+            while self.idle and self.job_queue.get_queue_size():
+                job = self._next_job()
+                if job is None:
+                    break  # nothing queued fits the free resources
+                self._start(job, now)
+                self.idle -= 1
+
+        num_jobs = len(response_times)
+        test_duration = now - first_arrival
+        if self.resources is not None:
+            capacity = sum(node.cpus for node in self.resources.nodes)
+        else:
+            capacity = self.num_workers
+        stats = self.scheduler.get_performance_stats()
+
+        return {
+            "name": name or f"{self.policy}_simulation",
+            "policy": self.policy,
+            "num_jobs": num_jobs,
+            "num_workers": self.num_workers,
+            "avg_response_time": summarize(to_column(response_times))["mean"],
+            "throughput": num_jobs / test_duration if test_duration > 0 else 0,
+            "test_duration": test_duration,
+            "timestamp": datetime.now().isoformat(),
+            "test_type": "simulation",
+            "execution_order": self.execution_order,
+            "response_times": response_times.tolist(),
+            "waiting_times": subtract(to_column(self.start_times), to_column(self.arrival_times)).tolist(),
+            "arrival_times": self.arrival_times.tolist(),
+            "start_times": self.start_times.tolist(),
+            "end_times": self.end_times.tolist(),
+            "exec_times": self.exec_times.tolist(),
+            "preemptions": self.preemptions,
+            "utilization": self.busy_time / (capacity * test_duration) if test_duration > 0 else 0,
+            "latency": stats["latency"],
+            "wall_time": time.perf_counter() - wall_start,
+        }
+
+    def _next_job(self):
+        """
+        Take the next job the queue hands out without blocking
+
+        Returns:
+            The job, or None if no queued job fits the free resources
+        """
+        if self.resources is None:
+            return self.job_queue.get_job()
+        return self.job_queue.get_job(self.resources.place, block=False)
+
+    def _start(self, job, now):
+        """
+        Start or resume a job on an idle worker
+
+        Args:
+            job: Job returned by the queue
+            now (float): Current virtual time
+        """
+        job.state = JobStatus.RUNNING
+        if job.start_time is None:
+            job.start_time = now
+            self.scheduler.register_job_start(job)
+            self.columns[job] = len(self.execution_order)
+            self.execution_order.append(job.name)
+            self.arrival_times.append(job.arrival_time)
+            self.start_times.append(now)
+            self.end_times.append(now)
+            self.exec_times.append(job.exec_time)
+
+        token = next(self.tokens)
+        time_slice = self.job_queue.get_time_slice(job)
+        self.running[job] = [now, job.remaining_time, token, time_slice, False]
+        end = now + job.remaining_time
+        heapq.heappush(self.events, (end, token, True, job))
+        if time_slice is not None and now + time_slice < end:
+            # Wake up when the time slice expires to give other jobs a turn
+            heapq.heappush(self.events, (now + time_slice, token, False, job))
+
+    def _preempt(self, now):
+        """
+        Swap out running jobs that the queue's policy says should yield
+
+        Each preempted job's worker immediately resumes the job the queue
+        hands out next, so one better job displaces at most one running job.
+
+        Args:
+            now (float): Current virtual time
+        """
+        if self.policy not in PREEMPTIVE_POLICIES or not self.running or not self.job_queue.heap:
+            return
+
+        order = self.job_queue.order_keys[POLICY_ORDERS[self.policy]]
+        for job, (slice_start, remaining, _, _, _) in list(self.running.items()):
+            job.remaining_time = remaining - (now - slice_start)
+
+        # Consider the jobs the policy likes least first
+        candidates = sorted(self.running.items(), key=lambda item: (order(item[0]), -item[1][0]),
+                            reverse=True)
+        # Without time slices only keys decide, so once a job may keep its
+        # worker every job the policy likes better may too
+        sliced = any(entry[3] is not None for _, entry in candidates)
+        for job, (slice_start, _, _, time_slice, expired) in candidates:
+            slice_time = now - slice_start
+            if expired:
+                # Guard against rounding in now - slice_start
+                slice_time = max(slice_time, time_slice)
+            if not self.job_queue.should_preempt(job, slice_time):
+                if not sliced:
+                    break
+                continue
+            del self.running[job]
+            job.state = JobStatus.WAITING
+            if self.resources is not None:
+                self.resources.release(job)
+            self.job_queue.requeue(job, slice_time)
+            self.preemptions += 1
+            next_job = self._next_job()
+            if next_job is None:
+                self.idle += 1
+            else:
+                self._start(next_job, now)
+
+def simulate(workload, policy="FCFS", num_workers=1, name=None, quantum=DEFAULT_QUANTUM,
+             aging_rate=0.0, nodes=None, backfill="easy"):
+    """
+    Replay a workload through a fresh simulator
+
+    Args:
+        workload: Iterable of (name, exec_time, priority, arrival_time) tuples
+        policy (str): Scheduling policy to simulate
+        num_workers (int): Number of simulated dispatcher workers
+        name (str): Name of the test, stored in the results
+        quantum (float): Time slice in virtual seconds under RR and MLFQ
+        aging_rate (float): Queue aging rate, see JobQueue
+        nodes: Optional list of Nodes whose CPUs and memory jobs are packed onto
+        backfill (str): Backfill mode of the resource pool, see BACKFILL_MODES
+
+    Returns:
+        Dictionary with the simulation results
+    """
+    return Simulator(policy, num_workers, quantum, aging_rate, nodes, backfill).run(workload, name)
@@ -0,0 +1,231 @@
+import sys
+import os
+import json
+import time
+import itertools
+import argparse
+import concurrent.futures
+from datetime import datetime
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import POLICIES
+from performance.simulator import simulate
+from performance.workload import SyntheticWorkload, ARRIVAL_PROCESSES, RUNTIME_DISTRIBUTIONS
+from performance.analysis import confidence_interval
+
+# Per-run metrics, each aggregated over seeds into a mean and a 95% confidence interval
+SWEEP_METRICS = ("avg_response_time", "p95_response_time", "p99_response_time",
+                 "max_waiting_time", "utilization", "throughput")
+
+# Grid coordinates of a run, in the order they are swept
+SWEEP_KEYS = ("policy", "workers", "load")
+
+def run_point(point):
+    """
+    Simulate one grid point with one seed
+
+    Runs in a pool process, so it takes and returns plain data only.
+
+    Args:
+        point: Dictionary with policy, workers, load, seed, num_jobs and the
+            SyntheticWorkload options arrivals, runtime, mean_runtime and
+            priority_levels
+
+    Returns:
+        Dictionary with the grid coordinates, the seed and SWEEP_METRICS
+    """
+    # The offered load is relative to the capacity of all workers
+    rate = point["load"] * point["workers"] / point["mean_runtime"]
+    priorities = {level: 1 for level in range(1, point["priority_levels"] + 1)} or None
+    workload = SyntheticWorkload(point["num_jobs"], point["seed"], rate, point["arrivals"],
+                                 point["runtime"], point["mean_runtime"], priorities=priorities)
+    results = simulate(workload, point["policy"], point["workers"])
+    response = results["latency"]["response_time"]
+    return {
+        "policy": point["policy"],
+        "workers": point["workers"],
+        "load": point["load"],
+        "seed": point["seed"],
+        "avg_response_time": results["avg_response_time"],
+        "p95_response_time": response["p95"],
+        "p99_response_time": response["p99"],
+        "max_waiting_time": results["latency"]["waiting_time"]["max"],
+        "utilization": results["utilization"],
+        "throughput": results["throughput"],
+        "wall_time": results["wall_time"],
+    }
+
+def make_grid(policies, worker_counts, loads, num_seeds, num_jobs=2000, arrivals="poisson",
+              runtime="lognormal", mean_runtime=1.0, priority_levels=5):
+    """
+    Build the cartesian grid of runs
+
+    Args:
+        policies: Scheduling policies
+        worker_counts: Numbers of simulated workers
+        loads: Offered loads as a fraction of the workers' capacity
+        num_seeds (int): Number of seeds per grid point, 0 to num_seeds - 1
+        num_jobs (int): Jobs per run
+        arrivals (str): Arrival process, see ARRIVAL_PROCESSES
+        runtime (str): Runtime distribution, see RUNTIME_DISTRIBUTIONS
+        mean_runtime (float): Mean job runtime in seconds
+        priority_levels (int): Priorities are drawn uniformly from 1 to this (0 for none)
+
+    Returns:
+        List of point dictionaries for run_point
+    """
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+    return [
+        {"policy": policy, "workers": workers, "load": load, "seed": seed, "num_jobs": num_jobs,
+         "arrivals": arrivals, "runtime": runtime, "mean_runtime": mean_runtime,
+         "priority_levels": priority_levels}
+        for policy, workers, load, seed in itertools.product(policies, worker_counts, loads,
+                                                             range(num_seeds))
+    ]
+
+def run_sweep(grid, processes=None):
+    """
+    Run every point of a grid across a process pool
+
+    Args:
+        grid: List of points from make_grid
+        processes (int): Number of processes (defaults to the CPU count; 1
+            runs every point in this process)
+
+    Returns:
+        List of run dictionaries, in grid order
+    """
+    if processes == 1:
+        return [run_point(point) for point in grid]
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(run_point, grid))
+
+def aggregate(runs):
+    """
+    Aggregate runs over seeds
+
+    Args:
+        runs: List of run dictionaries from run_sweep
+
+    Returns:
+        List of dictionaries, one per grid point in first-seen order, with
+        the grid coordinates, the number of seeds, and for each metric its
+        mean and the half-width of its 95% confidence interval (metric_ci)
+    """
+    groups = {}
+    for run in runs:
+        groups.setdefault(tuple(run[key] for key in SWEEP_KEYS), []).append(run)
+
+    summary = []
+    for coordinates, group in groups.items():
+        row = dict(zip(SWEEP_KEYS, coordinates))
+        row["seeds"] = len(group)
+        for metric in SWEEP_METRICS:
+            row[metric], row[f"{metric}_ci"] = confidence_interval([run[metric] for run in group])
+        summary.append(row)
+    return summary
+
+def to_columns(rows):
+    """
+    Turn a list of row dictionaries into a dictionary of equal-length columns
+
+    Args:
+        rows: List of dictionaries with the same keys
+
+    Returns:
+        Dictionary mapping each key to the list of its values
+    """
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
+def save_sweep(runs, summary, config, filename=None):
+    """
+    Save the runs and their aggregates as one columnar results file
+
+    Args:
+        runs: List of run dictionaries
+        summary: List of aggregated rows
+        config: Dictionary describing the sweep
+        filename: Optional path; defaults to results/sweep_<timestamp>.json
+
+    Returns:
+        Path of the file written
+    """
+    if filename is None:
+        results_dir = os.path.join(os.path.dirname(__file__), "..", "results")
+        os.makedirs(results_dir, exist_ok=True)
+        filename = os.path.join(results_dir, f"sweep_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    with open(filename, 'w') as f:
+        json.dump({
+            "timestamp": datetime.now().isoformat(),
+            "test_type": "sweep",
+            "config": config,
+            "runs": to_columns(runs),
+            "summary": to_columns(summary),
+        }, f)
+    return filename
+
+def print_summary(summary):
+    """
+    Print the aggregated results as a table
+
+    Args:
+        summary: List of aggregated rows
+    """
+    def interval(row, metric):
+        half_width = row[f"{metric}_ci"]
+        return f"{row[metric]:.2f}" + (f" ±{half_width:.2f}" if half_width is not None else "")
+
+    print(f"\n  {'Policy':<20}{'Workers':>8}{'Load':>6}{'Avg response':>18}{'p95 response':>18}{'Util':>14}")
+    for row in summary:
+        print(f"  {row['policy']:<20}{row['workers']:>8}{row['load']:>6.2f}"
+              f"{interval(row, 'avg_response_time'):>18}{interval(row, 'p95_response_time'):>18}"
+              f"{interval(row, 'utilization'):>14}")
+
+def main():
+    """
+    Main entry point for the parameter sweep
+    """
+    parser = argparse.ArgumentParser(
+        description='Simulate a grid of policies x worker counts x loads x seeds in parallel')
+    parser.add_argument('--policies', nargs='+', choices=POLICIES, default=["FCFS", "SJF", "Priority"])
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 4, 16], help='Worker counts')
+    parser.add_argument('--loads', nargs='+', type=float, default=[0.5, 0.7, 0.9],
+                        help='Offered loads as a fraction of capacity')
+    parser.add_argument('--seeds', type=int, default=5, help='Seeds per grid point')
+    parser.add_argument('--jobs', type=int, default=2000, help='Jobs per run')
+    parser.add_argument('--arrivals', choices=ARRIVAL_PROCESSES, default='poisson')
+    parser.add_argument('--runtime', choices=RUNTIME_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument('--mean-runtime', type=float, default=1.0, help='Mean runtime in seconds')
+    parser.add_argument('--priorities', type=int, default=5,
+                        help='Draw priorities uniformly from 1 to N (0 for none)')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='Number of processes (default: the number of CPUs)')
+    parser.add_argument('--output', default=None, help='Results file (default: results/sweep_<timestamp>.json)')
+    args = parser.parse_args()
+
+    grid = make_grid(args.policies, args.workers, args.loads, args.seeds, args.jobs, args.arrivals,
+                     args.runtime, args.mean_runtime, args.priorities)
+    processes = args.processes or os.cpu_count() or 1
+    print(f"Running {len(grid)} simulations on {processes} process(es)...")
+
+    start_time = time.perf_counter()
+    runs = run_sweep(grid, processes)
+    elapsed = time.perf_counter() - start_time
+    summary = aggregate(runs)
+    print_summary(summary)
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    path = save_sweep(runs, summary, config, args.output)
+    print(f"\nSweep of {len(grid)} runs finished in {elapsed:.1f} s "
+          f"({sum(run['wall_time'] for run in runs):.1f} s of simulation)")
+    print(f"Results saved to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@
 import sys
 import os
 import time
-import json
 from datetime import datetime
 import argparse
 import threading
@@ -14,6 +13,9 @@ from src.job import Job
 from src.queueManager import JobQueue
 from src.scheduler import Scheduler
 from src.dispatcher import Dispatcher
+from performance.simulator import Simulator
+from performance.analysis import analyze_by_policy, summarize, to_column
+from performance.results_store import ResultsStore
 
 # Add this function for the UI to call
 def run_performance_test():
@@ -26,10 +28,18 @@ def run_performance_test():
     print("\nPerformance tests completed.")
 
 class PerformanceTestRunner:
-    def __init__(self):
-        """Initialize the performance test runner"""
+    def __init__(self, simulate=False, num_workers=1):
+        """
+        Initialize the performance test runner
+        
+        Args:
+            simulate: Replay tests on the discrete-event simulator instead of sleeping
+            num_workers: Number of simulated workers (simulation only)
+        """
         self.results = {}
         self.test_configs = []
+        self.simulate = simulate
+        self.num_workers = num_workers
     
     def configure_tests(self):
         """
@@ -81,6 +91,8 @@ class PerformanceTestRunner:
         """
         print(f"\nRunning test: {config['name']}")
         
+        if self.simulate:
+            return self.run_simulated_test(config)
 
         test_jobs = self.create_test_jobs()
         num_jobs = len(test_jobs)
@@ -152,7 +164,7 @@ class PerformanceTestRunner:
         
        
         test_duration = current_time - start_time
-        avg_response_time = sum(response_times) / len(response_times)
+        avg_response_time = summarize(to_column(response_times))["mean"]
         throughput = num_jobs / test_duration
         
      
@@ -166,7 +178,11 @@ class PerformanceTestRunner:
             "timestamp": datetime.now().isoformat(),
             "test_type": config["test_type"],
             "execution_order": job_execution_order,
-            "response_times": response_times
+            "response_times": response_times,
+            "arrival_times": [job.arrival_time for job in job_objects],
+            "start_times": [job.start_time for job in job_objects],
+            "end_times": [job.end_time for job in job_objects],
+            "exec_times": [job.exec_time for job in job_objects]
         }
         
         print(f"\nTest completed: Avg Response Time: {avg_response_time:.2f}s, Throughput: {throughput:.2f} jobs/s")
@@ -174,6 +190,31 @@ class PerformanceTestRunner:
         
         return results
     
+    def run_simulated_test(self, config):
+        """
+        Run a single test on the discrete-event simulator
+        
+        Args:
+            config: Dictionary with test configuration
+            
+        Returns:
+            Dictionary with test results
+        """
+        workload = [
+            (name, exec_time, priority, i * 0.1)
+            for i, (name, exec_time, priority) in enumerate(self.create_test_jobs())
+        ]
+        results = Simulator(config["policy"], self.num_workers).run(workload, config["name"])
+        results["test_type"] = config["test_type"]
+        
+        print(f"Simulated {results['num_jobs']} jobs on {self.num_workers} worker(s) "
+              f"in {results['wall_time'] * 1000:.2f} ms")
+        print(f"Test completed: Avg Response Time: {results['avg_response_time']:.2f}s, "
+              f"Throughput: {results['throughput']:.2f} jobs/s")
+        print(f"Job execution order: {' -> '.join(results['execution_order'])}")
+        
+        return results
+    
     def run_all_tests(self):
         """
         Run all configured tests and collect results
@@ -227,6 +268,23 @@ class PerformanceTestRunner:
         for policy, result in policy_results.items():
             print(f"  {policy}: {result['throughput']:.2f} jobs/s")
         
+        metrics = analyze_by_policy(self.results["policy_comparison"])
+        
+        print("\nTurnaround p50 / p95 / p99 (lower is better):")
+        for policy, policy_metrics in metrics.items():
+            turnaround = policy_metrics["turnaround_time"]
+            print(f"  {policy}: {turnaround['p50']:.2f}s / {turnaround['p95']:.2f}s / {turnaround['p99']:.2f}s")
+        
+        print("\nMaximum waiting time (lower means less starvation):")
+        for policy, policy_metrics in metrics.items():
+            if "waiting_time" in policy_metrics:
+                print(f"  {policy}: {policy_metrics['waiting_time']['max']:.2f}s")
+        
+        print("\nSlowdown fairness, Jain's index (higher is better):")
+        for policy, policy_metrics in metrics.items():
+            if "slowdown" in policy_metrics:
+                print(f"  {policy}: {policy_metrics['slowdown']['fairness']:.3f}")
+        
         print("\nExecution Order by Policy:")
         for policy, result in policy_results.items():
             print(f"  {policy}: {' -> '.join(result['execution_order'])}")
@@ -240,37 +298,33 @@ class PerformanceTestRunner:
         print(f"  For Throughput: {best_throughput}")
         
     
-    def save_results(self, filename=None):
+    def save_results(self, store_dir=None):
         """
-        Save test results to a JSON file
+        Append every test run to the columnar results store
         
         Args:
-            filename: Optional filename to save results to
+            store_dir: Optional store directory (defaults to results/store)
         """
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"performance_results_{timestamp}.json"
-        
-        # Create results directory if it doesn't exist
-        results_dir = os.path.join(os.path.dirname(__file__), "..", "results")
-        os.makedirs(results_dir, exist_ok=True)
+        with ResultsStore(store_dir) as store:
+            for results in self.results.values():
+                for result in results:
+                    store.append(result)
         
-        file_path = os.path.join(results_dir, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump(self.results, f, indent=2)
-        
-        print(f"Results saved to {file_path}")
+        print(f"Results saved to {store.directory}")
 
 def main():
     """
     Main entry point for the performance test runner
     """
     parser = argparse.ArgumentParser(description='Run CSUbatch performance tests with hardcoded jobs')
+    parser.add_argument('--simulate', action='store_true',
+                        help='Use the discrete-event simulator instead of real-time sleeps')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of simulated dispatcher workers (with --simulate)')
     
     args = parser.parse_args()
     
-    runner = PerformanceTestRunner()
+    runner = PerformanceTestRunner(args.simulate, args.workers)
     runner.run_all_tests()
 
 if __name__ == "__main__":
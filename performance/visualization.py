@@ -1,46 +1,37 @@
 # performance/simple_visualization.py
+import sys
 import os
-import json
 import matplotlib.pyplot as plt
 from datetime import datetime
 import argparse
 
-def visualize_policy_comparison(results_file=None):
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.results_store import ResultsStore
+
+def visualize_policy_comparison(store_dir=None):
     """
     Visualize policy comparison results
     
     Args:
-        results_file: Path to the results JSON file
+        store_dir: Results store directory (defaults to results/store)
     """
-    # If no results file is specified, find the most recent one
-    if not results_file:
-        results_dir = os.path.join(os.path.dirname(__file__), "..", "results")
-        if os.path.exists(results_dir):
-            result_files = [f for f in os.listdir(results_dir) if f.startswith('performance_results_') and f.endswith('.json')]
-            if result_files:
-                result_files.sort(reverse=True)  # Most recent first
-                results_file = os.path.join(results_dir, result_files[0])
-                print(f"Using most recent results file: {results_file}")
-    
-    if not results_file or not os.path.exists(results_file):
-        print("No results file specified or file not found")
-        return
-    
-    # Load results
-    with open(results_file, 'r') as f:
-        results = json.load(f)
-    
-    print(f"Loaded results from {results_file}")
-    
-    # Check if we have policy comparison results
-    if "policy_comparison" not in results or not results["policy_comparison"]:
+    # Compare the most recent run of every policy in the store
+    with ResultsStore(store_dir) as store:
+        if not store.runs(test_type="policy_comparison"):
+            import_legacy_results(store)
+        policy_results = {}
+        for policy in store.get_policies():
+            records = store.runs(policy, test_type="policy_comparison", last=1)
+            if records:
+                policy_results[policy] = store.load(records[0])
+    
+    if not policy_results:
         print("No policy comparison results available")
         return
     
-    policy_results = {}
-    for result in results["policy_comparison"]:
-        policy = result["policy"]
-        policy_results[policy] = result
+    print(f"Loaded the latest runs of {len(policy_results)} policies from {store.directory}")
     
     policies = list(policy_results.keys())
     
@@ -109,6 +100,28 @@ def visualize_policy_comparison(results_file=None):
     # Return path for display in notebook environments
     return save_path
 
+def import_legacy_results(store, results_dir=None):
+    """
+    Import the JSON results files saved before the results store existed
+    
+    Args:
+        store: The ResultsStore to import into
+        results_dir: Directory holding performance_results_*.json files
+            (defaults to results)
+    
+    Returns:
+        Number of runs imported
+    """
+    results_dir = results_dir or os.path.join(os.path.dirname(__file__), "..", "results")
+    if not os.path.isdir(results_dir):
+        return 0
+    result_files = sorted(f for f in os.listdir(results_dir)
+                          if f.startswith('performance_results_') and f.endswith('.json'))
+    imported = sum(store.import_json(os.path.join(results_dir, f)) for f in result_files)
+    if imported:
+        print(f"Imported {imported} runs from {len(result_files)} JSON results files in {results_dir}")
+    return imported
+
 def create_summary_table(policy_results, save_dir):
     """
     Create a summary table of policy comparison results
@@ -155,11 +168,11 @@ def create_summary_table(policy_results, save_dir):
 
 def main():
     parser = argparse.ArgumentParser(description='Visualize CSUbatch policy comparison results')
-    parser.add_argument('--results', type=str, help='Path to results JSON file')
+    parser.add_argument('--store', type=str, help='Results store directory (default: results/store)')
     
     args = parser.parse_args()
     
-    visualize_policy_comparison(args.results)
+    visualize_policy_comparison(args.store)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,516 @@
+import sys
+import os
+import io
+import csv
+import gzip
+import math
+import time
+import random
+import argparse
+import itertools
+import contextlib
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue, POLICIES
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool
+from src.executor import EXECUTORS, create_executor
+from performance.simulator import simulate
+
+# A workload is an iterable of (name, exec_time, priority, arrival_time[, cpus[, memory]])
+# tuples sorted by arrival_time, as the Simulator takes them. Every workload
+# class below can be iterated any number of times and yields the same jobs
+# each time, reading its file or drawing its random numbers afresh.
+
+ARRIVAL_PROCESSES = ("poisson", "bursty")
+RUNTIME_DISTRIBUTIONS = ("exponential", "lognormal", "pareto", "uniform")
+
+# Columns of a CSV job log, in the order write_csv() writes them
+CSV_COLUMNS = ("name", "exec_time", "priority", "arrival_time", "cpus", "memory")
+
+# Fields of a Standard Workload Format line (0-based)
+SWF_JOB_ID = 0
+SWF_SUBMIT_TIME = 1
+SWF_RUN_TIME = 3
+SWF_ALLOCATED_PROCS = 4
+SWF_USED_MEMORY = 6
+SWF_REQUESTED_PROCS = 7
+SWF_REQUESTED_TIME = 8
+SWF_REQUESTED_MEMORY = 9
+SWF_STATUS = 10
+SWF_QUEUE = 14
+
+# SWF status of a job cancelled before it started
+SWF_CANCELLED = 5
+
+def _open_text(path):
+    """
+    Open a trace for reading, decompressing it on the fly if it ends in .gz
+
+    Args:
+        path (str): Path of the trace
+
+    Returns:
+        A text file object
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="")
+    return open(path, newline="")
+
+
+class SWFTrace:
+    def __init__(self, path, with_resources=False, skip_cancelled=True):
+        """
+        Stream jobs from a Standard Workload Format trace
+
+        The trace is read line by line on every pass, so traces of any size
+        replay in constant memory. Arrival times are shifted so the first
+        job arrives at 0. Jobs whose run time is unknown fall back to their
+        requested time; jobs with neither are skipped. SWF has no priority,
+        so the queue number is used, where known.
+
+        Args:
+            path (str): Path of the trace, optionally gzip-compressed
+            with_resources (bool): Whether to yield each job's processors and
+                memory (requested, else used), for replays on a ResourcePool
+            skip_cancelled (bool): Whether to skip jobs cancelled before they ran
+        """
+        self.path = path
+        self.with_resources = with_resources
+        self.skip_cancelled = skip_cancelled
+
+    def __iter__(self):
+        """
+        Yield the jobs of the trace in submit order
+
+        Raises:
+            ValueError: If submit times go backwards
+        """
+        first_submit = None
+        last_arrival = 0.0
+        with _open_text(self.path) as stream:
+            for line_number, line in enumerate(stream, 1):
+                fields = line.split()
+                if not fields or fields[0].startswith(";"):
+                    continue  # header comment
+                try:
+                    job = self._parse(fields)
+                except (ValueError, IndexError):
+                    print(f"Warning: Skipping invalid line {line_number}: {line.strip()}")
+                    continue
+                if job is None:
+                    continue
+                if first_submit is None:
+                    first_submit = job[3]
+                arrival = job[3] - first_submit
+                if arrival < last_arrival:
+                    raise ValueError(f"{self.path}:{line_number}: submit times must not decrease")
+                last_arrival = arrival
+                yield job[:3] + (arrival,) + job[4:]
+
+    def _parse(self, fields):
+        """
+        Convert the fields of one SWF line to a job tuple
+
+        Args:
+            fields: List of whitespace-separated fields
+
+        Returns:
+            Job tuple with the absolute submit time as arrival_time, or None
+            if the job should be skipped
+        """
+        if self.skip_cancelled and len(fields) > SWF_STATUS and int(fields[SWF_STATUS]) == SWF_CANCELLED:
+            return None
+        exec_time = float(fields[SWF_RUN_TIME])
+        if exec_time < 0 and len(fields) > SWF_REQUESTED_TIME:
+            exec_time = float(fields[SWF_REQUESTED_TIME])
+        if exec_time < 0:
+            return None
+
+        priority = 0
+        if len(fields) > SWF_QUEUE:
+            priority = max(0, int(fields[SWF_QUEUE]))
+        job = (f"job{fields[SWF_JOB_ID]}", exec_time, priority, float(fields[SWF_SUBMIT_TIME]))
+        if not self.with_resources:
+            return job
+
+        cpus = int(fields[SWF_REQUESTED_PROCS]) if len(fields) > SWF_REQUESTED_PROCS else -1
+        if cpus <= 0:
+            cpus = int(fields[SWF_ALLOCATED_PROCS])
+        # SWF memory is in KB per processor
+        memory = float(fields[SWF_REQUESTED_MEMORY]) if len(fields) > SWF_REQUESTED_MEMORY else -1
+        if memory < 0 and len(fields) > SWF_USED_MEMORY:
+            memory = float(fields[SWF_USED_MEMORY])
+        return job + (max(1, cpus), max(0.0, memory) * max(1, cpus) / 1024)
+
+
+class CSVTrace:
+    def __init__(self, path, columns=None):
+        """
+        Stream jobs from a CSV job log with a header row
+
+        Only exec_time and arrival_time are required; a missing name becomes
+        job<row>, and missing priority, cpus and memory take the defaults of
+        Scheduler.submit_job. Rows must be sorted by arrival time.
+
+        Args:
+            path (str): Path of the log, optionally gzip-compressed
+            columns: Optional dictionary mapping names in CSV_COLUMNS to the
+                log's own column names
+        """
+        self.path = path
+        self.columns = dict(zip(CSV_COLUMNS, CSV_COLUMNS))
+        if columns:
+            self.columns.update(columns)
+
+    def __iter__(self):
+        """
+        Yield the jobs of the log in row order
+
+        Raises:
+            ValueError: If a required column is missing or arrival times go backwards
+        """
+        with _open_text(self.path) as stream:
+            reader = csv.reader(stream)
+            header = next(reader, None)
+            if header is None:
+                return
+            index = {column: position for position, column in enumerate(header)}
+            positions = {field: index.get(column) for field, column in self.columns.items()}
+            for field in ("exec_time", "arrival_time"):
+                if positions[field] is None:
+                    raise ValueError(f"{self.path}: missing column '{self.columns[field]}'")
+            # Only yield resources the log records, so tuples stay short otherwise
+            extras = [field for field in ("cpus", "memory") if positions[field] is not None]
+
+            last_arrival = float('-inf')
+            for row_number, row in enumerate(reader, 1):
+                if not row:
+                    continue
+                try:
+                    job = self._parse(row, row_number, positions, extras)
+                except (ValueError, IndexError):
+                    print(f"Warning: Skipping invalid row {row_number}: {','.join(row)}")
+                    continue
+                if job[3] < last_arrival:
+                    raise ValueError(f"{self.path}: row {row_number}: arrival times must not decrease")
+                last_arrival = job[3]
+                yield job
+
+    def _parse(self, row, row_number, positions, extras):
+        """
+        Convert one CSV row to a job tuple
+
+        Args:
+            row: List of field values
+            row_number (int): Row number, used for unnamed jobs
+            positions: Dictionary mapping fields to column positions or None
+            extras: Resource fields present in the log
+
+        Returns:
+            Job tuple
+        """
+        name = row[positions["name"]] if positions["name"] is not None else f"job{row_number}"
+        priority = int(row[positions["priority"]] or 0) if positions["priority"] is not None else 0
+        job = (name, float(row[positions["exec_time"]]), priority, float(row[positions["arrival_time"]]))
+        if "cpus" in extras:
+            job += (int(row[positions["cpus"]] or 1),)
+        if "memory" in extras:
+            if "cpus" not in extras:
+                job += (1,)
+            job += (float(row[positions["memory"]] or 0),)
+        return job
+
+
+class SyntheticWorkload:
+    def __init__(self, num_jobs, seed=0, rate=1.0, arrivals="poisson", runtime="lognormal",
+                 mean_runtime=1.0, shape=None, max_runtime=None, priorities=None,
+                 burstiness=10.0, burst_share=0.1, burst_size=20):
+        """
+        Generate a seeded synthetic workload
+
+        Runtimes follow a heavy-tailed distribution by default: lognormal
+        with shape (sigma) 1.5, or pareto with shape (alpha) 1.5, whose
+        variance is infinite. Under "bursty" arrivals the rate switches
+        between a calm level and burstiness times that level, spending
+        burst_share of the time in bursts of about burst_size jobs, with the
+        same mean rate as "poisson".
+
+        Args:
+            num_jobs (int): Number of jobs, or None for an endless stream
+            seed (int): Random seed; the same seed yields the same jobs
+            rate (float): Mean arrivals per second
+            arrivals (str): One of ARRIVAL_PROCESSES
+            runtime (str): One of RUNTIME_DISTRIBUTIONS
+            mean_runtime (float): Mean job runtime in seconds
+            shape (float): Shape of the lognormal or pareto distribution
+            max_runtime (float): Optional cap on runtimes
+            priorities: Optional dictionary mapping priority levels to their
+                weights in the mix (default: every job has priority 0)
+            burstiness (float): Ratio of the burst rate to the calm rate
+            burst_share (float): Fraction of time spent in bursts
+            burst_size (float): Mean number of jobs per burst
+        """
+        if arrivals not in ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process: {arrivals}")
+        if runtime not in RUNTIME_DISTRIBUTIONS:
+            raise ValueError(f"Unknown runtime distribution: {runtime}")
+        if rate <= 0 or mean_runtime <= 0:
+            raise ValueError("rate and mean_runtime must be positive")
+        if runtime == "pareto" and shape is not None and shape <= 1:
+            raise ValueError("pareto shape must be above 1 for the mean to exist")
+
+        self.num_jobs = num_jobs
+        self.seed = seed
+        self.rate = rate
+        self.arrivals = arrivals
+        self.runtime = runtime
+        self.mean_runtime = mean_runtime
+        self.shape = shape if shape is not None else 1.5
+        self.max_runtime = max_runtime
+        self.priorities = priorities
+        self.burstiness = burstiness
+        self.burst_share = burst_share
+        self.burst_size = burst_size
+
+    def __iter__(self):
+        """
+        Yield the jobs in arrival order
+        """
+        rng = random.Random(self.seed)
+        if self.arrivals == "poisson":
+            arrival_times = self._poisson_arrivals(rng)
+        else:
+            arrival_times = self._bursty_arrivals(rng)
+        draw_runtime = getattr(self, f"_{self.runtime}_runtime")
+        levels, cum_weights = None, None
+        if self.priorities:
+            levels = list(self.priorities)
+            cum_weights = list(itertools.accumulate(self.priorities[level] for level in levels))
+
+        for i in (range(self.num_jobs) if self.num_jobs is not None else itertools.count()):
+            arrival = next(arrival_times)
+            exec_time = draw_runtime(rng)
+            if self.max_runtime is not None:
+                exec_time = min(exec_time, self.max_runtime)
+            priority = rng.choices(levels, cum_weights=cum_weights)[0] if levels else 0
+            yield (f"job{i}", exec_time, priority, arrival)
+
+    def _poisson_arrivals(self, rng):
+        """
+        Yield arrival times of a Poisson process
+        """
+        now = 0.0
+        while True:
+            now += rng.expovariate(self.rate)
+            yield now
+
+    def _bursty_arrivals(self, rng):
+        """
+        Yield arrival times of a two-state Markov-modulated Poisson process
+        """
+        calm_rate = self.rate / (1 - self.burst_share + self.burstiness * self.burst_share)
+        burst_rate = calm_rate * self.burstiness
+        burst_length = self.burst_size / burst_rate
+        calm_length = burst_length * (1 - self.burst_share) / self.burst_share
+        now = 0.0
+        bursting = False
+        left = rng.expovariate(1 / calm_length)
+        while True:
+            gap = rng.expovariate(burst_rate if bursting else calm_rate)
+            if gap < left:
+                now += gap
+                left -= gap
+                yield now
+            else:
+                # Arrivals are memoryless, so the gap restarts in the new state
+                now += left
+                bursting = not bursting
+                left = rng.expovariate(1 / (burst_length if bursting else calm_length))
+
+    def _exponential_runtime(self, rng):
+        return rng.expovariate(1 / self.mean_runtime)
+
+    def _lognormal_runtime(self, rng):
+        sigma = self.shape
+        return rng.lognormvariate(math.log(self.mean_runtime) - sigma * sigma / 2, sigma)
+
+    def _pareto_runtime(self, rng):
+        alpha = self.shape
+        return rng.paretovariate(alpha) * self.mean_runtime * (alpha - 1) / alpha
+
+    def _uniform_runtime(self, rng):
+        return rng.uniform(0.5 * self.mean_runtime, 1.5 * self.mean_runtime)
+
+
+def open_workload(path, with_resources=False):
+    """
+    Open a trace by its extension: .swf (optionally .swf.gz) or CSV otherwise
+
+    Args:
+        path (str): Path of the trace
+        with_resources (bool): Whether SWF jobs carry processors and memory
+
+    Returns:
+        SWFTrace or CSVTrace
+    """
+    if path.endswith(".swf") or path.endswith(".swf.gz"):
+        return SWFTrace(path, with_resources)
+    return CSVTrace(path)
+
+def write_csv(workload, path):
+    """
+    Write a workload as a CSV job log that CSVTrace reads back
+
+    Args:
+        workload: Iterable of job tuples, consumed lazily
+        path (str): Path of the log; a .gz suffix compresses it
+
+    Returns:
+        Number of jobs written
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    count = 0
+    with opener(path, "wt", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(CSV_COLUMNS)
+        for job in workload:
+            # repr keeps every float exact; absent resources get submit_job's defaults
+            cpus = job[4] if len(job) > 4 else 1
+            memory = job[5] if len(job) > 5 else 0
+            writer.writerow([job[0], repr(job[1]), job[2], repr(job[3]), cpus, memory])
+            count += 1
+    return count
+
+def replay(workload, scheduler, time_scale=1.0, clock=time.monotonic, sleep=time.sleep):
+    """
+    Submit a workload to a live scheduler as its jobs arrive
+
+    Jobs due at the same moment are submitted as one batch. time_scale
+    shrinks (or stretches) both arrival times and execution times, so a
+    trace spanning days can be replayed as a scale model in minutes.
+
+    Args:
+        workload: Iterable of job tuples sorted by arrival_time, consumed lazily
+        scheduler: Scheduler whose queue dispatchers are draining
+        time_scale (float): Factor applied to arrival and execution times
+        clock: Monotonic clock in seconds
+        sleep: Function sleeping for a number of seconds
+
+    Returns:
+        Number of jobs submitted
+    """
+    start = clock()
+    first_arrival = None
+    submitted = 0
+    batch = []
+    for job in workload:
+        if first_arrival is None:
+            first_arrival = job[3]
+        wait = start + (job[3] - first_arrival) * time_scale - clock()
+        if wait > 0:
+            if batch:
+                submitted += len(scheduler.submit_batch(batch))
+                batch = []
+            sleep(wait)
+        batch.append((job[0], job[1] * time_scale, job[2]) + tuple(job[4:6]))
+    if batch:
+        submitted += len(scheduler.submit_batch(batch))
+    return submitted
+
+def replay_live(workload, policy="FCFS", num_workers=1, time_scale=1.0, executor="inline"):
+    """
+    Replay a workload through a fresh scheduler and dispatcher pool
+
+    Args:
+        workload: Iterable of job tuples sorted by arrival_time
+        policy (str): Scheduling policy
+        num_workers (int): Number of dispatcher threads
+        time_scale (float): Factor applied to arrival and execution times
+        executor (str): One of EXECUTORS
+
+    Returns:
+        Dictionary with the scheduler's performance statistics
+    """
+    job_queue = JobQueue()
+    scheduler = Scheduler(job_queue)
+    if not scheduler.change_policy(policy):
+        raise ValueError(f"Unknown scheduling policy: {policy}")
+    pool = DispatcherPool(job_queue, scheduler, num_workers, create_executor(executor, num_workers))
+
+    # Dispatchers report every job on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time = time.time()
+        pool.start()
+        try:
+            submitted = replay(workload, scheduler, time_scale)
+            scheduler.wait_for_completions(submitted)
+        finally:
+            pool.stop()
+            pool.join()
+    stats = scheduler.get_performance_stats()
+    stats["wall_time"] = time.time() - start_time
+    return stats
+
+def main():
+    """
+    Main entry point for workload replay and generation
+    """
+    parser = argparse.ArgumentParser(description='Replay a job trace or synthetic workload against CSUbatch')
+    parser.add_argument('trace', nargs='?', default=None,
+                        help='SWF trace (.swf, .swf.gz) or CSV job log; omit for a synthetic workload')
+    parser.add_argument('--policy', choices=POLICIES, default='FCFS', help='Scheduling policy')
+    parser.add_argument('--workers', type=int, default=1, help='Number of dispatcher workers')
+    parser.add_argument('--limit', type=int, default=None, help='Replay only the first N jobs')
+    parser.add_argument('--live', action='store_true',
+                        help='Run the jobs on real dispatchers instead of the simulator')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Factor applied to arrival and execution times in live replays')
+    parser.add_argument('--executor', choices=sorted(EXECUTORS), default='inline',
+                        help='How jobs are run in live replays (default: inline)')
+    parser.add_argument('--output', metavar='CSV', default=None,
+                        help='Write the workload to a CSV job log instead of replaying it')
+    synthetic = parser.add_argument_group('synthetic workloads')
+    synthetic.add_argument('--jobs', type=int, default=1000, help='Number of jobs')
+    synthetic.add_argument('--seed', type=int, default=0, help='Random seed')
+    synthetic.add_argument('--rate', type=float, default=1.0, help='Mean arrivals per second')
+    synthetic.add_argument('--arrivals', choices=ARRIVAL_PROCESSES, default='poisson')
+    synthetic.add_argument('--runtime', choices=RUNTIME_DISTRIBUTIONS, default='lognormal')
+    synthetic.add_argument('--mean-runtime', type=float, default=1.0, help='Mean runtime in seconds')
+    synthetic.add_argument('--priorities', type=int, default=0,
+                           help='Draw priorities uniformly from 1 to N (default: all 0)')
+    args = parser.parse_args()
+
+    if args.trace:
+        workload = open_workload(args.trace)
+    else:
+        priorities = {level: 1 for level in range(1, args.priorities + 1)} or None
+        workload = SyntheticWorkload(args.jobs, args.seed, args.rate, args.arrivals, args.runtime,
+                                     args.mean_runtime, priorities=priorities)
+    if args.limit is not None:
+        workload = itertools.islice(workload, args.limit)
+
+    if args.output:
+        count = write_csv(workload, args.output)
+        print(f"Wrote {count} jobs to {args.output}")
+        return
+
+    if args.live:
+        stats = replay_live(workload, args.policy, args.workers, args.time_scale, args.executor)
+        print(f"\nReplayed {stats['completed_jobs']} jobs live under {args.policy} "
+              f"in {stats['wall_time']:.2f} s")
+        print(f"  Average Response Time: {stats['avg_response_time']:.2f} seconds")
+        print(f"  Response Time p95: {stats['latency']['response_time']['p95']:.2f} seconds")
+        return
+
+    results = simulate(workload, args.policy, args.workers)
+    print(f"\nSimulated {results['num_jobs']} jobs under {args.policy} "
+          f"in {results['wall_time']:.2f} s")
+    print(f"  Average Response Time: {results['avg_response_time']:.2f} seconds")
+    print(f"  Response Time p95: {results['latency']['response_time']['p95']:.2f} seconds")
+    print(f"  Utilization: {results['utilization']:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ setup(
     author_email="-",
     packages=find_packages(),
     install_requires=[],
+    extras_require={
+        # Vectorized analysis of result sets with millions of jobs
+        'analysis': ['numpy'],
+    },
     entry_points={
         'console_scripts': [
             'csubatch=src.main:main',
@@ -0,0 +1,255 @@
+# src/client.py
+import asyncio
+import collections
+import json
+import socket
+
+from src.server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE
+
+class ServerError(Exception):
+    """Raised when the server rejects a request"""
+
+
+def _encode(request):
+    return json.dumps(request, separators=(',', ':')).encode() + b"\n"
+
+def _decode(line):
+    if not line:
+        raise ConnectionError("Server closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ServerError(response.get("error", "Request failed"))
+    return response
+
+def _profile_request(enabled, reset):
+    request = {"op": "profile", "reset": reset}
+    if enabled is not None:
+        request["enabled"] = enabled
+    return request
+
+
+class JobClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, timeout=None):
+        """
+        Connect to a CSUbatch server
+
+        Args:
+            host (str): Server address for TCP
+            port (int): Server TCP port
+            path (str): Unix socket path to connect to instead of TCP
+            timeout (float): Optional socket timeout in seconds
+        """
+        if path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.file = self.sock.makefile("rb")
+
+    def request(self, request):
+        """
+        Send one request and wait for its response
+
+        Args:
+            request (dict): The request, with an "op" field
+
+        Returns:
+            The response dictionary
+
+        Raises:
+            ServerError: If the server rejected the request
+        """
+        self.sock.sendall(_encode(request))
+        return _decode(self.file.readline(MAX_LINE))
+
+    def submit(self, name, exec_time, priority=0, cpus=1, memory=0, depends_on=()):
+        """
+        Submit a job
+
+        Returns:
+            The id the scheduler assigned to the job
+        """
+        return self.request({"op": "submit", "name": name, "exec_time": exec_time,
+                             "priority": priority, "cpus": cpus, "memory": memory,
+                             "depends_on": list(depends_on)})["job_id"]
+
+    def submit_many(self, specs):
+        """
+        Submit many jobs, sending every request before reading any response
+
+        Args:
+            specs: Iterable of (name, exec_time[, priority[, cpus[, memory[, depends_on]]]]) tuples
+
+        Returns:
+            List of job ids, in the order of specs
+        """
+        lines = []
+        for spec in specs:
+            request = {"op": "submit", "name": spec[0], "exec_time": spec[1]}
+            request.update(zip(("priority", "cpus", "memory", "depends_on"), spec[2:]))
+            lines.append(_encode(request))
+        self.sock.sendall(b"".join(lines))
+        return [_decode(self.file.readline(MAX_LINE))["job_id"] for _ in lines]
+
+    def list_jobs(self, limit=None):
+        """
+        Get the running and queued jobs
+
+        Returns:
+            Dictionary with policy, queue_size, running, queued and blocked
+        """
+        request = {"op": "list"}
+        if limit is not None:
+            request["limit"] = limit
+        return self.request(request)
+
+    def change_policy(self, policy):
+        """
+        Change the scheduling policy
+        """
+        self.request({"op": "policy", "policy": policy})
+
+    def stats(self):
+        """
+        Get the scheduler performance statistics
+        """
+        return self.request({"op": "stats"})["stats"]
+
+    def profile(self, enabled=None, reset=False):
+        """
+        Get the server's profiler timings, optionally turning profiling on or off
+
+        Args:
+            enabled: True or False to switch profiling, None to leave it
+            reset (bool): Whether to clear the timings first
+
+        Returns:
+            The profile, as returned by Profiler.dump
+        """
+        return self.request(_profile_request(enabled, reset))["profile"]
+
+    def close(self):
+        """
+        Close the connection
+        """
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncJobClient:
+    def __init__(self, reader, writer):
+        """
+        Wrap an open connection; use AsyncJobClient.connect to create one
+
+        Requests are pipelined: each call writes its request immediately and
+        waits for its own response, so many calls can be outstanding at once.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.waiting = collections.deque()
+        self.receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Connect to a CSUbatch server
+
+        Args:
+            host (str): Server address for TCP
+            port (int): Server TCP port
+            path (str): Unix socket path to connect to instead of TCP
+
+        Returns:
+            A connected AsyncJobClient
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+            writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls(reader, writer)
+
+    async def request(self, request):
+        """
+        Send one request and wait for its response
+
+        Raises:
+            ServerError: If the server rejected the request
+        """
+        if self.receiver.done():
+            raise ConnectionError("Connection is closed")
+        future = asyncio.get_event_loop().create_future()
+        self.waiting.append(future)
+        self.writer.write(_encode(request))
+        return _decode(await future)
+
+    async def submit(self, name, exec_time, priority=0, cpus=1, memory=0, depends_on=()):
+        """
+        Submit a job
+
+        Returns:
+            The id the scheduler assigned to the job
+        """
+        response = await self.request({"op": "submit", "name": name, "exec_time": exec_time,
+                                       "priority": priority, "cpus": cpus, "memory": memory,
+                                       "depends_on": list(depends_on)})
+        return response["job_id"]
+
+    async def list_jobs(self, limit=None):
+        """
+        Get the running and queued jobs
+        """
+        request = {"op": "list"}
+        if limit is not None:
+            request["limit"] = limit
+        return await self.request(request)
+
+    async def change_policy(self, policy):
+        """
+        Change the scheduling policy
+        """
+        await self.request({"op": "policy", "policy": policy})
+
+    async def stats(self):
+        """
+        Get the scheduler performance statistics
+        """
+        return (await self.request({"op": "stats"}))["stats"]
+
+    async def profile(self, enabled=None, reset=False):
+        """
+        Get the server's profiler timings, optionally turning profiling on or off
+        """
+        return (await self.request(_profile_request(enabled, reset)))["profile"]
+
+    async def close(self):
+        """
+        Close the connection
+        """
+        self.writer.close()
+        await self.receiver
+
+    async def _receive(self):
+        """
+        Hand each response line to the oldest outstanding request
+        """
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                if self.waiting:
+                    self.waiting.popleft().set_result(line)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            while self.waiting:
+                self.waiting.popleft().set_result(b"")
@@ -0,0 +1,471 @@
+# src/cluster.py
+import asyncio
+import collections
+import functools
+import itertools
+import math
+import os
+import socket
+import threading
+import time
+
+from src.job import Job
+from src.resources import ResourcePool, Node, host_memory
+from src.server import JobServer, DEFAULT_HOST, DEFAULT_PORT
+from src.client import JobClient, ServerError
+from src.executor import create_executor
+
+# Seconds an agent may go without contacting the coordinator before it is
+# considered dead and its leased jobs are queued again
+DEFAULT_LEASE_TIMEOUT = 10.0
+
+# Longest time a lease request is held open while no job can be handed out
+LEASE_POLL = 1.0
+
+
+class RemoteAgent:
+    """The coordinator's view of one connected worker agent"""
+
+    def __init__(self, agent_id, node):
+        """
+        Initialize an agent with nothing leased
+
+        Args:
+            agent_id (str): Id the coordinator gave the agent
+            node: Node holding the agent's CPUs and memory
+        """
+        self.agent_id = agent_id
+        self.node = node
+        self.last_seen = time.monotonic()
+        self.jobs = {}                      # job id -> job leased to the agent
+        self.waiting = collections.deque()  # futures of lease requests held open
+
+
+class Coordinator(JobServer):
+    """
+    JobServer that hands jobs to remote worker agents instead of local threads
+
+    Agents register their CPUs and memory, which become one node each in the
+    coordinator's ResourcePool, so jobs are placed best-fit across every
+    agent with the same backfilling as a single host. An agent's execution
+    slots each hold a lease request open until a job fits on its node.
+
+    Every request from an agent renews all its leases. An agent silent for
+    longer than the lease timeout is dropped: its leased jobs go back to
+    the queue and start over on another agent.
+
+    Besides the JobServer operations, agents send:
+        {"op": "register", "name": ..., "cpus": ..., "memory": ...}
+        {"op": "lease", "agent": ...}       -> {"ok": true, "job": {...} or null}
+        {"op": "heartbeat", "agent": ...}
+        {"op": "complete", "agent": ..., "job_id": ..., "error": ...}
+        {"op": "release", "agent": ..., "job_id": ...}
+    """
+
+    def __init__(self, scheduler, job_queue, resources=None, lease_timeout=DEFAULT_LEASE_TIMEOUT):
+        """
+        Initialize the coordinator
+
+        Args:
+            scheduler: The scheduler that jobs are submitted to
+            job_queue: The shared job queue
+            resources: Optional ResourcePool, normally without nodes; each
+                agent adds its own
+            lease_timeout (float): Seconds of silence after which an agent is dropped
+        """
+        super().__init__(scheduler, job_queue)
+        # Leased jobs are the running jobs reported by list requests
+        self.dispatcher = self
+        self.resources = resources if resources is not None else ResourcePool([])
+        self.lease_timeout = lease_timeout
+        self.agents = {}  # agent id -> RemoteAgent
+        self.agent_ids = itertools.count(1)
+        self.expirer = None
+        self.handlers.update({
+            "register": self.handle_register,
+            "lease": self.handle_lease,
+            "heartbeat": self.handle_heartbeat,
+            "complete": self.handle_complete,
+            "release": self.handle_release,
+        })
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start listening and expiring leases
+
+        Returns:
+            The listening address, (host, port) for TCP or the socket path
+        """
+        address = await super().start(host, port, path)
+        self.expirer = asyncio.ensure_future(self._expire_agents())
+        return address
+
+    async def stop(self):
+        """
+        Stop accepting connections and expiring leases
+        """
+        if self.expirer is not None:
+            self.expirer.cancel()
+            self.expirer = None
+        await super().stop()
+
+    def handle_register(self, request):
+        """
+        Add an agent and its node
+
+        Returns:
+            Future resolving to {"ok": True, "agent": ..., "lease_timeout": ...}
+        """
+        name = str(request.get("name", "agent"))
+        agent_id = f"{name}-{next(self.agent_ids)}"
+        # Agents that cannot tell their memory leave it unlimited
+        node = Node(agent_id, int(request["cpus"]), float(request.get("memory", math.inf)))
+        self.resources.add_node(node)
+        self.agents[agent_id] = RemoteAgent(agent_id, node)
+        print(f"Agent {agent_id} joined with {node.cpus} CPUs")
+        self._grant_leases()
+        return self._done({"ok": True, "agent": agent_id, "lease_timeout": self.lease_timeout})
+
+    def handle_lease(self, request):
+        """
+        Lease the next job that fits on the agent's node
+
+        The request is held open for up to LEASE_POLL seconds while no job fits.
+
+        Returns:
+            Future resolving to {"ok": True, "job": ...}, with None for no job
+        """
+        agent = self._touch(request)
+        if agent is None:
+            return self._error("Unknown agent")
+        future = asyncio.get_event_loop().create_future()
+        agent.waiting.append(future)
+        self._grant_leases()
+        if not future.done():
+            asyncio.get_event_loop().call_later(LEASE_POLL, self._end_poll, agent, future)
+        return future
+
+    def handle_heartbeat(self, request):
+        """
+        Renew an agent's leases
+        """
+        if self._touch(request) is None:
+            return self._error("Unknown agent")
+        return self._done({"ok": True})
+
+    def handle_complete(self, request):
+        """
+        Record that a leased job has finished
+        """
+        agent = self._touch(request)
+        if agent is None:
+            return self._error("Unknown agent")
+        job = agent.jobs.pop(int(request["job_id"]), None)
+        if job is None:
+            # The lease expired and the job was queued again
+            return self._error("Lease expired")
+
+        if request.get("error"):
+            print(f"Error executing job {job.name} on {agent.agent_id}: {request['error']}")
+        self.resources.release(job)
+        job.remaining_time = 0.0
+        job.status = "Completed"
+        job.end_time = time.time()
+        self.scheduler.register_job_completion(job)
+        self._grant_leases()
+        return self._done({"ok": True})
+
+    def handle_release(self, request):
+        """
+        Queue again a leased job the agent did not start
+        """
+        agent = self._touch(request)
+        if agent is None:
+            return self._error("Unknown agent")
+        job = agent.jobs.pop(int(request["job_id"]), None)
+        if job is None:
+            return self._error("Lease expired")
+        self._requeue(job)
+        self._grant_leases()
+        return self._done({"ok": True})
+
+    def get_running_jobs(self):
+        """
+        Get the jobs leased to agents
+
+        Returns:
+            List of leased jobs
+        """
+        # Copy the dictionaries, which the event loop changes, in one step each
+        return [job for agent in list(self.agents.values()) for job in list(agent.jobs.values())]
+
+    def _flush_submits(self):
+        """
+        Submit the pending batch and hand its jobs to waiting agents
+        """
+        super()._flush_submits()
+        self._grant_leases()
+
+    def _touch(self, request):
+        """
+        Look up the agent a request comes from and renew its leases
+
+        Returns:
+            The RemoteAgent, or None if it is unknown or was dropped
+        """
+        agent = self.agents.get(request.get("agent"))
+        if agent is not None:
+            agent.last_seen = time.monotonic()
+        return agent
+
+    def _grant_leases(self):
+        """
+        Hand jobs to open lease requests for as long as jobs fit
+        """
+        for agent in list(self.agents.values()):
+            place = functools.partial(self.resources.place, node=agent.node)
+            while agent.waiting:
+                job = self.job_queue.get_job(place, block=False)
+                if job is None:
+                    break
+                job.status = "Running"
+                job.start_time = time.time()
+                agent.jobs[job.job_id] = job
+                self.scheduler.register_job_start(job)
+                agent.waiting.popleft().set_result({"ok": True, "job": self._describe(job)})
+
+    def _end_poll(self, agent, future):
+        """
+        Answer a lease request that is still open with no job
+        """
+        if not future.done():
+            agent.waiting.remove(future)
+            future.set_result({"ok": True, "job": None})
+
+    def _requeue(self, job):
+        """
+        Return a leased job to the queue, to start over
+        """
+        self.resources.release(job)
+        job.status = "Waiting"
+        job.start_time = None
+        job.remaining_time = job.exec_time
+        self.job_queue.add_job(job)
+
+    def _drop(self, agent):
+        """
+        Remove an agent, queueing its leased jobs again
+        """
+        del self.agents[agent.agent_id]
+        for job in agent.jobs.values():
+            self._requeue(job)
+        self.resources.remove_node(agent.node)
+        while agent.waiting:
+            agent.waiting.popleft().set_result({"ok": False, "error": "Unknown agent"})
+        print(f"Agent {agent.agent_id} timed out; {len(agent.jobs)} jobs were queued again")
+        self._grant_leases()
+
+    async def _expire_agents(self):
+        """
+        Drop agents that have been silent for longer than the lease timeout
+        """
+        while True:
+            await asyncio.sleep(self.lease_timeout / 4)
+            now = time.monotonic()
+            for agent in list(self.agents.values()):
+                if now - agent.last_seen > self.lease_timeout:
+                    self._drop(agent)
+
+
+class WorkerAgent:
+    """
+    Runs jobs leased from a Coordinator, like a DispatcherPool on another host
+
+    Each execution slot is a thread with its own connection that leases one
+    job at a time, runs it and reports its completion. A heartbeat thread
+    renews the agent's leases while jobs run. If the coordinator has
+    dropped the agent, it registers again.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, name=None, cpus=None, memory=None,
+                 slots=None, executor=None):
+        """
+        Initialize the agent
+
+        Args:
+            host (str): Coordinator address
+            port (int): Coordinator TCP port
+            name (str): Name the agent registers under (defaults to the hostname)
+            cpus (int): CPU cores offered to jobs (defaults to the CPU count)
+            memory (float): Memory in MB offered to jobs (defaults to physical memory)
+            slots (int): Number of jobs run at once (defaults to cpus)
+            executor: Backend that runs jobs (defaults to one subprocess per job)
+        """
+        self.host = host
+        self.port = port
+        self.name = name or socket.gethostname()
+        self.cpus = cpus or os.cpu_count() or 1
+        self.memory = memory if memory is not None else host_memory()
+        self.slots = slots or self.cpus
+        self.executor = executor if executor is not None else create_executor("subprocess", self.slots)
+        self.stopped = threading.Event()
+        self.finished = threading.Event()  # set once no slot is running a job
+        self.agent_id = None
+        self.heartbeat_interval = DEFAULT_LEASE_TIMEOUT / 3
+        self.control = None  # connection for registration and heartbeats
+        self.lock = threading.Lock()  # guards control and agent_id
+        self.slot_threads = []
+        self.heartbeat_thread = None
+
+    def start(self):
+        """
+        Register with the coordinator and start the slot and heartbeat threads
+        """
+        self.control = JobClient(self.host, self.port)
+        with self.lock:
+            self._register()
+        self.slot_threads = [threading.Thread(target=self._run_slot, name=f"agent-slot-{i}")
+                             for i in range(self.slots)]
+        self.heartbeat_thread = threading.Thread(target=self._heartbeat, name="agent-heartbeat")
+        for thread in self.slot_threads + [self.heartbeat_thread]:
+            thread.start()
+
+    def stop(self):
+        """
+        Stop leasing jobs; jobs already running are finished first
+        """
+        self.stopped.set()
+
+    def join(self, timeout=None):
+        """
+        Wait for every thread to exit and release the executor
+
+        Heartbeats go on until the last running job has been reported, so
+        its lease cannot expire while the agent shuts down.
+
+        Args:
+            timeout: Optional timeout in seconds applied to each thread
+        """
+        for thread in self.slot_threads:
+            if thread.is_alive():
+                thread.join(timeout)
+        if not any(thread.is_alive() for thread in self.slot_threads):
+            self.finished.set()
+            self.heartbeat_thread.join(timeout)
+            self.control.close()
+            self.executor.shutdown()
+
+    def _register(self):
+        """
+        Register with the coordinator (caller holds the lock)
+        """
+        request = {"op": "register", "name": self.name, "cpus": self.cpus}
+        if self.memory != math.inf:
+            request["memory"] = self.memory
+        response = self.control.request(request)
+        self.agent_id = response["agent"]
+        self.heartbeat_interval = response["lease_timeout"] / 3
+        print(f"Registered with the coordinator as {self.agent_id}")
+
+    def _reregister(self, stale_id):
+        """
+        Register again after the coordinator dropped the agent, once per drop
+
+        Args:
+            stale_id (str): The agent id the coordinator no longer knows
+        """
+        with self.lock:
+            if self.agent_id == stale_id:
+                self._register()
+
+    def _run_slot(self):
+        """
+        Lease, run and report jobs until stopped
+        """
+        try:
+            client = JobClient(self.host, self.port)
+        except OSError as e:
+            print(f"Cannot connect to the coordinator: {e}")
+            return
+        try:
+            while not self.stopped.is_set():
+                agent_id = self.agent_id
+                try:
+                    spec = client.request({"op": "lease", "agent": agent_id})["job"]
+                except ServerError:
+                    if not self.stopped.is_set():
+                        self._reregister(agent_id)
+                    continue
+                if spec is None:
+                    continue
+                job = Job(spec["name"], spec["exec_time"], spec["priority"], spec["job_id"],
+                          spec["cpus"], spec["memory"])
+                request = {"agent": agent_id, "job_id": job.job_id}
+                if self.stopped.is_set():
+                    request["op"] = "release"
+                else:
+                    request["op"] = "complete"
+                    request["error"] = self._execute(job)
+                try:
+                    client.request(request)
+                except ServerError as e:
+                    print(f"Coordinator rejected {request['op']} of job {job.name}: {e}")
+        except OSError as e:
+            print(f"Lost connection to the coordinator: {e}")
+            self.stopped.set()
+        finally:
+            client.close()
+
+    def _execute(self, job):
+        """
+        Run a leased job
+
+        Returns:
+            None on success, or the error message
+        """
+        print(f"Executing job: {job.name} (expected time: {job.exec_time} seconds)")
+        start_time = time.time()
+        try:
+            self.executor.execute(job)
+        except Exception as e:
+            print(f"Error executing job {job.name}: {e}")
+            return str(e)
+        print(f"Job completed: {job.name} (actual time: {time.time() - start_time:.2f} seconds)")
+        return None
+
+    def _heartbeat(self):
+        """
+        Renew the agent's leases until every slot has finished
+        """
+        while not self.finished.wait(self.heartbeat_interval):
+            agent_id = self.agent_id
+            try:
+                with self.lock:
+                    self.control.request({"op": "heartbeat", "agent": agent_id})
+            except ServerError:
+                self._reregister(agent_id)
+            except OSError as e:
+                print(f"Lost connection to the coordinator: {e}")
+                self.stopped.set()
+                break
+
+
+def run_agent(host=DEFAULT_HOST, port=DEFAULT_PORT, **kwargs):
+    """
+    Run a WorkerAgent until interrupted or disconnected
+
+    Args:
+        host (str): Coordinator address
+        port (int): Coordinator TCP port
+        **kwargs: Further WorkerAgent arguments
+    """
+    agent = WorkerAgent(host, port, **kwargs)
+    agent.start()
+    try:
+        while not agent.stopped.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        print("\nShutting down agent...")
+    finally:
+        agent.stop()
+        agent.join()
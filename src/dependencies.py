@@ -0,0 +1,146 @@
+# src/dependencies.py
+import threading
+from src.job import JobStatus
+
+class DependencyTracker:
+    """
+    In-degree index over jobs that must wait for other jobs to complete
+
+    A job with unfinished dependencies is held here, with a count of the
+    dependencies still unfinished, and each unfinished job keeps a list of
+    the held jobs waiting on it. Completing a job therefore only touches
+    its own dependents, in O(out-degree); pending jobs are never rescanned,
+    however large the DAG. Dependencies always name jobs submitted earlier,
+    so cycles cannot form.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty tracker
+        """
+        self.lock = threading.Lock()
+        self.unfinished = set()  # ids of submitted jobs that have not completed
+        self.blocked = {}        # job id -> [job, unfinished dependency count, dependency ids]
+        self.dependents = {}     # job id -> ids of blocked jobs waiting on it
+
+    def validate(self, jobs, depends_on_lists):
+        """
+        Check that every dependency names a job submitted before its dependent
+
+        Args:
+            jobs: List of jobs about to be submitted, in submission order
+            depends_on_lists: List of dependency id lists, parallel to jobs
+
+        Raises:
+            ValueError: If a dependency names a later or unknown job
+        """
+        for job, depends_on in zip(jobs, depends_on_lists):
+            for dependency in depends_on:
+                # Ids are handed out in increasing order, so this also rules out cycles
+                if not 0 <= dependency < job.job_id:
+                    raise ValueError(f"Unknown job id: {dependency}")
+
+    def add(self, job, depends_on=()):
+        """
+        Track a newly submitted job
+
+        Args:
+            job: The submitted job
+            depends_on: Validated ids of jobs that must complete before it may run
+
+        Returns:
+            True if the job may run now, False if it is blocked
+        """
+        if not depends_on:
+            with self.lock:
+                self.unfinished.add(job.job_id)
+            return True
+        return bool(self.add_many([job], [depends_on]))
+
+    def add_many(self, jobs, depends_on_lists=None):
+        """
+        Track a batch of newly submitted jobs under one lock acquisition
+
+        Jobs may depend on jobs earlier in the same batch. Blocked jobs are
+        put in the Blocked state.
+
+        Args:
+            jobs: List of submitted jobs, in submission order
+            depends_on_lists: Optional list of validated dependency id lists,
+                parallel to jobs
+
+        Returns:
+            List of the jobs that may run now
+        """
+        if depends_on_lists is None:
+            return self._add_independent(jobs)
+        ready = []
+        with self.lock:
+            for job, depends_on in zip(jobs, depends_on_lists):
+                job_id = job.job_id
+                self.unfinished.add(job_id)
+                depends_on = sorted(set(depends_on))
+                pending = [dependency for dependency in depends_on if dependency in self.unfinished]
+                if not pending:
+                    ready.append(job)
+                    continue
+                job.state = JobStatus.BLOCKED
+                self.blocked[job_id] = [job, len(pending), depends_on]
+                for dependency in pending:
+                    self.dependents.setdefault(dependency, []).append(job_id)
+        return ready
+
+    def _add_independent(self, jobs):
+        """
+        Track jobs without dependencies
+
+        Returns:
+            The jobs, all of which may run now
+        """
+        with self.lock:
+            self.unfinished.update(job.job_id for job in jobs)
+        return jobs
+
+    def complete(self, job):
+        """
+        Mark a job completed and release the jobs that were only waiting on it
+
+        Args:
+            job: The completed job
+
+        Returns:
+            List of jobs that may run now, in the order they were submitted
+        """
+        ready = []
+        with self.lock:
+            self.unfinished.discard(job.job_id)
+            for dependent in self.dependents.pop(job.job_id, ()):
+                entry = self.blocked[dependent]
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self.blocked[dependent]
+                    entry[0].state = JobStatus.WAITING
+                    ready.append(entry[0])
+        ready.sort(key=lambda ready_job: ready_job.job_id)
+        return ready
+
+    def get_blocked_jobs(self):
+        """
+        Get the jobs waiting on dependencies
+
+        Returns:
+            List of (job, ids of unfinished dependencies) tuples, in submission order
+        """
+        with self.lock:
+            return [(job, [dependency for dependency in depends_on if dependency in self.unfinished])
+                    for job, _, depends_on in self.blocked.values()]
+
+    def get_blocked_count(self):
+        """
+        Get the number of jobs waiting on dependencies
+
+        Returns:
+            Number of blocked jobs
+        """
+        with self.lock:
+            return len(self.blocked)
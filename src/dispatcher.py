@@ -3,26 +3,72 @@ import threading
 import time
 import subprocess
 import os
-import sys
+import collections
+
+from src.executor import SubprocessExecutor
+from src.queueManager import PREEMPTIVE_POLICIES
+from src.profiler import PROFILER
+
+# How often a running job is checked for preemption, in seconds
+PREEMPT_CHECK_INTERVAL = 0.05
+
+# Seconds of expected work a worker leases from the queue at once; jobs
+# shorter than this are taken several at a time
+LEASE_TARGET = 0.01
+
+# Most jobs a worker leases at once
+MAX_LEASE_SIZE = 32
+
+# Weight of the latest job in the running average of job durations
+DURATION_SMOOTHING = 0.2
 
 class Dispatcher(threading.Thread):
-    def __init__(self, job_queue, scheduler):
+    def __init__(self, job_queue, scheduler, name=None, executor=None, resources=None,
+                 lease_target=LEASE_TARGET, num_peers=1):
         """
         Initialize the dispatcher thread
-        
+
+        When jobs turn out to be short, the dispatcher leases several at a
+        time: about lease_target seconds of work, going by the average
+        duration of the jobs it has run. Leased jobs are taken from the head
+        of the queue with one lock acquisition and run in order; with a
+        ResourcePool, each one runs in the capacity the one before it held.
+        Leased jobs that have not started go back to the queue if the policy
+        changes or the dispatcher stops, and nothing is leased under a
+        preemptive policy.
+
         Args:
             job_queue: The shared job queue
             scheduler: Reference to the scheduler for reporting job completion
+            name: Optional thread name, used to tell workers apart
+            executor: Backend that runs jobs (defaults to one subprocess per job)
+            resources: Optional ResourcePool; jobs then only start once their
+                CPU and memory requests fit
+            lease_target (float): Seconds of work to lease at once (0 takes
+                one job at a time)
+            num_peers (int): Number of dispatchers sharing the queue; a lease
+                takes at most this worker's share of the queued jobs
         """
-        super().__init__()
+        super().__init__(name=name)
         self.job_queue = job_queue
         self.scheduler = scheduler
+        self.executor = executor if executor is not None else SubprocessExecutor()
+        self.resources = resources
+        self.lease_target = lease_target
+        self.num_peers = num_peers
         self.running = True
         self.current_job = None
-        
-        # Get the project root directory
-        self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    
+        self.leased = collections.deque()  # jobs taken from the queue but not started
+        self.lease_version = None          # queue policy version when they were taken
+        # (queue policy version, policy) last read, so the policy is only
+        # read under the queue lock after it changes
+        self.policy = (None, None)
+        self.mean_duration = None          # running average of job durations
+        self.finished_at = None            # perf_counter when the last job finished, while profiling
+        # (seconds spent running jobs, start of the current run or None),
+        # replaced as a whole so readers never see half an update
+        self.busy = (0.0, None)
+
     def run(self):
         """
         Main loop for the dispatcher thread
@@ -30,65 +76,373 @@ class Dispatcher(threading.Thread):
         while self.running:
             # Get next job from queue
             try:
-                job = self.job_queue.get_job()
-                self.current_job = job
-                
+                profiling = PROFILER.enabled
+                if profiling:
+                    asked = time.perf_counter()
+                else:
+                    self.finished_at = None
+                job = self.next_job()
+                if profiling:
+                    PROFILER.record("dispatch.next_job", time.perf_counter() - asked)
+                if job is None:
+                    # Queue was closed and drained
+                    break
                 job.status = "Running"
-                job.start_time = time.time()
-   
-                print(f"Executing job: {job.name} (expected time: {job.exec_time} seconds)")
-                self.execute_job(job)
-        
+                resumed = job.start_time is not None
+                if not resumed:
+                    job.start_time = time.time()
+                self.current_job = job
+
+                if resumed:
+                    print(f"Resuming job: {job.name} (remaining time: {job.remaining_time:.2f} seconds)")
+                else:
+                    self.scheduler.register_job_start(job)
+                    print(f"Executing job: {job.name} (expected time: {job.exec_time} seconds)")
+
+                if profiling and self.finished_at is not None:
+                    # From the end of the last job to the start of this one
+                    PROFILER.record("dispatch.gap", time.perf_counter() - self.finished_at)
+
+                # Resumed jobs always continue their suspended process
+                preemptive = self.current_policy() in PREEMPTIVE_POLICIES
+                self.busy = (self.busy[0], time.time())
+                if self.executor.preemptible and (preemptive or resumed):
+                    finished = self.run_preemptible(job)
+                    self.end_busy()
+                    if not finished:
+                        if profiling:
+                            self.finished_at = time.perf_counter()
+                        self.current_job = None
+                        print(f"Job preempted: {job.name} (remaining time: {job.remaining_time:.2f} seconds)")
+                        continue
+                else:
+                    self.execute_job(job)
+                    self.end_busy()
+                    job.remaining_time = 0.0
+                if profiling:
+                    self.finished_at = time.perf_counter()
+                if self.leased and self.resources is not None:
+                    # The next leased job runs in the capacity this one held
+                    self.resources.transfer(job, self.leased[0])
+                else:
+                    self.release_resources(job)
+
                 job.status = "Completed"
                 job.end_time = time.time()
-                
+                if not resumed:
+                    duration = job.end_time - job.start_time
+                    if self.mean_duration is None:
+                        self.mean_duration = duration
+                    else:
+                        self.mean_duration += DURATION_SMOOTHING * (duration - self.mean_duration)
+
                 # Calculate actual execution time
                 actual_exec_time = job.end_time - job.start_time
                 print(f"Job completed: {job.name} (actual time: {actual_exec_time:.2f} seconds)")
-                
-                # Register job completion with scheduler
-                self.scheduler.register_job_completion(job)
-                
+
                 self.current_job = None
-                
+
+                # Register job completion with scheduler
+                if profiling:
+                    with PROFILER.span("dispatch.complete"):
+                        self.scheduler.register_job_completion(job)
+                else:
+                    self.scheduler.register_job_completion(job)
+
             except Exception as e:
                 print(f"Error in dispatcher: {e}")
-                time.sleep(1)  
-    
+                time.sleep(1)
+
+        self.return_leased()
+
+    def next_job(self):
+        """
+        Get the next job to run, leasing a batch from the queue when jobs are short
+
+        Returns:
+            The next job, or None if the queue is closed and drained
+        """
+        if self.leased:
+            if self.running and self.job_queue.policy_version == self.lease_version:
+                return self.leased.popleft()
+            self.return_leased()
+
+        version = self.job_queue.policy_version
+        if self.resources is None:
+            job = self.job_queue.get_job()
+        else:
+            job = self.job_queue.get_job(self.resources.place)
+        if job is None:
+            return None
+
+        size = self.lease_size()
+        if size > 1:
+            accept = None
+            if self.resources is not None:
+                # Later jobs must fit in the capacity placed for this one
+                accept = lambda queued: queued.cpus <= job.cpus and queued.memory <= job.memory
+            # The queue caps the lease at this worker's share of what is left
+            self.leased.extend(self.job_queue.get_jobs(size - 1, accept, self.num_peers))
+            self.lease_version = version
+        return job
+
+    def lease_size(self):
+        """
+        Get how many jobs to lease at once
+
+        Returns:
+            About lease_target seconds of jobs of the average duration seen,
+            capped at MAX_LEASE_SIZE; get_jobs further caps the lease at
+            this worker's share of the queue
+        """
+        if not self.lease_target or self.mean_duration is None:
+            return 1
+        size = min(MAX_LEASE_SIZE, int(self.lease_target / max(self.mean_duration, 1e-6)))
+        if size <= 1 or self.current_policy() in PREEMPTIVE_POLICIES:
+            # A leased job could not preempt anything
+            return 1
+        return size
+
+    def current_policy(self):
+        """
+        Get the queue's scheduling policy, reading it again only after it changed
+
+        Returns:
+            Current policy name
+        """
+        version = self.job_queue.policy_version
+        if self.policy[0] != version:
+            # Read the version first: a change after it bumps it again
+            self.policy = (version, self.job_queue.get_current_policy())
+        return self.policy[1]
+
+    def return_leased(self):
+        """
+        Put the leased jobs that have not started back in the queue
+        """
+        if not self.leased:
+            return
+        jobs = list(self.leased)
+        self.leased.clear()
+        for job in jobs:
+            if self.resources is not None:
+                # Only the first can hold capacity, handed over by transfer()
+                self.resources.release(job)
+            self.job_queue.requeue(job)
+        if self.resources is not None:
+            self.job_queue.wake()
+
+    def get_leased_jobs(self):
+        """
+        Get the jobs this worker has leased but not started
+
+        Returns:
+            List of leased jobs, in the order they will run
+        """
+        return list(self.leased)
+
     def execute_job(self, job):
         """
         Execute a job
-        
+
         Args:
             job: The job to execute
         """
         try:
-            # Get the path to the benchmark script
-            script_path = os.path.join(self.project_root, "benchmark", "batch_job.py")
-            
-            if not os.path.exists(script_path):
-                raise FileNotFoundError(f"Benchmark script not found at {script_path}")
-            
-            # Run the benchmark script with the job's execution time
-            subprocess.run([sys.executable, script_path, str(job.exec_time)], 
-                          check=True)
-            
+            self.executor.execute(job)
+
+        except subprocess.CalledProcessError as e:
+            print(f"Error executing job {job.name}: {e}")
+        except Exception as e:
+            print(f"Error executing job {job.name}: {e}")
+
+    def run_preemptible(self, job):
+        """
+        Run a job until it finishes or the queue's policy preempts it
+
+        The job's remaining_time is kept current while it runs. A preempted
+        job is suspended and put back in the queue to be resumed later.
+
+        Args:
+            job: The job to run or resume
+
+        Returns:
+            True if the job finished, False if it was preempted
+        """
+        remaining = job.remaining_time
+        slice_start = time.time()
+        try:
+            self.executor.start(job)
+            while not self.executor.wait(job, PREEMPT_CHECK_INTERVAL):
+                ran = time.time() - slice_start
+                job.remaining_time = max(0.0, remaining - ran)
+                if self.job_queue.should_preempt(job, ran):
+                    self.executor.suspend(job)
+                    job.status = "Waiting"
+                    # Release before requeueing; the job is placed again when it resumes
+                    self.release_resources(job)
+                    self.job_queue.requeue(job, ran)
+                    return False
+
         except subprocess.CalledProcessError as e:
             print(f"Error executing job {job.name}: {e}")
         except Exception as e:
             print(f"Error executing job {job.name}: {e}")
-    
+
+        job.remaining_time = 0.0
+        return True
+
+    def release_resources(self, job):
+        """
+        Return a job's CPUs and memory to the pool and wake waiting workers
+
+        Args:
+            job: The job that finished or was preempted
+        """
+        if self.resources is not None:
+            self.resources.release(job)
+            self.job_queue.wake()
+
     def stop(self):
         """
         Stop the dispatcher thread
         """
         self.running = False
-    
+
     def get_current_job(self):
         """
-        Get the currently running job
-        
+        Get the job currently running on this worker
+
         Returns:
             The currently running job or None
         """
-        return self.current_job
\ No newline at end of file
+        return self.current_job
+
+    def end_busy(self):
+        """
+        Add the run that just ended to the worker's busy time
+        """
+        busy_time, started = self.busy
+        if started is not None:
+            self.busy = (busy_time + time.time() - started, None)
+
+    def get_busy_time(self):
+        """
+        Get how long this worker has spent running jobs, without locking
+
+        Returns:
+            Seconds, including the job running now
+        """
+        busy_time, started = self.busy
+        if started is not None:
+            busy_time += time.time() - started
+        return busy_time
+
+
+class DispatcherPool:
+    def __init__(self, job_queue, scheduler, num_workers=None, executor=None, resources=None,
+                 lease_target=LEASE_TARGET):
+        """
+        Initialize a pool of dispatcher threads draining the shared queue
+
+        With a ResourcePool, workers run as many jobs at once as fit the
+        pool's CPUs and memory, so num_workers is only an upper bound on
+        concurrency; small jobs are packed next to large ones.
+
+        Args:
+            job_queue: The shared job queue
+            scheduler: Reference to the scheduler for reporting job completion
+            num_workers (int): Number of dispatcher threads (defaults to the CPU count)
+            executor: Backend shared by every worker (defaults to one subprocess per job)
+            resources: Optional ResourcePool shared by every worker
+            lease_target (float): Seconds of short jobs each worker leases at
+                once (0 takes one job at a time)
+        """
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        self.job_queue = job_queue
+        self.scheduler = scheduler
+        self.executor = executor if executor is not None else SubprocessExecutor()
+        self.resources = resources
+        self.workers = [
+            Dispatcher(job_queue, scheduler, name=f"dispatcher-{i}", executor=self.executor,
+                       resources=resources, lease_target=lease_target, num_peers=num_workers)
+            for i in range(num_workers)
+        ]
+
+    def start(self):
+        """
+        Start every dispatcher thread
+        """
+        for worker in self.workers:
+            worker.start()
+
+    def stop(self):
+        """
+        Stop every dispatcher thread and wake any worker blocked on the queue
+        """
+        for worker in self.workers:
+            worker.stop()
+        self.job_queue.close()
+
+    def join(self, timeout=None):
+        """
+        Wait for every dispatcher thread to exit
+
+        Args:
+            timeout: Optional timeout in seconds applied to each worker
+        """
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.join(timeout)
+
+        # Release the executor once no worker can submit to it any more
+        if not any(worker.is_alive() for worker in self.workers):
+            self.executor.shutdown()
+
+    def get_num_workers(self):
+        """
+        Get the number of dispatcher threads
+
+        Returns:
+            Number of workers in the pool
+        """
+        return len(self.workers)
+
+    def get_running_jobs(self):
+        """
+        Get the jobs currently running across all workers
+
+        Returns:
+            List of running jobs, in worker order
+        """
+        jobs = []
+        for worker in self.workers:
+            job = worker.get_current_job()
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    def get_leased_jobs(self):
+        """
+        Get the jobs workers have taken from the queue but not started
+
+        Returns:
+            List of leased jobs, in worker order and then run order
+        """
+        jobs = []
+        for worker in self.workers:
+            jobs.extend(worker.get_leased_jobs())
+        return jobs
+
+    def get_busy_time(self):
+        """
+        Get how long all workers together have spent running jobs
+
+        Returns:
+            Seconds, including the jobs running now
+        """
+        return sum(worker.get_busy_time() for worker in self.workers)
@@ -0,0 +1,250 @@
+# src/executor.py
+import os
+import sys
+import signal
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.profiler import PROFILER
+
+
+def _init_pool_worker():
+    """
+    Import the benchmark module once when a pool worker process starts
+    """
+    import benchmark.batch_job  # noqa: F401
+
+
+def _warm_pool_worker():
+    """
+    No-op task used to force a pool worker process to start
+    """
+    return os.getpid()
+
+
+def _run_pool_job(duration):
+    """
+    Run the benchmark work function inside a pool worker process
+
+    Args:
+        duration (float): Execution time in seconds
+
+    Returns:
+        Actual elapsed time in seconds
+    """
+    from benchmark.batch_job import run_job
+    return run_job(duration)
+
+
+class SubprocessExecutor:
+    """Run each job as a fresh benchmark/batch_job.py interpreter"""
+
+    name = "subprocess"
+    # Jobs can be suspended and resumed with SIGSTOP/SIGCONT
+    preemptible = hasattr(signal, "SIGSTOP")
+
+    def __init__(self, num_workers=None):
+        """
+        Initialize the executor and locate the benchmark script once
+
+        Args:
+            num_workers: Unused, accepted for a uniform constructor signature
+        """
+        self.script_path = os.path.join(PROJECT_ROOT, "benchmark", "batch_job.py")
+
+        if not os.path.exists(self.script_path):
+            raise FileNotFoundError(f"Benchmark script not found at {self.script_path}")
+
+        # Job -> process of every started job that has not finished yet
+        self.processes = {}
+
+    def execute(self, job):
+        """
+        Execute a job and wait for it to finish
+
+        Args:
+            job: The job to execute
+        """
+        command = [sys.executable, self.script_path, str(job.exec_time)]
+        if not PROFILER.enabled:
+            subprocess.run(command, check=True)
+            return
+
+        started = time.perf_counter()
+        process = subprocess.Popen(command)
+        spawned = time.perf_counter()
+        returncode = process.wait()
+        PROFILER.record("executor.spawn", spawned - started)
+        # Interpreter start-up and exit, beyond the job's own CPU time
+        PROFILER.record("executor.overhead", max(0.0, time.perf_counter() - started - job.exec_time))
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    def start(self, job):
+        """
+        Start a job's process, or resume it if the job was suspended
+
+        A new process is given the job's remaining time.
+
+        Args:
+            job: The job to start or resume
+        """
+        process = self.processes.get(job)
+        if process is None:
+            if PROFILER.enabled:
+                with PROFILER.span("executor.spawn"):
+                    self.processes[job] = subprocess.Popen(
+                        [sys.executable, self.script_path, str(job.remaining_time)])
+            else:
+                self.processes[job] = subprocess.Popen(
+                    [sys.executable, self.script_path, str(job.remaining_time)])
+        else:
+            os.kill(process.pid, signal.SIGCONT)
+
+    def wait(self, job, timeout):
+        """
+        Wait for a started job to finish
+
+        Args:
+            job: The running job
+            timeout (float): Longest time to wait in seconds
+
+        Returns:
+            True if the job finished, False if it is still running
+
+        Raises:
+            CalledProcessError: If the job exited with an error
+        """
+        process = self.processes[job]
+        try:
+            returncode = process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            return False
+
+        del self.processes[job]
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, process.args)
+        return True
+
+    def suspend(self, job):
+        """
+        Suspend a running job's process
+
+        Args:
+            job: The running job
+        """
+        os.kill(self.processes[job].pid, signal.SIGSTOP)
+
+    def shutdown(self):
+        """
+        Kill the processes of jobs that were preempted and never resumed
+        """
+        for process in list(self.processes.values()):
+            process.kill()
+            process.wait()
+        self.processes.clear()
+
+
+class ProcessPoolExecutorBackend:
+    """Run jobs on a warm pool of worker processes that import the benchmark once"""
+
+    name = "pool"
+    preemptible = False
+
+    def __init__(self, num_workers=None):
+        """
+        Initialize the executor and pre-start every worker process
+
+        Args:
+            num_workers (int): Number of worker processes (defaults to the CPU count)
+        """
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.num_workers,
+                                        initializer=_init_pool_worker)
+
+        # Submit one no-op per worker so no job pays for process start-up
+        warmups = [self.pool.submit(_warm_pool_worker) for _ in range(self.num_workers)]
+        for future in warmups:
+            future.result()
+
+    def execute(self, job):
+        """
+        Execute a job and wait for it to finish
+
+        Args:
+            job: The job to execute
+        """
+        if not PROFILER.enabled:
+            self.pool.submit(_run_pool_job, job.exec_time).result()
+            return
+
+        started = time.perf_counter()
+        self.pool.submit(_run_pool_job, job.exec_time).result()
+        # Hand-off to and from the worker process, beyond the job's own CPU time
+        PROFILER.record("executor.overhead", max(0.0, time.perf_counter() - started - job.exec_time))
+
+    def shutdown(self):
+        """
+        Stop the worker processes
+        """
+        self.pool.shutdown(wait=True)
+
+
+class InlineExecutor:
+    """Run jobs directly in the calling dispatcher thread"""
+
+    name = "inline"
+    preemptible = False
+
+    def __init__(self, num_workers=None):
+        """
+        Initialize the executor
+
+        Args:
+            num_workers: Unused, accepted for a uniform constructor signature
+        """
+        from benchmark.batch_job import run_job
+        self.run_job = run_job
+
+    def execute(self, job):
+        """
+        Execute a job and wait for it to finish
+
+        Args:
+            job: The job to execute
+        """
+        self.run_job(job.exec_time)
+
+    def shutdown(self):
+        """
+        Release executor resources
+        """
+
+
+EXECUTORS = {
+    SubprocessExecutor.name: SubprocessExecutor,
+    ProcessPoolExecutorBackend.name: ProcessPoolExecutorBackend,
+    InlineExecutor.name: InlineExecutor,
+}
+
+
+def create_executor(name="subprocess", num_workers=None):
+    """
+    Create a job executor backend by name
+
+    Args:
+        name (str): One of the keys of EXECUTORS
+        num_workers (int): Number of concurrent jobs the backend should support
+
+    Returns:
+        The executor instance
+    """
+    if name not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {name}")
+    return EXECUTORS[name](num_workers)
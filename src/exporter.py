@@ -0,0 +1,181 @@
+# src/exporter.py
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src.queueManager import POLICIES
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9770
+
+# Upper bounds of the exported response-time histogram buckets, in seconds
+RESPONSE_TIME_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class MetricsExporter:
+    def __init__(self, scheduler, job_queue, dispatcher=None):
+        """
+        Initialize a Prometheus text-format exporter
+
+        A scrape reads counters that the scheduler and the dispatchers keep
+        without locking: the scheduler's per-thread metrics, the job each
+        worker is running and each worker's busy time. The only queue
+        accesses are get_queue_size() and get_current_policy(), which hold
+        the queue mutex for O(1) work, so scraping never delays submitters
+        or workers.
+
+        Args:
+            scheduler: The scheduler whose counters and histograms are exported
+            job_queue: The shared job queue
+            dispatcher: Optional DispatcherPool (or anything with
+                get_running_jobs); utilization is exported when it also
+                has get_num_workers and get_busy_time
+        """
+        self.scheduler = scheduler
+        self.job_queue = job_queue
+        self.dispatcher = dispatcher
+        self.started = time.time()
+        self.server = None
+        self.thread = None
+
+    def start(self, host=DEFAULT_METRICS_HOST, port=DEFAULT_METRICS_PORT):
+        """
+        Serve /metrics over HTTP from a background thread
+
+        Args:
+            host (str): Address to listen on (defaults to localhost only)
+            port (int): TCP port, 0 for any free port
+
+        Returns:
+            The (host, port) the exporter is listening on
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                try:
+                    body = exporter.render().encode()
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep scrapes off the interactive prompt
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-exporter",
+                                       daemon=True)
+        self.thread.start()
+        return self.server.server_address[:2]
+
+    def stop(self):
+        """
+        Stop serving and close the listening socket
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+            self.thread = None
+
+    def render(self):
+        """
+        Format the current metrics in the Prometheus text exposition format
+
+        Returns:
+            The metrics page as a string
+        """
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        # The queue serves every job in the current policy's order
+        queue_size = self.job_queue.get_queue_size()
+        current_policy = self.job_queue.get_current_policy()
+        metric("csubatch_queue_length", "gauge", "Jobs waiting in the queue, by the policy serving them",
+               [({"policy": policy}, queue_size if policy == current_policy else 0)
+                for policy in POLICIES])
+
+        if self.dispatcher is not None:
+            metric("csubatch_running_jobs", "gauge", "Jobs running now",
+                   [(None, len(self.dispatcher.get_running_jobs()))])
+
+        metrics = self.scheduler.metrics
+        metric("csubatch_jobs_submitted_total", "counter", "Jobs submitted",
+               [(None, metrics.counter("total_jobs"))])
+        metric("csubatch_jobs_completed_total", "counter", "Jobs completed",
+               [(None, metrics.counter("completed_jobs"))])
+
+        lines.append("# HELP csubatch_response_time_seconds Time from arrival to completion, "
+                     "by the policy in force when the job completed")
+        lines.append("# TYPE csubatch_response_time_seconds histogram")
+        for policy in POLICIES:
+            histogram = metrics.histogram("response_time", policy)
+            counts = histogram.cumulative_counts(RESPONSE_TIME_BUCKETS)
+            for bound, count in zip(RESPONSE_TIME_BUCKETS, counts):
+                lines.append(f"csubatch_response_time_seconds_bucket"
+                             f"{_format_labels({'policy': policy, 'le': bound})} {count}")
+            lines.append(f"csubatch_response_time_seconds_bucket"
+                         f"{_format_labels({'policy': policy, 'le': '+Inf'})} {histogram.count}")
+            lines.append(f"csubatch_response_time_seconds_sum{_format_labels({'policy': policy})} "
+                         f"{_format_value(histogram.total)}")
+            lines.append(f"csubatch_response_time_seconds_count{_format_labels({'policy': policy})} "
+                         f"{histogram.count}")
+
+        if hasattr(self.dispatcher, "get_busy_time") and hasattr(self.dispatcher, "get_num_workers"):
+            num_workers = self.dispatcher.get_num_workers()
+            busy_time = self.dispatcher.get_busy_time()
+            elapsed = time.time() - (self.scheduler.start_time or self.started)
+            capacity = elapsed * num_workers
+            metric("csubatch_dispatcher_workers", "gauge", "Dispatcher workers",
+                   [(None, num_workers)])
+            metric("csubatch_dispatcher_busy_seconds_total", "counter",
+                   "Seconds dispatcher workers have spent running jobs", [(None, busy_time)])
+            metric("csubatch_dispatcher_utilization", "gauge",
+                   "Fraction of worker time spent running jobs since startup",
+                   [(None, min(1.0, busy_time / capacity) if capacity > 0 else 0.0)])
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    """
+    Format a label set, e.g. {policy="SJF"}
+    """
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_format_label_value(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _format_label_value(value):
+    """
+    Escape a label value as the text format requires
+    """
+    if isinstance(value, float):
+        return _format_value(value)
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    """
+    Format a sample value
+    """
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
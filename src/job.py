@@ -1,34 +1,121 @@
+import math
 import time
+from enum import IntEnum
+
+class JobStatus(IntEnum):
+    """Job lifecycle states, stored as small integers"""
+
+    WAITING = 0
+    RUNNING = 1
+    COMPLETED = 2
+    BLOCKED = 3  # waiting for the jobs it depends on to complete
+
+    @property
+    def label(self):
+        """
+        Get the display name used by Job.status
+        """
+        return STATUS_LABELS[self]
+
+    @classmethod
+    def parse(cls, value):
+        """
+        Convert a status label or integer to a JobStatus
+
+        Args:
+            value: A JobStatus, its integer value, or a label such as "Running"
+
+        Returns:
+            The matching JobStatus
+        """
+        if isinstance(value, str):
+            try:
+                return cls(STATUS_LABELS.index(value))
+            except ValueError:
+                raise ValueError(f"Unknown job status: {value}")
+        return cls(value)
+
+STATUS_LABELS = ("Waiting", "Running", "Completed", "Blocked")
+
+
+def check_job_request(exec_time, cpus=1, memory=0):
+    """
+    Check the execution time and resources requested for a new job
+
+    A NaN or infinite time would break the queue's heap ordering and its
+    work-ahead sums for every later job, so it is rejected up front.
+
+    Args:
+        exec_time (float): Execution time in seconds
+        cpus (int): Number of CPU cores the job needs
+        memory (float): Memory the job needs, in MB
+
+    Raises:
+        ValueError: If a value is not finite, exec_time or memory is
+            negative, or cpus is below 1
+    """
+    if not (math.isfinite(exec_time) and math.isfinite(cpus) and math.isfinite(memory)):
+        raise ValueError("exec_time, cpus and memory must be finite numbers")
+    if exec_time < 0:
+        raise ValueError("exec_time must not be negative")
+    if cpus < 1:
+        raise ValueError("A job needs at least one CPU")
+    if memory < 0:
+        raise ValueError("memory must not be negative")
+
 
 class Job:
-    def __init__(self, name, exec_time, priority=0):
+    __slots__ = ("job_id", "name", "exec_time", "remaining_time", "priority", "cpus",
+                 "memory", "level", "arrival_time", "start_time", "end_time", "state")
+
+    def __init__(self, name, exec_time, priority=0, job_id=None, cpus=1, memory=0):
         """
             Initialize a new job
             name: Name of the job
             exec_time : Execution time in seconds
             priority: Priority level (higher number = higher priority)
+            job_id: Identifier assigned by the scheduler
+            cpus: Number of CPU cores the job needs
+            memory: Memory the job needs, in MB
         """
+        self.job_id = job_id
         self.name = name
         self.exec_time = exec_time
+        # Execution time still to run; drops below exec_time when preempted
+        self.remaining_time = exec_time
         self.priority = priority
-        self.arrival_time = None  
-        self.start_time = None   
-        self.end_time = None      
-        self.status = "Waiting"   
-    
+        self.cpus = cpus
+        self.memory = memory
+        self.level = 0  # MLFQ level, raised each time the job uses a full time slice
+        self.arrival_time = None
+        self.start_time = None
+        self.end_time = None
+        self.state = JobStatus.WAITING
+
+    @property
+    def status(self):
+        """
+        Get the job status as a display string ("Waiting", "Running", "Completed")
+        """
+        return STATUS_LABELS[self.state]
+
+    @status.setter
+    def status(self, value):
+        self.state = JobStatus.parse(value)
+
     def get_response_time(self):
         """
         Get the response time of the job
-        
+
         """
         if self.end_time is not None and self.arrival_time is not None:
             return self.end_time - self.arrival_time
         return None
-    
+
     def get_waiting_time(self):
         """
         Get the waiting time of the job
         """
         if self.start_time is not None and self.arrival_time is not None:
             return self.start_time - self.arrival_time
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,417 @@
+# src/journal.py
+import os
+import json
+import threading
+import time
+
+from src.metrics import Histogram
+
+SNAPSHOT_FILE = "snapshot.json"
+LOG_PREFIX = "journal."
+LOG_SUFFIX = ".log"
+
+class JournalState:
+    """The job and statistics state rebuilt by folding journal records"""
+
+    def __init__(self):
+        """
+        Initialize an empty state
+        """
+        self.policy = "FCFS"
+        # job_id -> (name, exec_time, priority, arrival_time, start_time, cpus,
+        #            memory, depends_on)
+        self.pending = {}
+        self.last_job_id = 0  # highest job id ever submitted
+        self.counters = {}
+        self.histograms = {}  # (name, policy) -> Histogram
+
+    def apply(self, record):
+        """
+        Fold one journal record into the state
+
+        Args:
+            record: Decoded record list, tagged by its first element
+        """
+        tag = record[0]
+        if tag == "S":
+            _, job_id, name, exec_time, priority, arrival_time = record[:6]
+            # Older records stop before the resource requests or dependencies
+            cpus, memory, depends_on = (record[6:] + [1, 0, []][len(record) - 6:])[:3]
+            if job_id not in self.pending:
+                self.pending[job_id] = (name, exec_time, priority, arrival_time, None, cpus, memory,
+                                        depends_on)
+                self.last_job_id = max(self.last_job_id, job_id)
+                self._increment("total_jobs")
+        elif tag == "R":
+            _, job_id, start_time = record
+            spec = self.pending.get(job_id)
+            if spec is not None:
+                self.pending[job_id] = spec[:4] + (start_time,) + spec[5:]
+        elif tag == "C":
+            _, job_id, end_time, policy = record
+            spec = self.pending.pop(job_id, None)
+            self._increment("completed_jobs")
+            if spec is not None:
+                arrival_time, start_time = spec[3], spec[4]
+                self._observe("response_time", end_time - arrival_time, policy)
+                if start_time is not None:
+                    self._observe("waiting_time", start_time - arrival_time, policy)
+                    self._observe("service_time", end_time - start_time, policy)
+        elif tag == "P":
+            self.policy = record[1]
+
+    def copy(self):
+        """
+        Copy the state for writing a snapshot
+
+        Returns:
+            A JournalState that later records will not modify
+        """
+        state = JournalState()
+        state.policy = self.policy
+        state.pending = dict(self.pending)
+        state.last_job_id = self.last_job_id
+        state.counters = dict(self.counters)
+        for key, histogram in self.histograms.items():
+            state.histograms[key] = Histogram()
+            state.histograms[key].merge(histogram)
+        return state
+
+    def to_dict(self):
+        """
+        Serialize the state
+
+        Returns:
+            JSON-compatible dictionary
+        """
+        return {
+            "policy": self.policy,
+            "pending": [[job_id] + list(spec) for job_id, spec in self.pending.items()],
+            "last_job_id": self.last_job_id,
+            "counters": self.counters,
+            "histograms": [[name, policy, histogram.to_dict()]
+                           for (name, policy), histogram in self.histograms.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a state serialized with to_dict
+
+        Args:
+            data: Dictionary returned by to_dict
+
+        Returns:
+            The rebuilt JournalState
+        """
+        state = cls()
+        state.policy = data["policy"]
+        # Older snapshots have no resource requests or dependencies; pad them
+        state.pending = {entry[0]: tuple(entry[1:]) + (1, 0, [])[len(entry) - 6:]
+                         for entry in data["pending"]}
+        state.last_job_id = data.get("last_job_id", max(state.pending, default=0))
+        state.counters = dict(data["counters"])
+        state.histograms = {(name, policy): Histogram.from_dict(histogram)
+                            for name, policy, histogram in data["histograms"]}
+        return state
+
+    def _increment(self, name):
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def _observe(self, name, value, policy):
+        key = (name, policy)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].record(value)
+
+
+class Journal:
+    def __init__(self, directory, flush_interval=0.01, compact_every=1000000):
+        """
+        Initialize an append-only write-ahead job journal
+
+        Submit, start, complete and policy-change records are appended to a
+        line-delimited log as compact JSON arrays. A background thread writes
+        and fsyncs everything appended during each flush interval in one go
+        (group commit), so recording a job only costs an in-memory append.
+        Every compact_every records the folded state is written to a snapshot
+        and the log is started afresh, so replay time stays bounded.
+
+        Args:
+            directory (str): Directory holding the snapshot and log files
+            flush_interval (float): Longest time a record waits before being fsynced
+            compact_every (int): Number of records between snapshots
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+
+        # lock guards the buffer and the folded state and is held only for
+        # in-memory work; write_lock serializes file writes and rotation
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.flushed = threading.Condition(self.lock)
+        self.buffer = []
+        self.appended = 0     # records appended since open
+        self.synced = 0       # records fsynced since open
+        self.since_compact = 0
+        self.state = JournalState()
+        self.generation = 0
+        self.log_file = None
+        self.flusher = None
+        self.closing = False
+
+    def open(self):
+        """
+        Recover the state from disk and start journaling
+
+        Returns:
+            The recovered JournalState; callers must not modify it
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.state, self.generation = self._load()
+
+        # Start a fresh log generation with the recovered state as its snapshot
+        self._rotate()
+        self._write_snapshot(self.state.copy(), self.generation)
+
+        self.closing = False
+        self.flusher = threading.Thread(target=self._flush_loop, name="journal-flusher", daemon=True)
+        self.flusher.start()
+        return self.state
+
+    def record_submit(self, job, depends_on=()):
+        """
+        Append a submit record
+
+        Args:
+            job: The submitted job
+            depends_on: Ids of the jobs it waits for
+        """
+        self._append(["S", job.job_id, job.name, job.exec_time, job.priority, job.arrival_time,
+                      job.cpus, job.memory, list(depends_on)])
+
+    def record_submits(self, jobs, depends_on_lists=None):
+        """
+        Append submit records for a batch of jobs under one lock acquisition
+
+        Args:
+            jobs: List of submitted jobs
+            depends_on_lists: Optional list of dependency id lists, parallel to jobs
+        """
+        if depends_on_lists is None:
+            depends_on_lists = [[]] * len(jobs)
+        self._append_many([["S", job.job_id, job.name, job.exec_time, job.priority, job.arrival_time,
+                            job.cpus, job.memory, depends_on]
+                           for job, depends_on in zip(jobs, depends_on_lists)])
+
+    def record_start(self, job):
+        """
+        Append a start record
+
+        Args:
+            job: The job that started running
+        """
+        self._append(["R", job.job_id, job.start_time])
+
+    def record_complete(self, job, policy):
+        """
+        Append a completion record
+
+        Args:
+            job: The completed job
+            policy (str): Scheduling policy the job completed under
+        """
+        self._append(["C", job.job_id, job.end_time, policy])
+
+    def record_policy(self, policy):
+        """
+        Append a policy-change record
+
+        Args:
+            policy (str): The new scheduling policy
+        """
+        self._append(["P", policy])
+
+    def flush(self, timeout=None):
+        """
+        Block until every record appended so far is on disk
+
+        Args:
+            timeout (float): Optional timeout in seconds
+
+        Returns:
+            True if the records were synced, False on timeout
+        """
+        with self.flushed:
+            target = self.appended
+            self.flushed.notify_all()
+            return self.flushed.wait_for(lambda: self.synced >= target, timeout)
+
+    def compact(self):
+        """
+        Write a snapshot of the current state and start a new log generation
+        """
+        with self.write_lock:
+            with self.lock:
+                records = self._take_buffer()
+                state = self.state.copy()
+                self.since_compact = 0
+            # Everything up to the copied state goes to the old generation,
+            # everything appended after it to the new one
+            self._write_records(records)
+            self._rotate()
+            self._write_snapshot(state, self.generation)
+
+    def close(self):
+        """
+        Flush outstanding records and stop the journal
+        """
+        if self.flusher is None:
+            return
+        with self.lock:
+            self.closing = True
+            self.flushed.notify_all()
+        self.flusher.join()
+        self.flusher = None
+        with self.write_lock:
+            with self.lock:
+                records = self._take_buffer()
+            self._write_records(records)
+            self.log_file.close()
+            self.log_file = None
+
+    def _append(self, record):
+        with self.lock:
+            self.buffer.append(record)
+            self.state.apply(record)
+            self.appended += 1
+            self.since_compact += 1
+
+    def _append_many(self, records):
+        with self.lock:
+            self.buffer.extend(records)
+            apply = self.state.apply
+            for record in records:
+                apply(record)
+            self.appended += len(records)
+            self.since_compact += len(records)
+
+    def _flush_loop(self):
+        """
+        Group-commit loop run by the flusher thread
+        """
+        while True:
+            with self.lock:
+                if not self.buffer and not self.closing:
+                    self.flushed.wait(self.flush_interval)
+                if self.closing:
+                    return
+                compact = self.since_compact >= self.compact_every
+
+            if compact:
+                self.compact()
+            else:
+                with self.write_lock:
+                    with self.lock:
+                        records = self._take_buffer()
+                    self._write_records(records)
+
+    def _take_buffer(self):
+        """
+        Detach the buffered records (caller holds the lock)
+        """
+        records = self.buffer
+        self.buffer = []
+        return records
+
+    def _write_records(self, records):
+        """
+        Encode, write and fsync records (caller holds write_lock)
+
+        Encoding happens here rather than in _append, so submitting a job
+        only pays for a list append and the in-memory fold.
+        """
+        if not records:
+            return
+        dumps = json.JSONEncoder(separators=(',', ':')).encode
+        self.log_file.write("\n".join(map(dumps, records)) + "\n")
+        self.log_file.flush()
+        os.fsync(self.log_file.fileno())
+        with self.lock:
+            self.synced += len(records)
+            self.flushed.notify_all()
+
+    def _rotate(self):
+        """
+        Switch appends to a new log generation (caller holds write_lock or is opening)
+        """
+        if self.log_file is not None:
+            self.log_file.close()
+        self.generation += 1
+        self.log_file = open(self._log_path(self.generation), "a")
+
+    def _write_snapshot(self, state, generation):
+        """
+        Atomically write a snapshot and delete the logs it covers
+
+        Args:
+            state: The JournalState to write
+            generation (int): First log generation not included in the snapshot
+        """
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"generation": generation, "state": state.to_dict(),
+                       "timestamp": time.time()}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+        for old_generation in self._log_generations():
+            if old_generation < generation:
+                os.remove(self._log_path(old_generation))
+
+    def _load(self):
+        """
+        Load the latest snapshot and replay the logs written after it
+
+        Returns:
+            Tuple (JournalState, last log generation seen)
+        """
+        state = JournalState()
+        first_generation = 0
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(path):
+            with open(path) as f:
+                snapshot = json.load(f)
+            state = JournalState.from_dict(snapshot["state"])
+            first_generation = snapshot["generation"]
+
+        last_generation = first_generation
+        for generation in self._log_generations():
+            if generation < first_generation:
+                continue
+            last_generation = max(last_generation, generation)
+            with open(self._log_path(generation)) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final write from a crash; nothing after it was synced
+                        break
+                    state.apply(record)
+        return state, last_generation
+
+    def _log_generations(self):
+        """
+        Get the generations of the log files on disk, oldest first
+        """
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith(LOG_PREFIX) and name.endswith(LOG_SUFFIX):
+                generations.append(int(name[len(LOG_PREFIX):-len(LOG_SUFFIX)]))
+        return sorted(generations)
+
+    def _log_path(self, generation):
+        return os.path.join(self.directory, f"{LOG_PREFIX}{generation:08d}{LOG_SUFFIX}")
@@ -1,52 +1,167 @@
 
-import time
 import threading
 import os
 import sys
+import argparse
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from src.queueManager import JobQueue
+from src.queueManager import JobQueue, DEFAULT_QUANTUM
+from src.shardedQueue import ShardedJobQueue
 from src.scheduler import Scheduler
-from src.dispatcher import Dispatcher
+from src.dispatcher import DispatcherPool
+from src.executor import EXECUTORS, create_executor
+from src.resources import ResourcePool, Node, host_memory, BACKFILL_MODES
+from src.journal import Journal
+from src.server import DEFAULT_HOST, DEFAULT_PORT, serve, run_server
+from src.cluster import Coordinator, DEFAULT_LEASE_TIMEOUT, run_agent
+from src.profiler import PROFILER
+from src.exporter import MetricsExporter
 from src.ui import CSUbatchUI
 
 def main():
     """
     Main entry point for the CSUbatch system
     """
+    parser = argparse.ArgumentParser(description='CSUbatch batch scheduling system')
+    parser.add_argument('command', nargs='?', choices=['serve', 'coordinator', 'agent'],
+                        help='"serve" accepts jobs over the network instead of the interactive prompt; '
+                             '"coordinator" also hands them to remote "agent" processes, which connect '
+                             'to --host and --port')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of dispatcher workers (default: --cpus, or the number of CPUs)')
+    parser.add_argument('--executor', choices=sorted(EXECUTORS), default='subprocess',
+                        help='How jobs are run (default: one subprocess per job)')
+    parser.add_argument('--quantum', type=float, default=DEFAULT_QUANTUM,
+                        help=f'Time slice in seconds under the RR policy (default: {DEFAULT_QUANTUM})')
+    parser.add_argument('--aging-rate', type=float, default=0.0,
+                        help='Priority gained per second of waiting, to prevent starvation (default: 0, off)')
+    parser.add_argument('--cpus', type=int, default=None,
+                        help='CPU cores shared by running jobs (default: one per worker)')
+    parser.add_argument('--memory', type=float, default=None,
+                        help='Memory in MB shared by running jobs (default: physical memory)')
+    parser.add_argument('--backfill', choices=BACKFILL_MODES, default='easy',
+                        help='Whether jobs may start ahead of a job that does not fit yet (default: easy)')
+    parser.add_argument('--sharded', action='store_true',
+                        help='Give each dispatcher worker its own queue shard, with work stealing')
+    parser.add_argument('--journal', metavar='DIR', default=None,
+                        help='Journal jobs to DIR and recover them on restart')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f'Address the server listens on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'TCP port the server listens on (default: {DEFAULT_PORT})')
+    parser.add_argument('--unix', metavar='PATH', default=None,
+                        help='Listen on a Unix socket at PATH instead of TCP')
+    parser.add_argument('--lease-timeout', type=float, default=DEFAULT_LEASE_TIMEOUT,
+                        help='Seconds without a heartbeat before an agent\'s jobs are queued again '
+                             f'(default: {DEFAULT_LEASE_TIMEOUT})')
+    parser.add_argument('--name', default=None,
+                        help='Name an agent registers under (default: the hostname)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record hot-path timings from the start (see the "profile" command)')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help='Serve Prometheus metrics at http://127.0.0.1:PORT/metrics (default: off)')
+    args = parser.parse_args()
+    if args.profile:
+        PROFILER.enable()
+    
+    if args.command == 'agent':
+        executor = create_executor(args.executor, args.workers or args.cpus)
+        run_agent(args.host, args.port, name=args.name, cpus=args.cpus, memory=args.memory,
+                  slots=args.workers, executor=executor)
+        return
    
-    job_queue = JobQueue()
+    num_workers = args.workers or args.cpus or os.cpu_count() or 1
+    if args.sharded:
+        job_queue = ShardedJobQueue(num_workers, quantum=args.quantum, aging_rate=args.aging_rate)
+    else:
+        job_queue = JobQueue(quantum=args.quantum, aging_rate=args.aging_rate)
     
  
     scheduler = Scheduler(job_queue)
-    dispatcher = Dispatcher(job_queue, scheduler)
+    journal = None
+    if args.journal:
+        journal = Journal(args.journal)
+        recovered = scheduler.recover(journal)
+        if recovered:
+            print(f"Recovered {recovered} jobs from {args.journal}")
+    if args.command == 'coordinator':
+        # Agents bring the nodes and run the jobs
+        coordinator = Coordinator(scheduler, job_queue, ResourcePool([], args.backfill),
+                                  args.lease_timeout)
+        exporter = start_exporter(args.metrics_port, scheduler, job_queue, coordinator)
+        scheduler.start()
+        try:
+            run_server(coordinator, args.host, args.port, args.unix)
+        except KeyboardInterrupt:
+            print("\nShutting down CSUbatch...")
+        finally:
+            if exporter is not None:
+                exporter.stop()
+            scheduler.stop()
+            scheduler.join()
+            if journal is not None:
+                journal.close()
+        return
+    
+    executor = create_executor(args.executor, num_workers)
+    # With the default one CPU per worker, single-CPU jobs run exactly as
+    # before; larger requests take several workers' worth of capacity
+    resources = ResourcePool([Node("localhost", args.cpus or num_workers,
+                                   args.memory or host_memory())], args.backfill)
+    dispatcher = DispatcherPool(job_queue, scheduler, num_workers, executor, resources)
     
 
     ui = CSUbatchUI(scheduler, dispatcher, job_queue)
     
 
-    scheduler.start_time = time.time()
+    exporter = start_exporter(args.metrics_port, scheduler, job_queue, dispatcher)
     
 
     scheduler.start()
     dispatcher.start()
     
     try:
-
-        ui.cmdloop()
+        if args.command == 'serve':
+            serve(scheduler, job_queue, dispatcher, args.host, args.port, args.unix)
+        else:
+            ui.cmdloop()
     except KeyboardInterrupt:
   
         print("\nShutting down CSUbatch...")
     finally:
  
+        if exporter is not None:
+            exporter.stop()
         scheduler.stop()
         dispatcher.stop()
         
       
         scheduler.join()
         dispatcher.join()
+        if journal is not None:
+            journal.close()
+
+def start_exporter(port, scheduler, job_queue, dispatcher):
+    """
+    Start the metrics exporter if a port was given
+
+    Args:
+        port (int): Port from --metrics-port, or None
+        scheduler: The scheduler
+        job_queue: The shared job queue
+        dispatcher: The dispatcher pool or coordinator
+
+    Returns:
+        The running MetricsExporter, or None
+    """
+    if port is None:
+        return None
+    exporter = MetricsExporter(scheduler, job_queue, dispatcher)
+    host, port = exporter.start(port=port)
+    print(f"Serving metrics at http://{host}:{port}/metrics")
+    return exporter
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
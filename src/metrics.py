@@ -0,0 +1,328 @@
+# src/metrics.py
+import math
+import threading
+
+class Histogram:
+    """
+    Streaming histogram with logarithmic buckets
+
+    Values between MIN_VALUE and MAX_VALUE are counted in buckets that grow
+    by GROWTH, so any percentile is reported within about 2% relative error
+    using a fixed amount of memory, however many values are recorded.
+    """
+
+    MIN_VALUE = 1e-6
+    MAX_VALUE = 1e5
+    GROWTH = 1.04
+    NUM_BUCKETS = int(math.ceil(math.log(MAX_VALUE / MIN_VALUE, GROWTH))) + 1
+
+    def __init__(self):
+        """
+        Initialize an empty histogram
+        """
+        self.counts = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value):
+        """
+        Record a single value
+
+        Args:
+            value (float): The value to record, in seconds
+        """
+        self.counts[self.bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """
+        Add the contents of another histogram to this one
+
+        Args:
+            other: The histogram to merge in
+        """
+        counts = list(other.counts)
+        for i, count in enumerate(counts):
+            if count:
+                self.counts[i] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """
+        Get an approximate percentile
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            The approximate value at that percentile, or 0 if empty
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # Clamp the bucket midpoint to the exact observed range
+                return min(max(self.bucket_value(i), self.min), self.max)
+        return self.max
+
+    def mean(self):
+        """
+        Get the mean of all recorded values
+
+        Returns:
+            The mean, or 0 if empty
+        """
+        return self.total / self.count if self.count else 0
+
+    def summary(self):
+        """
+        Summarize the histogram
+
+        Returns:
+            Dictionary with count, mean, p50, p95, p99 and max
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else 0,
+        }
+
+    def cumulative_counts(self, bounds):
+        """
+        Count the values at or below each of a set of bounds
+
+        A bucket that straddles a bound is counted below it, so a count may
+        include values up to one bucket width (about 4%) above its bound.
+
+        Args:
+            bounds: Ascending upper bounds, e.g. Prometheus "le" buckets
+
+        Returns:
+            List of counts, one per bound
+        """
+        counts = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            if bound >= self.max:
+                counts.append(self.count)
+                continue
+            last = self.bucket_index(bound)
+            while index <= last:
+                seen += self.counts[index]
+                index += 1
+            counts.append(seen)
+        return counts
+
+    def to_dict(self):
+        """
+        Serialize the histogram
+
+        Returns:
+            JSON-compatible dictionary with only the non-empty buckets
+        """
+        return {
+            "buckets": {str(i): count for i, count in enumerate(self.counts) if count},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a histogram serialized with to_dict
+
+        Args:
+            data: Dictionary returned by to_dict
+
+        Returns:
+            The rebuilt Histogram
+        """
+        histogram = cls()
+        for i, count in data["buckets"].items():
+            histogram.counts[int(i)] = count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        if histogram.count:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+    @classmethod
+    def bucket_index(cls, value):
+        """
+        Get the bucket a value falls into
+
+        Args:
+            value (float): The value
+
+        Returns:
+            Bucket index
+        """
+        if value <= cls.MIN_VALUE:
+            return 0
+        index = int(math.log(value / cls.MIN_VALUE, cls.GROWTH)) + 1
+        return min(index, cls.NUM_BUCKETS - 1)
+
+    @classmethod
+    def bucket_value(cls, index):
+        """
+        Get the representative value of a bucket
+
+        Args:
+            index (int): Bucket index
+
+        Returns:
+            Geometric midpoint of the bucket
+        """
+        if index == 0:
+            return cls.MIN_VALUE
+        return cls.MIN_VALUE * cls.GROWTH ** (index - 0.5)
+
+
+class _Shard:
+    """Counters and histograms written by a single thread"""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+class MetricsRecorder:
+    """
+    Thread-safe metrics aggregator
+
+    Every thread writes to its own shard, so recording never takes a lock
+    and concurrent updates are never lost. Readers merge all shards.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty recorder
+        """
+        self.local = threading.local()
+        self.shards = []
+        self.shards_lock = threading.Lock()  # only taken when a thread first records
+
+    def increment(self, name, value=1):
+        """
+        Add to a counter
+
+        Args:
+            name (str): Counter name
+            value: Amount to add
+        """
+        counters = self._shard().counters
+        counters[name] = counters.get(name, 0) + value
+
+    def observe(self, name, value, label=None):
+        """
+        Record a value in a histogram
+
+        Args:
+            name (str): Histogram name
+            value (float): The value to record
+            label: Optional label, e.g. the scheduling policy
+        """
+        histograms = self._shard().histograms
+        key = (name, label)
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram()
+        histogram.record(value)
+
+    def restore(self, counters, histograms):
+        """
+        Add previously recorded metrics, e.g. recovered from a journal
+
+        Args:
+            counters: Dictionary of counter name to value
+            histograms: Dictionary of (name, label) to Histogram
+        """
+        shard = _Shard()
+        shard.counters.update(counters)
+        shard.histograms.update(histograms)
+        with self.shards_lock:
+            self.shards.append(shard)
+
+    def counter(self, name):
+        """
+        Get the merged value of a counter
+
+        Args:
+            name (str): Counter name
+
+        Returns:
+            Sum of the counter over every thread
+        """
+        return sum(shard.counters.get(name, 0) for shard in list(self.shards))
+
+    def histogram(self, name, label=None):
+        """
+        Get a merged histogram
+
+        Args:
+            name (str): Histogram name
+            label: Label to select, or None for the unlabelled histogram
+
+        Returns:
+            A new Histogram holding the values from every thread
+        """
+        merged = Histogram()
+        for shard in list(self.shards):
+            histogram = shard.histograms.get((name, label))
+            if histogram is not None:
+                merged.merge(histogram)
+        return merged
+
+    def snapshot(self):
+        """
+        Merge every shard into a single view
+
+        Returns:
+            Tuple (counters, histograms) where histograms is keyed by (name, label)
+        """
+        counters = {}
+        histograms = {}
+        for shard in list(self.shards):
+            for name, value in shard.counters.copy().items():
+                counters[name] = counters.get(name, 0) + value
+            for key, histogram in shard.histograms.copy().items():
+                if key not in histograms:
+                    histograms[key] = Histogram()
+                histograms[key].merge(histogram)
+        return counters, histograms
+
+    def _shard(self):
+        """
+        Get the calling thread's shard, creating it on first use
+
+        Returns:
+            The thread's shard
+        """
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = _Shard()
+            with self.shards_lock:
+                self.shards.append(shard)
+        return shard
@@ -0,0 +1,207 @@
+# src/profiler.py
+import time
+import json
+
+from src.metrics import MetricsRecorder
+
+class _Span:
+    """Times the body of a with statement"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _Hold:
+    """Acquires a lock or condition, timing the wait for it and how long it is held"""
+
+    __slots__ = ("profiler", "lock", "name", "acquired")
+
+    def __init__(self, profiler, lock, name):
+        self.profiler = profiler
+        self.lock = lock
+        self.name = name
+
+    def __enter__(self):
+        requested = time.perf_counter()
+        self.lock.acquire()
+        self.acquired = time.perf_counter()
+        self.profiler.record(self.name + ".lock_wait", self.acquired - requested)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.record(self.name + ".lock_hold", time.perf_counter() - self.acquired)
+        self.lock.release()
+        return False
+
+    def wait(self, timeout=None):
+        """
+        Wait on the condition; the lock is not held, or counted as held, meanwhile
+        """
+        self.profiler.record(self.name + ".lock_hold", time.perf_counter() - self.acquired)
+        try:
+            return self.lock.wait(timeout)
+        finally:
+            self.acquired = time.perf_counter()
+
+
+class Profiler:
+    def __init__(self):
+        """
+        Initialize a disabled profiler
+
+        Instrumented code checks the enabled flag once per operation and
+        only reads the clock when it is set, so a disabled profiler costs an
+        attribute lookup and a branch. Timings go to per-thread histograms
+        (see MetricsRecorder), so recording never takes a lock.
+        """
+        self.enabled = False
+        self.metrics = MetricsRecorder()
+        self.enabled_at = None
+        self.elapsed = 0.0  # seconds spent enabled before enabled_at
+
+    def enable(self):
+        """
+        Start recording timings
+        """
+        if not self.enabled:
+            self.enabled_at = time.perf_counter()
+            self.enabled = True
+
+    def disable(self):
+        """
+        Stop recording timings, keeping what was recorded
+        """
+        if self.enabled:
+            self.enabled = False
+            self.elapsed += time.perf_counter() - self.enabled_at
+            self.enabled_at = None
+
+    def reset(self):
+        """
+        Discard every recorded timing
+        """
+        self.metrics = MetricsRecorder()
+        self.elapsed = 0.0
+        if self.enabled:
+            self.enabled_at = time.perf_counter()
+
+    def record(self, name, seconds):
+        """
+        Record one timing
+
+        Args:
+            name (str): Timing name, e.g. "queue.get_job.lock_wait"
+            seconds (float): Duration in seconds
+        """
+        self.metrics.observe(name, seconds)
+
+    def span(self, name):
+        """
+        Time the body of a with statement
+
+        Args:
+            name (str): Timing name
+
+        Returns:
+            Context manager recording the time its body took
+        """
+        return _Span(self, name)
+
+    def hold(self, lock, name):
+        """
+        Wrap a lock or condition so acquiring it records <name>.lock_wait
+        and holding it records <name>.lock_hold
+
+        Use it in place of the lock in a with statement; a wrapped
+        condition's wait() stops the hold time while the lock is released.
+
+        Args:
+            lock: threading.Lock, RLock or Condition
+            name (str): Prefix of the timing names
+
+        Returns:
+            Context manager acquiring the lock
+        """
+        return _Hold(self, lock, name)
+
+    def get_elapsed(self):
+        """
+        Get how long the profiler has been enabled since it was last reset
+
+        Returns:
+            Seconds spent enabled
+        """
+        if self.enabled:
+            return self.elapsed + time.perf_counter() - self.enabled_at
+        return self.elapsed
+
+    def dump(self):
+        """
+        Get every timing in machine-readable form
+
+        Returns:
+            JSON-compatible dictionary with the profiled time and, per timing
+            name, its summary in seconds and its serialized histogram
+        """
+        _, histograms = self.metrics.snapshot()
+        timings = {}
+        for (name, _), histogram in sorted(histograms.items()):
+            timings[name] = dict(histogram.summary(), total=histogram.total,
+                                 histogram=histogram.to_dict())
+        return {"enabled": self.enabled, "elapsed": self.get_elapsed(), "timings": timings}
+
+    def dumps(self):
+        """
+        Get every timing as a JSON document
+
+        Returns:
+            JSON string of dump()
+        """
+        return json.dumps(self.dump(), indent=2)
+
+    def report(self):
+        """
+        Format the timings as a table, the largest total time first
+
+        Returns:
+            List of lines
+        """
+        profile = self.dump()
+        state = "on" if profile["enabled"] else "off"
+        lines = [f"Profiling {state}, {profile['elapsed']:.2f} seconds recorded"]
+        if not profile["timings"]:
+            return lines
+        lines.append(f"  {'Timing':<32}{'Count':>9}{'Total':>11}{'Mean':>11}{'p50':>11}{'p95':>11}"
+                     f"{'p99':>11}{'Max':>11}")
+        ordered = sorted(profile["timings"].items(), key=lambda item: item[1]["total"], reverse=True)
+        for name, timing in ordered:
+            lines.append(f"  {name:<32}{timing['count']:>9}{_format_time(timing['total']):>11}"
+                         + "".join(f"{_format_time(timing[key]):>11}"
+                                   for key in ("mean", "p50", "p95", "p99", "max")))
+        return lines
+
+
+def _format_time(seconds):
+    """
+    Format a duration with a unit that keeps it short
+    """
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+# Process-wide profiler used by the instrumented hot paths
+PROFILER = Profiler()
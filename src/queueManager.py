@@ -1,121 +1,705 @@
 # src/queueManager.py
 import threading
 import time
-from collections import deque
+import heapq
+import itertools
+import math
+from bisect import bisect_left
+from operator import itemgetter
+
+from src.job import Job
+from src.profiler import PROFILER
+
+# Queue orderings, keyed by JobQueue.order_keys. Lower keys are served
+# first; ties are broken by the order jobs entered the queue, so the
+# constant "enqueue" key is plain FIFO over (re)insertions.
+ORDERS = ("arrival", "remaining", "priority", "enqueue", "mlfq")
+
+# The ordering each scheduling policy serves jobs in
+POLICY_ORDERS = {
+    "FCFS": "arrival",
+    "SJF": "remaining",
+    "Priority": "priority",
+    "SRTF": "remaining",
+    "PreemptivePriority": "priority",
+    "RR": "enqueue",
+    "MLFQ": "mlfq",
+}
+
+POLICIES = list(POLICY_ORDERS)
+
+# Policies under which a running job is suspended when a better job is queued
+# (or, for RR and MLFQ, when its time slice is used up)
+PREEMPTIVE_POLICIES = ("SRTF", "PreemptivePriority", "RR", "MLFQ")
+
+DEFAULT_QUANTUM = 1.0
+
+# Number of MLFQ levels; level k has a time slice of quantum * 2 ** k and
+# the last level runs jobs to completion
+MLFQ_LEVELS = 3
+
+# Seconds of waiting that make up for one MLFQ level
+DEFAULT_LEVEL_WAIT = 10.0
+
+# How many queued jobs get_job looks past the head for one that fits the
+# free resources (backfilling)
+BACKFILL_DEPTH = 64
+
+class KeySumIndex:
+    """
+    Sorted (key, sequence) entries with running sums of remaining time
+
+    Entries are kept in sorted blocks of up to 2 * BLOCK_SIZE items with a
+    Fenwick tree over the block totals, so inserting, removing and asking
+    for the total remaining time of every entry before a given key all take
+    O(log n) plus a bounded in-block step.
+    """
+
+    BLOCK_SIZE = 256
+
+    def __init__(self):
+        """
+        Initialize an empty index
+        """
+        self.blocks = []   # sorted (key, sequence) tuples
+        self.values = []   # remaining time of each entry, parallel to blocks
+        self.sums = []     # total remaining time of each block
+        self.maxes = []    # last entry of each block
+        self.tree = [0.0]  # 1-indexed Fenwick tree over block totals
+        self.total = 0.0
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    def insert(self, item, value):
+        """
+        Insert an entry
+
+        Args:
+            item: (key, sequence) tuple
+            value (float): remaining time of the job
+        """
+        self.total += value
+        if not self.blocks:
+            self.blocks.append([item])
+            self.values.append([value])
+            self.sums.append(value)
+            self.maxes.append(item)
+            self._rebuild_tree()
+            return
+
+        i = bisect_left(self.maxes, item)
+        if i == len(self.blocks):
+            i -= 1
+        block = self.blocks[i]
+        pos = bisect_left(block, item)
+        block.insert(pos, item)
+        self.values[i].insert(pos, value)
+        self.maxes[i] = block[-1]
+
+        if len(block) > 2 * self.BLOCK_SIZE:
+            half = len(block) // 2
+            values = self.values[i]
+            self.blocks[i:i + 1] = [block[:half], block[half:]]
+            self.values[i:i + 1] = [values[:half], values[half:]]
+            self.sums[i:i + 1] = [sum(values[:half]), sum(values[half:])]
+            self.maxes[i:i + 1] = [block[half - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self.sums[i] += value
+            self._add(i, value)
+
+    def insert_many(self, items, values):
+        """
+        Insert several entries
+
+        Batches that are large relative to the index are merged with one
+        sort instead of being inserted one at a time.
+
+        Args:
+            items: List of (key, sequence) tuples
+            values: List of remaining times, parallel to items
+        """
+        if len(items) * 8 < len(self):
+            for item, value in zip(items, values):
+                self.insert(item, value)
+            return
+
+        entries = [entry for block, block_values in zip(self.blocks, self.values)
+                   for entry in zip(block, block_values)]
+        entries.extend(zip(items, values))
+        entries.sort(key=itemgetter(0))
+
+        size = self.BLOCK_SIZE
+        self.blocks = [[item for item, _ in entries[i:i + size]] for i in range(0, len(entries), size)]
+        self.values = [[value for _, value in entries[i:i + size]] for i in range(0, len(entries), size)]
+        self.sums = [sum(values) for values in self.values]
+        self.maxes = [block[-1] for block in self.blocks]
+        self._rebuild_tree()
+
+    def remove(self, item):
+        """
+        Remove an entry
+
+        Args:
+            item: (key, sequence) tuple previously inserted
+        """
+        i = bisect_left(self.maxes, item)
+        block = self.blocks[i]
+        pos = bisect_left(block, item)
+        del block[pos]
+        value = self.values[i].pop(pos)
+        self.total -= value
+
+        if block:
+            self.maxes[i] = block[-1]
+            self.sums[i] -= value
+            self._add(i, -value)
+        else:
+            del self.blocks[i]
+            del self.values[i]
+            del self.sums[i]
+            del self.maxes[i]
+            self._rebuild_tree()
+
+    def sum_before(self, item):
+        """
+        Get the total value of every entry that sorts before item
+
+        Args:
+            item: (key, sequence) tuple
+
+        Returns:
+            Sum of remaining time of the entries before item
+        """
+        i = bisect_left(self.maxes, item)
+        if i == len(self.blocks):
+            return self.total
+        pos = bisect_left(self.blocks[i], item)
+        return self._prefix(i) + sum(self.values[i][:pos])
+
+    def _add(self, i, delta):
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Sum of the totals of blocks [0, i)"""
+        total = 0.0
+        while i > 0:
+            total += self.tree[i]
+            i &= i - 1
+        return total
+
+    def _rebuild_tree(self):
+        """Rebuild the Fenwick tree in O(number of blocks)"""
+        tree = [0.0] + self.sums
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = sum(self.sums)
+
 
 class JobQueue:
-    def __init__(self, max_size=float('inf')):
+    def __init__(self, max_size=float('inf'), quantum=DEFAULT_QUANTUM, aging_rate=0.0,
+                 level_wait=DEFAULT_LEVEL_WAIT):
         """
         Initialize the job queue with synchronization primitives
-        
+
+        Queued jobs are kept in a single heap of (key, sequence, job)
+        entries in the current policy's ordering. A switch to a policy with
+        a different ordering re-keys and re-heapifies the backlog in O(n);
+        keeping a heap for every ordering instead would make every queued
+        job pay for five entries to save that rare rebuild.
+
+        Aging is folded into the heap keys. A job's effective priority
+        priority + aging_rate * (now - arrival_time) ranks jobs exactly like
+        aging_rate * arrival_time - priority, because the now term is the
+        same for every job; that key never changes while the job waits, so
+        aged order is kept without ever re-keying the heap. Effective job
+        length ages the same way under SJF and SRTF, and an MLFQ job at
+        level k is ranked as if it had arrived k * level_wait seconds late.
+
         Args:
             max_size (int): Maximum size of the queue
+            quantum (float): Time slice in seconds under RR and at the top MLFQ level
+            aging_rate (float): Priority gained, and seconds of job length
+                forgiven, per second of waiting (0 disables aging)
+            level_wait (float): Waiting time in seconds that offsets one MLFQ level
         """
-        self.queue = deque()
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        if aging_rate < 0:
+            raise ValueError("aging_rate must not be negative")
+
+        self.aging_rate = aging_rate
+        self.level_wait = level_wait
+        self.epoch = None  # arrival time of the first job, keeps aged keys small
+        self.order_keys = self._build_order_keys()
+        self.heap = []  # (key, sequence, job) entries in the current ordering
+        self.heap_key = self.order_keys[POLICY_ORDERS["FCFS"]]
+        # Running remaining-time sums in the order of the current policy, for
+        # wait estimates; built by the first get_work_ahead after a policy
+        # change, so adds and pops only maintain it while it is being queried
+        self.wait_index = None
+        self.sequence = itertools.count()
         self.mutex = threading.Lock()
         self.not_empty = threading.Condition(self.mutex)
         self.not_full = threading.Condition(self.mutex)
         self.current_policy = "FCFS"  # Default policy
+        # Counts policy changes, so holders of taken jobs can tell the order changed
+        self.policy_version = 0
         self.max_size = max_size
-    
+        self.quantum = quantum
+        self.closed = False
+
     def add_job(self, job):
         """
         Add a job to the queue (producer operation)
-        
+
+        The job is pushed onto the policy heap in O(log n).
+
         Args:
             job: The job to be added
         """
-        with self.not_full:
-            while len(self.queue) >= self.max_size:
- 
-                self.not_full.wait()
-            
+        not_full = PROFILER.hold(self.not_full, "queue.add_job") if PROFILER.enabled else self.not_full
+        with not_full:
+            while len(self.heap) >= self.max_size:
+
+                not_full.wait()
+
 
             if job.arrival_time is None:
                 job.arrival_time = time.time()
-            
 
-            self.queue.append(job)
-            
+            self._push(job)
+
+
+            self.not_empty.notify()
+
+    def add_jobs(self, jobs):
+        """
+        Add many jobs to the queue under a single lock acquisition
+
+        Consumers are woken once per batch rather than once per job. If the
+        queue is bounded, the batch is added in as many pieces as needed.
+
+        Args:
+            jobs: Iterable of jobs to be added
+
+        Returns:
+            Number of jobs added
+        """
+        jobs = list(jobs)
+        added = 0
+        not_full = PROFILER.hold(self.not_full, "queue.add_jobs") if PROFILER.enabled else self.not_full
+        with not_full:
+            while added < len(jobs):
+                room = self.max_size - len(self.heap)
+                if room <= 0:
+                    not_full.wait()
+                    continue
+
+                end = len(jobs) if room >= len(jobs) - added else added + int(room)
+                now = time.time()
+                for job in jobs[added:end]:
+                    if job.arrival_time is None:
+                        job.arrival_time = now
+                self._push_many(jobs[added:end])
+                self.not_empty.notify(end - added)
+                added = end
+        return added
+
+    def requeue(self, job, slice_time=0.0):
+        """
+        Put a preempted job back in the queue
+
+        The job keeps its arrival time and is queued by its remaining time.
+        Under MLFQ, a job that used up its whole time slice moves down a
+        level. A requeue never waits for room, so a bounded queue cannot
+        block the dispatcher that preempted the job.
 
+        Args:
+            job: The partially-run job
+            slice_time (float): Seconds the job ran since it last started or resumed
+        """
+        with PROFILER.hold(self.mutex, "queue.requeue") if PROFILER.enabled else self.mutex:
+            self._requeue(job, slice_time)
             self.not_empty.notify()
-    
-    def get_job(self):
+
+    def should_preempt(self, job, slice_time):
+        """
+        Check whether a running job should give up its worker
+
+        Args:
+            job: The running job, with remaining_time up to date
+            slice_time (float): Seconds the job has run since it last started or resumed
+
+        Returns:
+            True if the current policy is preemptive and a queued job should
+            run instead, or, under RR and MLFQ, the job's time slice is used
+            up and another job waits
+        """
+        with self.mutex:
+            return self._should_preempt(job, slice_time)
+
+    def get_time_slice(self, job):
+        """
+        Get how long a job may run while others wait under the current policy
+
+        Args:
+            job: The job about to run
+
+        Returns:
+            The time slice in seconds, or None if the job is not time-sliced
+        """
+        with self.mutex:
+            return self._time_slice(job)
+
+    def set_quantum(self, quantum):
+        """
+        Set the RR time slice
+
+        Args:
+            quantum (float): Time slice in seconds
+        """
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        with self.mutex:
+            self.quantum = quantum
+
+    def get_job(self, place=None, block=True):
         """
         Get the next job from the queue according to the current policy (consumer operation)
-        
+
+        Blocks until a job is available or the queue is closed. With place,
+        the job returned is the first of the next BACKFILL_DEPTH jobs in
+        policy order that place accepts, so jobs that fit the free
+        resources run while a larger job at the head waits.
+
+        Args:
+            place: Optional callable place(job, position) that reserves
+                resources for a job and returns a false value if the job may
+                not start yet; position counts the jobs turned down before it
+            block (bool): Whether to wait for a job; if False, None is
+                returned at once when no job can be handed out
+
         Returns:
-            The next job or None if queue is empty
-        """
-        with self.not_empty:
-            while len(self.queue) == 0:
-            
-                self.not_empty.wait()
-            
-        
-            job = self.queue.popleft()
-            
- 
+            The next job or None if the queue is closed and empty
+        """
+        not_empty = PROFILER.hold(self.not_empty, "queue.get_job") if PROFILER.enabled else self.not_empty
+        with not_empty:
+            while True:
+                if not self.heap:
+                    if self.closed:
+                        return None
+                elif place is None:
+                    job = self._pop()
+                    break
+                else:
+                    job = self._pop_placeable(place)
+                    if job is not None:
+                        if self.heap:
+                            # What is left may fit the remaining resources too
+                            self.not_empty.notify()
+                        break
+
+                if not block:
+                    return None
+                not_empty.wait()
+
+
             self.not_full.notify()
-            
+
             return job
-    
+
+    def get_jobs(self, max_jobs, accept=None, share=1):
+        """
+        Take up to max_jobs jobs from the head of the queue without blocking
+
+        Jobs are taken in policy order, stopping at the first one accept
+        turns down, so a batch never skips ahead of a job left waiting.
+
+        Args:
+            max_jobs (int): Most jobs to take
+            accept: Optional callable accept(job) returning a false value for
+                a job that may not join the batch
+            share (int): Take at most 1/share of the queued jobs, leaving
+                the rest to the other consumers
+
+        Returns:
+            List of jobs in policy order, possibly empty
+        """
+        jobs = []
+        with PROFILER.hold(self.mutex, "queue.get_jobs") if PROFILER.enabled else self.mutex:
+            max_jobs = min(max_jobs, len(self.heap) // share)
+            while len(jobs) < max_jobs and self.heap:
+                if accept is not None and not accept(self.heap[0][2]):
+                    break
+                jobs.append(self._pop())
+            if jobs:
+                self.not_full.notify(len(jobs))
+        return jobs
+
+    def wake(self):
+        """
+        Wake every blocked consumer, after resources were released
+        """
+        with self.mutex:
+            self.not_empty.notify_all()
+
     def reorder_queue(self, policy):
         """
-        Reorder the queue according to the given policy
-        
+        Switch the queue to the given policy
+
+        The queued jobs are re-keyed and re-heapified in O(n) when the new
+        policy orders jobs differently, and this is O(1) otherwise.
+
         Args:
             policy (str): The scheduling policy to use
         """
+        if policy not in POLICY_ORDERS:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+
         with self.mutex:
-       
+            if POLICY_ORDERS[policy] != POLICY_ORDERS[self.current_policy]:
+                self._rebuild_heap(POLICY_ORDERS[policy])
             self.current_policy = policy
-            
-        
-            jobs = list(self.queue)
-            
-         
-            if policy == "FCFS":
-                # Sort by arrival time (ascending - earliest first)
-                jobs.sort(key=lambda job: job.arrival_time)
-            elif policy == "SJF":
-                # Sort by execution time (ascending - shortest first)
-                jobs.sort(key=lambda job: job.exec_time)
-            elif policy == "Priority":
-                # Sort by priority (descending - highest priority first)
-                jobs.sort(key=lambda job: job.priority, reverse=True)
-            
-       
-            self.queue.clear()
-            for job in jobs:
-                self.queue.append(job)
-    
+            self.policy_version += 1
+
+    def close(self):
+        """
+        Close the queue and wake every blocked consumer
+
+        Consumers drain any remaining jobs and then get None from get_job.
+        """
+        with self.mutex:
+            self.closed = True
+            self.not_empty.notify_all()
+
     def get_job_list(self):
         """
         Get a list of all jobs in the queue
-        
+
+        Returns:
+            List of jobs in the order the current policy will run them
+        """
+        with self.mutex:
+            entries = list(self.heap)
+        entries.sort()
+        return [entry[2] for entry in entries]
+
+    def get_work_ahead(self, exec_time, priority=0, arrival_time=None):
+        """
+        Get the queued work a new job would wait behind under the current policy
+
+        Args:
+            exec_time (float): Execution time of the prospective job
+            priority (int): Priority of the prospective job
+            arrival_time (float): Arrival time of the prospective job (defaults to now)
+
         Returns:
-            List of jobs
+            Total remaining time of the queued jobs that would run first, in
+            O(log n) (the first query after a policy change builds the index
+            in O(n log n))
         """
+        job = Job(None, exec_time, priority)
+        job.arrival_time = time.time() if arrival_time is None else arrival_time
+
         with self.mutex:
-            return list(self.queue)
-    
+            if self.epoch is None:
+                return 0.0
+            if self.wait_index is None:
+                self._build_wait_index()
+            key = self.heap_key(job)
+            # A new job sorts after every queued job with an equal key
+            return self.wait_index.sum_before((key, math.inf))
+
     def get_queue_size(self):
         """
         Get the current size of the queue
-        
+
         Returns:
             Number of jobs in the queue
         """
         with self.mutex:
-            return len(self.queue)
-    
+            return len(self.heap)
+
     def get_current_policy(self):
         """
         Get the current scheduling policy
-        
+
         Returns:
             Current policy name
         """
         with self.mutex:
-            return self.current_policy
\ No newline at end of file
+            return self.current_policy
+
+    def _push(self, job):
+        """
+        Push a job onto the policy heap (caller holds the mutex)
+
+        Args:
+            job: The job to push
+        """
+        if self.epoch is None:
+            self.epoch = job.arrival_time
+        entry = (self.heap_key(job), next(self.sequence), job)
+        heapq.heappush(self.heap, entry)
+        if self.wait_index is not None:
+            self.wait_index.insert(entry[:2], job.remaining_time)
+
+    def _push_many(self, jobs):
+        """
+        Push a batch of jobs onto the policy heap (caller holds the mutex)
+
+        A batch that is large relative to the heap is appended and the heap
+        re-heapified in O(n), which is cheaper than pushing one by one.
+
+        Args:
+            jobs: List of jobs to push
+        """
+        if self.epoch is None:
+            self.epoch = jobs[0].arrival_time
+        key, sequence, heap = self.heap_key, self.sequence, self.heap
+        entries = [(key(job), next(sequence), job) for job in jobs]
+        if len(entries) * 4 >= len(heap):
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+        if self.wait_index is not None:
+            self.wait_index.insert_many([entry[:2] for entry in entries],
+                                        [job.remaining_time for job in jobs])
+
+    def _requeue(self, job, slice_time):
+        """
+        Push a preempted job back, moving it down an MLFQ level if it used
+        up its time slice (caller holds the mutex)
+        """
+        if self.current_policy == "MLFQ":
+            time_slice = self._time_slice(job)
+            if time_slice is not None and slice_time >= time_slice:
+                job.level += 1
+        self._push(job)
+
+    def _should_preempt(self, job, slice_time):
+        """
+        Check whether a running job should give up its worker (caller holds the mutex)
+
+        See should_preempt.
+        """
+        policy = self.current_policy
+        if policy not in PREEMPTIVE_POLICIES or not self.heap:
+            return False
+        time_slice = self._time_slice(job)
+        if time_slice is not None and slice_time >= time_slice:
+            return True
+        if policy == "RR":
+            return False
+        return self.heap[0][0] < self.heap_key(job)
+
+    def _pop(self):
+        """
+        Pop the head of the policy heap (caller holds the mutex)
+
+        Returns:
+            The removed job
+        """
+        entry = heapq.heappop(self.heap)
+        if self.wait_index is not None:
+            self.wait_index.remove(entry[:2])
+        return entry[2]
+
+    def _pop_placeable(self, place):
+        """
+        Pop the first job in policy order that place accepts (caller holds the mutex)
+
+        Args:
+            place: Callable that reserves resources for a job
+
+        Returns:
+            The removed job, or None if none of the first BACKFILL_DEPTH fit
+        """
+        heap = self.heap
+        skipped = []
+        found = None
+        while heap and len(skipped) < BACKFILL_DEPTH:
+            entry = heapq.heappop(heap)
+            if place(entry[2], len(skipped)):
+                found = entry
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if found is None:
+            return None
+        if self.wait_index is not None:
+            self.wait_index.remove(found[:2])
+        return found[2]
+
+    def _rebuild_heap(self, order):
+        """
+        Re-key every queued job for another ordering (caller holds the mutex)
+
+        Sequence numbers are kept, so ties still go to the job queued first.
+
+        Args:
+            order (str): Name in ORDERS
+        """
+        key = self.order_keys[order]
+        self.heap[:] = [(key(job), seq, job) for _, seq, job in self.heap]
+        heapq.heapify(self.heap)
+        self.heap_key = key
+        self.wait_index = None
+
+    def _build_wait_index(self):
+        """
+        Index the remaining time of every queued job in the current ordering (caller holds the mutex)
+        """
+        self.wait_index = KeySumIndex()
+        self.wait_index.insert_many([entry[:2] for entry in self.heap],
+                                    [entry[2].remaining_time for entry in self.heap])
+
+    def _build_order_keys(self):
+        """
+        Build the key function of every ordering
+
+        Returns:
+            Dictionary mapping each name in ORDERS to a key function
+        """
+        rate = self.aging_rate
+        level_wait = self.level_wait
+
+        def arrived(job):
+            # Arrival relative to the first job, so aged keys stay small
+            return job.arrival_time - self.epoch
+
+        if rate:
+            remaining = lambda job: job.remaining_time + rate * arrived(job)
+            priority = lambda job: rate * arrived(job) - job.priority
+        else:
+            remaining = lambda job: job.remaining_time
+            priority = lambda job: -job.priority
+
+        return {
+            "arrival": lambda job: job.arrival_time,
+            "remaining": remaining,
+            "priority": priority,
+            "enqueue": lambda job: 0,
+            "mlfq": lambda job: arrived(job) + job.level * level_wait,
+        }
+
+    def _time_slice(self, job):
+        """
+        Get a job's time slice under the current policy (caller holds the mutex)
+        """
+        if self.current_policy == "RR":
+            return self.quantum
+        if self.current_policy == "MLFQ" and job.level < MLFQ_LEVELS - 1:
+            return self.quantum * 2 ** job.level
+        return None
@@ -0,0 +1,407 @@
+# src/resources.py
+import os
+import math
+import time
+import threading
+from bisect import bisect_left
+
+# How jobs behind one that does not fit may start ahead of it:
+#   none          never; jobs start strictly in policy order
+#   greedy        whenever they fit, which can starve large jobs
+#   easy          if they do not delay the first waiting job's reservation
+#   conservative  if they do not delay any waiting job's reservation
+BACKFILL_MODES = ("none", "greedy", "easy", "conservative")
+
+# Seconds from now at which a job running past its estimate is expected to end
+OVERDUE_DELAY = 0.001
+
+def host_memory():
+    """
+    Get the physical memory of this host
+
+    Returns:
+        Memory in MB, or math.inf if it cannot be determined
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return math.inf
+
+
+class Node:
+    """CPU and memory capacity of one machine, and how much of it is free"""
+
+    def __init__(self, name, cpus, memory=math.inf):
+        """
+        Initialize an idle node
+
+        Args:
+            name (str): Name shown in usage reports
+            cpus (int): Number of CPU cores
+            memory (float): Memory in MB (math.inf for no limit)
+        """
+        if cpus < 1:
+            raise ValueError("A node needs at least one CPU")
+        if memory <= 0:
+            raise ValueError("A node needs some memory")
+        self.name = name
+        self.cpus = cpus
+        self.memory = memory
+        self.free_cpus = cpus
+        self.free_memory = memory
+
+    def fits(self, job):
+        """
+        Check whether a job fits in the node's free capacity
+
+        Args:
+            job: The job, with cpus and memory requests
+
+        Returns:
+            True if the job can be placed now
+        """
+        return job.cpus <= self.free_cpus and job.memory <= self.free_memory
+
+
+class ReservationProfile:
+    """
+    Free CPUs and memory of one node over time, as a step function
+
+    times[i] is when the i-th step starts; each step lasts until the next
+    one, and the last lasts forever. Steps come from the expected ends of
+    running jobs and from reservations, so a profile has a few steps per
+    running or reserved job and every operation is a single linear pass.
+    """
+
+    def __init__(self, now, cpus, memory, releases=()):
+        """
+        Build a profile from a node's free capacity and its expected releases
+
+        Args:
+            now (float): Start of the profile
+            cpus (int): CPUs free now
+            memory (float): Memory free now, in MB
+            releases: Iterable of (time, cpus, memory) freed by running jobs,
+                at times after now
+        """
+        self.times = [now]
+        self.cpus = [cpus]
+        self.memory = [memory]
+        for release_time, release_cpus, release_memory in sorted(releases, key=lambda r: r[0]):
+            if release_time > self.times[-1]:
+                self.times.append(release_time)
+                self.cpus.append(self.cpus[-1])
+                self.memory.append(self.memory[-1])
+            self.cpus[-1] += release_cpus
+            self.memory[-1] += release_memory
+
+    def earliest_start(self, cpus, memory, duration):
+        """
+        Find the earliest time a request fits for its whole duration
+
+        Args:
+            cpus (int): CPUs requested
+            memory (float): Memory requested, in MB
+            duration (float): Expected run time in seconds
+
+        Returns:
+            The start time, or None if the request never fits
+        """
+        times, free_cpus, free_memory = self.times, self.cpus, self.memory
+        start = None
+        last = len(times) - 1
+        for i in range(last + 1):
+            if free_cpus[i] < cpus or free_memory[i] < memory:
+                start = None
+            elif start is None:
+                start = times[i]
+                if i == last or times[i + 1] - start >= duration:
+                    return start
+            elif i == last or times[i + 1] - start >= duration:
+                return start
+        return None
+
+    def fits_now(self, cpus, memory, duration):
+        """
+        Check whether a request fits from the start of the profile
+
+        Only the steps the request would overlap are looked at.
+
+        Args:
+            cpus (int): CPUs requested
+            memory (float): Memory requested, in MB
+            duration (float): Expected run time in seconds
+
+        Returns:
+            True if the request can start now without cutting into a reservation
+        """
+        end = self.times[0] + duration
+        for i, step_start in enumerate(self.times):
+            if i and step_start >= end:
+                return True
+            if self.cpus[i] < cpus or self.memory[i] < memory:
+                return False
+        return True
+
+    def reserve(self, start, duration, cpus, memory):
+        """
+        Take capacity away from the interval [start, start + duration)
+
+        Args:
+            start (float): Start of the reservation, at or after the profile start
+            duration (float): Length of the reservation in seconds
+            cpus (int): CPUs reserved
+            memory (float): Memory reserved, in MB
+        """
+        if duration <= 0:
+            return
+        first = self._split(start)
+        end = self._split(start + duration)
+        for i in range(first, end):
+            self.cpus[i] -= cpus
+            self.memory[i] -= memory
+
+    def _split(self, at):
+        """
+        Make sure a step starts at the given time
+
+        Returns:
+            Index of the step starting at that time
+        """
+        i = bisect_left(self.times, at)
+        if i == len(self.times) or self.times[i] != at:
+            self.times.insert(i, at)
+            self.cpus.insert(i, self.cpus[i - 1])
+            self.memory.insert(i, self.memory[i - 1])
+        return i
+
+
+class ResourcePool:
+    """
+    CPU and memory budget shared by every dispatcher worker
+
+    Jobs are placed best-fit: on the node they fit with the fewest CPUs
+    (then the least memory) left over, which keeps whole nodes free for
+    large jobs. A job that asks for more than any node has runs alone on
+    the largest node, once that node is idle, rather than never running.
+
+    A job that does not fit blocks the jobs queued behind it unless the
+    backfill mode lets them start first. Under EASY and conservative
+    backfilling, a blocked job is given a reservation in a profile of the
+    nodes' free capacity over time, built from the running jobs' expected
+    ends (start + exec_time estimate). A later job starts only if it fits
+    now without cutting into any reservation, so a backfilled job can
+    never delay the reserved one unless it overruns its estimate.
+    """
+
+    def __init__(self, nodes=None, backfill="easy", clock=time.time):
+        """
+        Initialize the pool
+
+        Args:
+            nodes: List of Node objects (defaults to this host's CPUs and memory);
+                an empty list leaves placement waiting until add_node is called
+            backfill (str): One of BACKFILL_MODES
+            clock: Callable returning the current time, used for expected ends
+        """
+        if nodes is None:
+            nodes = [Node("localhost", os.cpu_count() or 1, host_memory())]
+        if backfill not in BACKFILL_MODES:
+            raise ValueError(f"Unknown backfill mode: {backfill}")
+        self.nodes = list(nodes)
+        self.backfill = backfill
+        self.clock = clock
+        self.largest = self._largest()
+        self.placements = {}  # job -> (node, cpus, memory, expected end)
+        self.lock = threading.Lock()
+        # Reservation profiles of the scan in progress on each thread
+        self.scan = threading.local()
+
+    def place(self, job, position=0, node=None):
+        """
+        Reserve capacity for a job if it may start now
+
+        Queues call place for the jobs they could hand out next, in policy
+        order, stopping at the first one placed; position is the number of
+        jobs already turned down in the same scan. Each turned-down job is
+        reserved under the backfill mode before the next one is tried.
+
+        Args:
+            job: The job to place
+            position (int): Number of jobs turned down earlier in this scan
+            node: Optional node the job must be placed on; reservations
+                still consider every node
+
+        Returns:
+            The node the job was placed on, or None if it may not start yet
+        """
+        with self.lock:
+            if position == 0:
+                self.scan.profiles = None
+            elif self.backfill == "none":
+                return None
+
+            node = self._choose(job, node)
+            if node is None:
+                if self.backfill == "conservative" or (self.backfill == "easy" and position == 0):
+                    self._reserve(job)
+                return None
+
+            cpus, memory = self._request(job, node)
+            node.free_cpus -= cpus
+            node.free_memory -= memory
+            self.placements[job] = (node, cpus, memory, self.clock() + job.remaining_time)
+            return node
+
+    def release(self, job):
+        """
+        Return a job's capacity to its node
+
+        Args:
+            job: A job placed with place()
+        """
+        with self.lock:
+            placement = self.placements.pop(job, None)
+            if placement is not None:
+                node, cpus, memory, _ = placement
+                node.free_cpus += cpus
+                node.free_memory += memory
+
+    def transfer(self, job, next_job):
+        """
+        Hand a finished job's capacity straight to the next job to run in it
+
+        Args:
+            job: A job placed with place() that has finished
+            next_job: A job requesting no more CPUs or memory than job
+        """
+        with self.lock:
+            node, cpus, memory, _ = self.placements.pop(job)
+            self.placements[next_job] = (node, cpus, memory, self.clock() + next_job.remaining_time)
+
+    def add_node(self, node):
+        """
+        Add an idle node to the pool
+
+        Args:
+            node: The Node to add
+        """
+        with self.lock:
+            self.nodes.append(node)
+            self.largest = self._largest()
+
+    def remove_node(self, node):
+        """
+        Remove a node from the pool
+
+        Args:
+            node: A node whose jobs have all been released
+        """
+        with self.lock:
+            if any(placement[0] is node for placement in self.placements.values()):
+                raise ValueError(f"Node {node.name} still has jobs placed on it")
+            self.nodes.remove(node)
+            self.largest = self._largest()
+
+    def get_usage(self):
+        """
+        Get the capacity in use across every node
+
+        Returns:
+            Dictionary with used and total CPUs and memory (MB)
+        """
+        with self.lock:
+            return {
+                "used_cpus": sum(node.cpus - node.free_cpus for node in self.nodes),
+                "total_cpus": sum(node.cpus for node in self.nodes),
+                "used_memory": sum(node.memory - node.free_memory for node in self.nodes
+                                   if node.memory != math.inf),
+                "total_memory": sum(node.memory for node in self.nodes),
+            }
+
+    def _choose(self, job, only=None):
+        """
+        Pick the best-fit node a job may start on now (caller holds the lock)
+
+        Args:
+            job: The job to place
+            only: Optional node to restrict the choice to
+
+        Returns:
+            The node, or None
+        """
+        profiles = getattr(self.scan, "profiles", None)
+        best = None
+        for node in (self.nodes if only is None else (only,)):
+            request = self._request(job, node)
+            if request is None or request[0] > node.free_cpus or request[1] > node.free_memory:
+                continue
+            if profiles is not None:
+                # Starting now must not cut into a reservation
+                if not profiles[node].fits_now(request[0], request[1], job.remaining_time):
+                    continue
+            if best is None or (node.free_cpus, node.free_memory) < (best.free_cpus, best.free_memory):
+                best = node
+        return best
+
+    def _reserve(self, job):
+        """
+        Reserve the earliest capacity a blocked job could start on (caller holds the lock)
+        """
+        profiles = self.scan.profiles
+        if profiles is None:
+            profiles = self.scan.profiles = self._build_profiles()
+
+        best = None
+        for node in self.nodes:
+            request = self._request(job, node)
+            if request is None:
+                continue
+            start = profiles[node].earliest_start(request[0], request[1], job.remaining_time)
+            if start is not None and (best is None or start < best[0]):
+                best = (start, node, request)
+        if best is not None:
+            start, node, (cpus, memory) = best
+            profiles[node].reserve(start, job.remaining_time, cpus, memory)
+
+    def _build_profiles(self):
+        """
+        Build every node's profile from its running jobs' expected ends
+
+        Returns:
+            Dictionary mapping each node to its ReservationProfile
+        """
+        releases = {node: [] for node in self.nodes}
+        for node, cpus, memory, end in self.placements.values():
+            releases[node].append((end, cpus, memory))
+        now = self.clock()
+        for node_releases in releases.values():
+            node_releases[:] = [(max(end, now + OVERDUE_DELAY), cpus, memory)
+                                for end, cpus, memory in node_releases]
+        return {node: ReservationProfile(now, node.free_cpus, node.free_memory, releases[node])
+                for node in self.nodes}
+
+    def _largest(self):
+        """
+        Get the node an oversized job runs on (caller holds the lock)
+
+        Returns:
+            The node with the most CPUs, then memory, or None without nodes
+        """
+        return max(self.nodes, key=lambda node: (node.cpus, node.memory), default=None)
+
+    def _request(self, job, node):
+        """
+        Get the capacity a job takes on a node (caller holds the lock)
+
+        Returns:
+            (cpus, memory), or None if the job can never run on the node.
+            A job larger than every node takes the whole largest node.
+        """
+        if job.cpus <= node.cpus and job.memory <= node.memory:
+            return job.cpus, job.memory
+        if node is self.largest and not any(job.cpus <= other.cpus and job.memory <= other.memory
+                                            for other in self.nodes):
+            # An unlimited node has no whole memory to take
+            return node.cpus, job.memory if node.memory == math.inf else node.memory
+        return None
@@ -1,7 +1,12 @@
 # src/scheduler.py
 import threading
 import time
-from src.job import Job
+import queue
+import itertools
+from src.job import Job, check_job_request
+from src.queueManager import POLICIES
+from src.metrics import MetricsRecorder, Histogram
+from src.dependencies import DependencyTracker
 
 class Scheduler(threading.Thread):
     def __init__(self, job_queue):
@@ -14,50 +19,235 @@ class Scheduler(threading.Thread):
         super().__init__()
         self.job_queue = job_queue
         self.running = True
-        self.stats = {
-            "total_jobs": 0,
-            "completed_jobs": 0,
-            "total_response_time": 0,
-            "policies": {
-                "FCFS": {"jobs": 0, "response_time": 0},
-                "SJF": {"jobs": 0, "response_time": 0},
-                "Priority": {"jobs": 0, "response_time": 0}
-            }
-        }
+        # Submission, completion and policy-change events, consumed by run()
+        self.events = queue.Queue()
+        self.listeners = []
+        # Per-thread counters and histograms, written without locking
+        self.metrics = MetricsRecorder()
+        self.completion = threading.Condition()
+        self.completion_waiters = 0
+        # Sets of job ids that wait_for_jobs() callers are waiting on
+        self.completion_watches = []
+        self.job_ids = itertools.count(1)
+        # Optional write-ahead Journal, set by recover()
+        self.journal = None
+        # Jobs held back until the jobs they depend on complete
+        self.dependencies = DependencyTracker()
+        # Wall-clock time the scheduler was started, for throughput
+        self.start_time = None
+    
+    def start(self):
+        """
+        Record the start time and start the scheduler thread
+        """
+        self.start_time = time.time()
+        super().start()
     
     def run(self):
         """
         Main loop for the scheduler thread
+
+        Blocks on the event queue and hands each event to the registered
+        listeners as soon as it is posted. stop() posts a sentinel so the
+        loop exits immediately.
         """
         while self.running:
+            event = self.events.get()
+            if event is None:
+                break
             
-            time.sleep(0.1)
-            
-   
+            event_type, payload = event
+            for listener in list(self.listeners):
+                try:
+                    listener(event_type, payload)
+                except Exception as e:
+                    print(f"Error in scheduler listener: {e}")
     
-    def submit_job(self, name, exec_time, priority=0):
+    def add_listener(self, listener):
+        """
+        Register a callback for scheduler events
+        
+        Args:
+            listener: Callable taking (event_type, payload), where event_type is
+                "submit" or "complete" with a job, "submit_batch" with a list
+                of jobs, or "policy" with a policy name
+        """
+        self.listeners.append(listener)
+    
+    def post_event(self, event_type, payload):
+        """
+        Post an event to the scheduler thread
+        
+        Args:
+            event_type (str): "submit", "submit_batch", "complete" or "policy"
+            payload: The job, jobs or policy the event is about
+        """
+        # Nothing consumes events without listeners, so don't queue them
+        if self.listeners:
+            self.events.put((event_type, payload))
+    
+    def submit_job(self, name, exec_time, priority=0, arrival_time=None, cpus=1, memory=0,
+                   depends_on=()):
         """
         Submit a new job to the queue
         
+        A job with dependencies is held back, in the Blocked state, until
+        every job it depends on has completed.
+        
         Args:
             name (str): Name of the job
             exec_time (float): Execution time in seconds
             priority (int): Priority level (higher number = higher priority)
+            arrival_time (float): Arrival timestamp (defaults to now)
+            cpus (int): Number of CPU cores the job needs
+            memory (float): Memory the job needs, in MB
+            depends_on: Ids of earlier jobs that must complete first
         
         Returns:
             The created job object
         """
     
-        job = Job(name, exec_time, priority)
+        job = self._create_job(name, exec_time, priority, cpus, memory)
+        job.arrival_time = arrival_time
         
-     
-        self.job_queue.add_job(job)
+        # Time spent blocked counts as waiting time
+        if job.arrival_time is None and (depends_on or self.journal is not None):
+            job.arrival_time = time.time()
+        if depends_on:
+            self.dependencies.validate([job], [depends_on])
+        if self.journal is not None:
+            # Journal the submission before a dispatcher can start the job
+            self.journal.record_submit(job, depends_on)
+        if self.dependencies.add(job, depends_on):
+            self.job_queue.add_job(job)
         
-       
-        self.stats["total_jobs"] += 1
+        self.metrics.increment("total_jobs")
         
+        self.post_event("submit", job)
         return job
     
+    def submit_jobs(self, specs, batch_size=10000):
+        """
+        Submit many jobs through the bulk queue path
+        
+        Jobs are added in batches, each under a single queue lock acquisition
+        with a single consumer wakeup and a single "submit_batch" event.
+        
+        Args:
+            specs: Iterable of (name, exec_time[, priority[, cpus[, memory[, depends_on]]]])
+                tuples; it is consumed lazily, batch by batch
+            batch_size (int): Maximum number of jobs added per lock acquisition
+        
+        Returns:
+            Number of jobs submitted
+        """
+        submitted = 0
+        batch, depends_on_lists = [], []
+        for spec in specs:
+            batch.append(self._create_job(*spec[:5]))
+            depends_on_lists.append(spec[5] if len(spec) > 5 else ())
+            if len(batch) >= batch_size:
+                submitted += self._submit_batch(batch, depends_on_lists)
+                batch, depends_on_lists = [], []
+        if batch:
+            submitted += self._submit_batch(batch, depends_on_lists)
+        return submitted
+    
+    def submit_batch(self, specs):
+        """
+        Submit one batch of jobs under a single queue lock acquisition
+
+        Args:
+            specs: List of (name, exec_time[, priority[, cpus[, memory[, depends_on]]]]) tuples
+
+        Returns:
+            List of the created jobs, in the order of specs
+        """
+        jobs = [self._create_job(*spec[:5]) for spec in specs]
+        if jobs:
+            self._submit_batch(jobs, [spec[5] if len(spec) > 5 else () for spec in specs])
+        return jobs
+
+    def _submit_batch(self, jobs, depends_on_lists):
+        """
+        Add a batch of jobs to the queue and record the submissions
+        
+        Args:
+            jobs: List of jobs
+            depends_on_lists: List of dependency id lists, parallel to jobs
+        
+        Returns:
+            Number of jobs submitted
+        """
+        has_dependencies = any(depends_on_lists)
+        if self.journal is not None or has_dependencies:
+            now = time.time()
+            for job in jobs:
+                job.arrival_time = now
+        if has_dependencies:
+            self.dependencies.validate(jobs, depends_on_lists)
+        if self.journal is not None:
+            self.journal.record_submits(jobs, depends_on_lists)
+        ready = self.dependencies.add_many(jobs, depends_on_lists if has_dependencies else None)
+        self.job_queue.add_jobs(ready)
+        self.metrics.increment("total_jobs", len(jobs))
+        self.post_event("submit_batch", jobs)
+        return len(jobs)
+    
+    def _create_job(self, name, exec_time, priority=0, cpus=1, memory=0):
+        """
+        Create a job with the next job id
+        
+        Args:
+            name (str): Name of the job
+            exec_time (float): Execution time in seconds
+            priority (int): Priority level
+            cpus (int): Number of CPU cores the job needs
+            memory (float): Memory the job needs, in MB
+        
+        Returns:
+            The created job object
+        
+        Raises:
+            ValueError: If exec_time, cpus or memory is not finite or out of range
+        """
+        check_job_request(exec_time, cpus, memory)
+        return Job(name, exec_time, priority, next(self.job_ids), cpus, memory)
+    
+    def recover(self, journal):
+        """
+        Restore queued jobs and statistics from a journal and start journaling
+        
+        Jobs that were waiting or running when the journal was last written
+        are queued again with their original ids and arrival times.
+        
+        Jobs still waiting on dependencies are blocked again; dependencies
+        on jobs that completed before the restart count as satisfied.
+        
+        Args:
+            journal: An unopened Journal
+        
+        Returns:
+            Number of jobs requeued
+        """
+        state = journal.open().copy()
+        self.metrics.restore(state.counters, state.histograms)
+        self.job_queue.reorder_queue(state.policy)
+        
+        jobs, depends_on_lists = [], []
+        for job_id, spec in sorted(state.pending.items()):
+            name, exec_time, priority, arrival_time, _, cpus, memory, depends_on = spec
+            job = Job(name, exec_time, priority, job_id, cpus, memory)
+            job.arrival_time = arrival_time
+            jobs.append(job)
+            depends_on_lists.append(depends_on)
+        # Never reuse the id of a completed job, which dependencies may still name
+        self.job_ids = itertools.count(state.last_job_id + 1)
+        self.job_queue.add_jobs(self.dependencies.add_many(jobs, depends_on_lists))
+        
+        self.journal = journal
+        return len(jobs)
+    
     def change_policy(self, policy):
         """
         Change the scheduling policy
@@ -65,12 +255,25 @@ class Scheduler(threading.Thread):
         Args:
             policy (str): The scheduling policy to use
         """
-        if policy in ["FCFS", "SJF", "Priority"]:
+        if policy in POLICIES:
           
             self.job_queue.reorder_queue(policy)
+            if self.journal is not None:
+                self.journal.record_policy(policy)
+            self.post_event("policy", policy)
             return True
         return False
     
+    def register_job_start(self, job):
+        """
+        Register that a job has started running
+        
+        Args:
+            job: The started job
+        """
+        if self.journal is not None:
+            self.journal.record_start(job)
+    
     def register_job_completion(self, job):
         """
         Register that a job has completed
@@ -78,31 +281,136 @@ class Scheduler(threading.Thread):
         Args:
             job: The completed job
         """
-    
-        self.stats["completed_jobs"] += 1
         response_time = job.get_response_time()
+        waiting_time = job.get_waiting_time()
+        current_policy = self.job_queue.get_current_policy()
+        
+        if self.journal is not None:
+            self.journal.record_complete(job, current_policy)
+        # Dependents are released even if the job failed
+        ready = self.dependencies.complete(job)
+        if ready:
+            self.job_queue.add_jobs(ready)
+        self.metrics.increment("completed_jobs")
         if response_time is not None:
-            self.stats["total_response_time"] += response_time
-            
-           
-            current_policy = self.job_queue.get_current_policy()
-            self.stats["policies"][current_policy]["jobs"] += 1
-            self.stats["policies"][current_policy]["response_time"] += response_time
+            self.metrics.observe("response_time", response_time, current_policy)
+        if waiting_time is not None:
+            self.metrics.observe("waiting_time", waiting_time, current_policy)
+        if job.start_time is not None and job.end_time is not None:
+            self.metrics.observe("service_time", job.end_time - job.start_time, current_policy)
+        
+        # Only pay for the condition lock when someone is waiting
+        if self.completion_waiters:
+            with self.completion:
+                for pending in self.completion_watches:
+                    pending.discard(job.job_id)
+                self.completion.notify_all()
+        
+        self.post_event("complete", job)
+    
+    def get_blocked_jobs(self):
+        """
+        Get the jobs waiting on dependencies
+        
+        Returns:
+            List of (job, ids of unfinished dependencies) tuples, in submission order
+        """
+        return self.dependencies.get_blocked_jobs()
+    
+    def wait_for_completions(self, count, timeout=None):
+        """
+        Block until at least the given number of jobs have completed
+        
+        Args:
+            count (int): Total completed-job count to wait for
+            timeout (float): Optional timeout in seconds
+        
+        Returns:
+            True if the count was reached, False on timeout
+        """
+        with self.completion:
+            self.completion_waiters += 1
+            try:
+                return self.completion.wait_for(
+                    lambda: self.metrics.counter("completed_jobs") >= count, timeout)
+            finally:
+                self.completion_waiters -= 1
+    
+    def wait_for_jobs(self, jobs, timeout=None):
+        """
+        Block until every one of the given jobs has completed
+        
+        Args:
+            jobs: The jobs to wait for, e.g. as returned by submit_batch
+            timeout (float): Optional timeout in seconds
+        
+        Returns:
+            True if all the jobs completed, False on timeout
+        """
+        with self.completion:
+            # Counted first, so a job completing from now on is discarded below
+            self.completion_waiters += 1
+            pending = {job.job_id for job in jobs if job.status != "Completed"}
+            self.completion_watches.append(pending)
+            try:
+                return self.completion.wait_for(lambda: not pending, timeout)
+            finally:
+                self.completion_watches = [watch for watch in self.completion_watches
+                                           if watch is not pending]
+                self.completion_waiters -= 1
     
     def stop(self):
         """
         Stop the scheduler thread
         """
         self.running = False
+        self.events.put(None)
+    
+    @property
+    def stats(self):
+        """
+        Job counters merged from every thread
+        
+        Returns:
+            Dictionary with the same keys as get_performance_stats
+        """
+        return self.get_performance_stats()
     
     def get_performance_stats(self):
         """
         Get the current performance statistics
         
         Returns:
-            Dictionary with performance statistics
+            Dictionary with performance statistics, including p50/p95/p99
+            of response, waiting and service time overall and per policy
         """
-        stats = self.stats.copy()
+        counters, histograms = self.metrics.snapshot()
+        stats = {
+            "total_jobs": counters.get("total_jobs", 0),
+            "completed_jobs": counters.get("completed_jobs", 0),
+            "total_response_time": 0,
+            "policies": {},
+            "latency": {},
+        }
+        
+        for metric in ("response_time", "waiting_time", "service_time"):
+            overall = Histogram()
+            for policy in POLICIES:
+                histogram = histograms.get((metric, policy), Histogram())
+                overall.merge(histogram)
+                policy_stats = stats["policies"].setdefault(policy, {"latency": {}})
+                policy_stats["latency"][metric] = histogram.summary()
+                if metric == "response_time":
+                    policy_stats["jobs"] = histogram.count
+                    policy_stats["response_time"] = histogram.total
+                elif metric == "waiting_time":
+                    # Bounded under aging and MLFQ; unbounded growth means starvation
+                    policy_stats["max_waiting_time"] = policy_stats["latency"][metric]["max"]
+            stats["latency"][metric] = overall.summary()
+            if metric == "response_time":
+                stats["total_response_time"] = overall.total
+            elif metric == "waiting_time":
+                stats["max_waiting_time"] = stats["latency"][metric]["max"]
         
         if stats["completed_jobs"] > 0:
             stats["avg_response_time"] = stats["total_response_time"] / stats["completed_jobs"]
@@ -120,7 +428,7 @@ class Scheduler(threading.Thread):
                 stats["policies"][policy]["avg_response_time"] = 0
                 
        
-        elapsed_time = time.time() - self.start_time if hasattr(self, 'start_time') else 0
+        elapsed_time = time.time() - self.start_time if self.start_time is not None else 0
         if elapsed_time > 0:
             stats["throughput"] = stats["completed_jobs"] / elapsed_time
         else:
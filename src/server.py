@@ -0,0 +1,290 @@
+# src/server.py
+import asyncio
+import json
+
+from src.job import check_job_request
+from src.profiler import PROFILER
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5770
+
+# Longest request line accepted from a client, in bytes
+MAX_LINE = 1 << 20
+
+class JobServer:
+    def __init__(self, scheduler, job_queue, dispatcher=None):
+        """
+        Initialize the network front end
+
+        Clients send newline-delimited JSON requests such as
+        {"op": "submit", "name": "job1", "exec_time": 2, "priority": 1}
+        (optionally with "cpus" and "memory" requests and a "depends_on" list
+        of job ids) and receive one JSON response line per request, in request order.
+        Requests may be pipelined: a client can send many before reading any
+        response. Submissions arriving in the same event-loop iteration, from
+        any number of connections, are handed to the scheduler as one batch.
+
+        Args:
+            scheduler: The scheduler that jobs are submitted to
+            job_queue: The shared job queue, used for list requests
+            dispatcher: Optional dispatcher pool, used to report running jobs
+        """
+        self.scheduler = scheduler
+        self.job_queue = job_queue
+        self.dispatcher = dispatcher
+        self.server = None
+        self.pending_submits = []  # (spec, future) waiting for the next batch
+        self.handlers = {
+            "submit": self.handle_submit,
+            "list": self.handle_list,
+            "policy": self.handle_policy,
+            "stats": self.handle_stats,
+            "profile": self.handle_profile,
+        }
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        """
+        Start listening
+
+        Args:
+            host (str): Address to listen on for TCP
+            port (int): TCP port (0 picks a free port)
+            path (str): Unix socket path; if given, host and port are ignored
+
+        Returns:
+            The listening address, (host, port) for TCP or the socket path
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        return self.server.sockets[0].getsockname()
+
+    async def stop(self):
+        """
+        Stop accepting connections
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve one client connection
+
+        Requests are read and dispatched as fast as they arrive; a separate
+        task writes the responses back in order as each one completes.
+        """
+        responses = asyncio.Queue()
+        sender = asyncio.ensure_future(self._send_responses(responses, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than MAX_LINE
+                    responses.put_nowait(self._error("Request too long"))
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    responses.put_nowait(self.dispatch(line))
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            await sender
+            writer.close()
+
+    def dispatch(self, line):
+        """
+        Decode a request line and start handling it
+
+        Args:
+            line (bytes): One request line
+
+        Returns:
+            A future or coroutine producing the response dictionary
+        """
+        try:
+            request = json.loads(line)
+            handler = self.handlers[request["op"]]
+        except (ValueError, TypeError):
+            return self._error("Malformed request")
+        except KeyError:
+            return self._error("Unknown operation")
+
+        try:
+            return handler(request)
+        except (KeyError, TypeError, ValueError) as e:
+            return self._error(f"Invalid request: {e}")
+
+    def handle_submit(self, request):
+        """
+        Queue a submission for the next batch
+
+        Returns:
+            Future resolving to {"ok": True, "job_id": ...}
+        """
+        exec_time = float(request["exec_time"])
+        cpus = float(request.get("cpus", 1))
+        memory = float(request.get("memory", 0))
+        # The scheduler checks again, but rejecting here fails only this request
+        check_job_request(exec_time, cpus, memory)
+        spec = (str(request["name"]), exec_time, int(request.get("priority", 0)),
+                int(cpus), memory, [int(job_id) for job_id in request.get("depends_on", ())])
+        if any(job_id < 0 for job_id in spec[5]):
+            raise ValueError("depends_on must hold job ids")
+
+        future = asyncio.get_event_loop().create_future()
+        if not self.pending_submits:
+            # Let every request already read this iteration join the batch
+            asyncio.get_event_loop().call_soon(self._flush_submits)
+        self.pending_submits.append((spec, future))
+        return future
+
+    def handle_list(self, request):
+        """
+        Describe the running, queued and blocked jobs
+
+        The optional "limit" field caps the number of queued jobs returned.
+        """
+        jobs = self.job_queue.get_job_list()
+        limit = request.get("limit")
+        if limit is not None:
+            jobs = jobs[:int(limit)]
+        running = self.dispatcher.get_running_jobs() if self.dispatcher is not None else []
+        return self._done({
+            "ok": True,
+            "policy": self.job_queue.get_current_policy(),
+            "queue_size": self.job_queue.get_queue_size(),
+            "running": [self._describe(job) for job in running],
+            "queued": [self._describe(job) for job in jobs],
+            "blocked": [dict(self._describe(job), depends_on=depends_on)
+                        for job, depends_on in self.scheduler.get_blocked_jobs()],
+        })
+
+    def handle_policy(self, request):
+        """
+        Change the scheduling policy
+        """
+        if not self.scheduler.change_policy(request["policy"]):
+            return self._error(f"Unknown policy: {request['policy']}")
+        return self._done({"ok": True, "policy": request["policy"]})
+
+    def handle_stats(self, request):
+        """
+        Report the scheduler performance statistics
+        """
+        return self._done({"ok": True, "stats": self.scheduler.get_performance_stats()})
+
+    def handle_profile(self, request):
+        """
+        Report the profiler timings
+
+        The optional "enabled" field turns profiling on or off and the
+        optional "reset" field clears the timings first.
+        """
+        if request.get("reset"):
+            PROFILER.reset()
+        if "enabled" in request:
+            if request["enabled"]:
+                PROFILER.enable()
+            else:
+                PROFILER.disable()
+        return self._done({"ok": True, "profile": PROFILER.dump()})
+
+    def _flush_submits(self):
+        """
+        Submit every pending submission as one batch and resolve their futures
+        """
+        pending = self.pending_submits
+        self.pending_submits = []
+        try:
+            jobs = self.scheduler.submit_batch([spec for spec, _ in pending])
+        except Exception as e:
+            if isinstance(e, ValueError) and len(pending) > 1:
+                # One bad dependency rejects the whole batch; submit one by one
+                # so that it only fails its own request
+                for submit in pending:
+                    self.pending_submits = [submit]
+                    self._flush_submits()
+                return
+            for _, future in pending:
+                future.set_result({"ok": False, "error": f"Submission failed: {e}"})
+            return
+        for (_, future), job in zip(pending, jobs):
+            future.set_result({"ok": True, "job_id": job.job_id})
+
+    async def _send_responses(self, responses, writer):
+        """
+        Write responses in request order until the connection is done
+        """
+        while True:
+            response = await responses.get()
+            if response is None:
+                break
+            try:
+                writer.write(json.dumps(await response, separators=(',', ':')).encode() + b"\n")
+                # Only wait for the socket once nothing else is ready to send
+                if responses.empty():
+                    await writer.drain()
+            except ConnectionError:
+                break
+
+    def _describe(self, job):
+        return {
+            "job_id": job.job_id,
+            "name": job.name,
+            "exec_time": job.exec_time,
+            "priority": job.priority,
+            "cpus": job.cpus,
+            "memory": job.memory,
+            "arrival_time": job.arrival_time,
+            "status": job.status,
+        }
+
+    def _done(self, response):
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(response)
+        return future
+
+    def _error(self, message):
+        return self._done({"ok": False, "error": message})
+
+
+def serve(scheduler, job_queue, dispatcher=None, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """
+    Run a JobServer until interrupted
+
+    Args:
+        scheduler: The scheduler that jobs are submitted to
+        job_queue: The shared job queue
+        dispatcher: Optional dispatcher pool
+        host (str): Address to listen on for TCP
+        port (int): TCP port
+        path (str): Unix socket path to listen on instead of TCP
+    """
+    run_server(JobServer(scheduler, job_queue, dispatcher), host, port, path)
+
+
+def run_server(server, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """
+    Run a server on a new event loop until interrupted
+
+    Args:
+        server: A JobServer, or a subclass of it
+        host (str): Address to listen on for TCP
+        port (int): TCP port
+        path (str): Unix socket path to listen on instead of TCP
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        address = loop.run_until_complete(server.start(host, port, path))
+        print(f"CSUbatch server listening on {address}")
+        loop.run_forever()
+    finally:
+        loop.run_until_complete(server.stop())
+        loop.close()
@@ -0,0 +1,566 @@
+# src/shardedQueue.py
+import threading
+import time
+import heapq
+import itertools
+import math
+import os
+
+from src.job import Job
+from src.queueManager import (JobQueue, POLICY_ORDERS, PREEMPTIVE_POLICIES,
+                              DEFAULT_QUANTUM, DEFAULT_LEVEL_WAIT, BACKFILL_DEPTH)
+
+# Most jobs a worker moves into its own shard in one go, from the injector
+# or from another worker's shard
+DEFAULT_BATCH_SIZE = 32
+
+class QueueShard:
+    """One heap of (key, sequence, job) entries with its own lock"""
+
+    def __init__(self):
+        """
+        Initialize an empty shard
+        """
+        self.heap = []
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def pop_placeable(self, place, position=0):
+        """
+        Pop the first entry in key order that place accepts (caller holds the lock)
+
+        Args:
+            place: Callable place(job, position) that reserves resources for a job
+            position (int): Number of jobs turned down earlier in the same scan
+
+        Returns:
+            Tuple (entry, position) of the removed entry, or None if none of
+            the first BACKFILL_DEPTH fit, and the updated position
+        """
+        skipped = []
+        found = None
+        while self.heap and len(skipped) < BACKFILL_DEPTH:
+            entry = heapq.heappop(self.heap)
+            if place(entry[2], position + len(skipped)):
+                found = entry
+                break
+            skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self.heap, entry)
+        return found, position + len(skipped)
+
+    def peek(self):
+        """
+        Get the head entry without taking the lock
+
+        Returns:
+            The (key, sequence, job) entry at the head, or None if the shard
+            is empty. The answer may be stale by the time it is used.
+        """
+        try:
+            return self.heap[0]
+        except IndexError:
+            return None
+
+
+class ShardedJobQueue:
+    """
+    Job queue split into per-worker shards to take contention off one lock
+
+    Every thread that calls get_job is a worker and is given its own shard.
+    Jobs submitted from other threads go to a shared injector; workers move
+    them into their shard a batch at a time, and a worker whose shard and
+    the injector are both empty steals the best half of another worker's
+    shard. Submitters and workers therefore mostly take different locks,
+    and each worker takes the injector lock once per batch instead of once
+    per job.
+
+    Ordering is policy-correct within each shard. Across shards it is
+    approximate: a worker runs its own head unless the injector's head is
+    better, and shards stay short because batches are a fair share of the
+    injector. Implements the same interface as JobQueue, without a size bound.
+    """
+
+    # Same key functions and time slices as the single queue
+    _build_order_keys = JobQueue._build_order_keys
+    _time_slice = JobQueue._time_slice
+
+    def __init__(self, num_shards=None, quantum=DEFAULT_QUANTUM, aging_rate=0.0,
+                 level_wait=DEFAULT_LEVEL_WAIT, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Initialize the shards, the injector and the wakeup condition
+
+        Args:
+            num_shards (int): Number of worker shards (defaults to the CPU count);
+                workers beyond this share shards round-robin
+            quantum (float): Time slice in seconds under RR and at the top MLFQ level
+            aging_rate (float): Priority gained, and seconds of job length
+                forgiven, per second of waiting (0 disables aging)
+            level_wait (float): Waiting time in seconds that offsets one MLFQ level
+            batch_size (int): Most jobs moved into a shard per injector take or steal
+        """
+        if num_shards is None:
+            num_shards = os.cpu_count() or 1
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        if aging_rate < 0:
+            raise ValueError("aging_rate must not be negative")
+
+        self.aging_rate = aging_rate
+        self.level_wait = level_wait
+        self.epoch = None  # arrival time of the first job, keeps aged keys small
+        self.order_keys = self._build_order_keys()
+        self.shards = [QueueShard() for _ in range(num_shards)]
+        self.injector = QueueShard()
+        self.batch_size = batch_size
+        self.sequence = itertools.count()
+        self.shard_ids = itertools.count()
+        self.local = threading.local()
+        # Guards the policy, quantum and closed flag; idle workers wait on it
+        self.mutex = threading.Lock()
+        self.not_empty = threading.Condition(self.mutex)
+        self.sleepers = 0
+        # Replaced with a fresh value whenever jobs are added or resources freed
+        self.generations = itertools.count()
+        self.generation = next(self.generations)
+        self.current_policy = "FCFS"  # Default policy
+        # Counts policy changes, so holders of taken jobs can tell the order changed
+        self.policy_version = 0
+        self.quantum = quantum
+        self.closed = False
+
+    def add_job(self, job):
+        """
+        Add a job to the caller's shard, or to the injector if the caller is not a worker
+
+        Args:
+            job: The job to be added
+        """
+        if job.arrival_time is None:
+            job.arrival_time = time.time()
+        if self.epoch is None:
+            self._set_epoch(job.arrival_time)
+
+        shard = getattr(self.local, "shard", None)
+        self._push(shard if shard is not None else self.injector, [job])
+        self._wake(1)
+
+    def add_jobs(self, jobs):
+        """
+        Add many jobs to the injector under a single lock acquisition
+
+        Args:
+            jobs: Iterable of jobs to be added
+
+        Returns:
+            Number of jobs added
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return 0
+
+        now = time.time()
+        for job in jobs:
+            if job.arrival_time is None:
+                job.arrival_time = now
+        if self.epoch is None:
+            self._set_epoch(jobs[0].arrival_time)
+
+        self._push(self.injector, jobs)
+        self._wake(len(jobs))
+        return len(jobs)
+
+    def requeue(self, job, slice_time=0.0):
+        """
+        Put a preempted job back in the caller's shard
+
+        Under MLFQ, a job that used up its whole time slice moves down a level.
+
+        Args:
+            job: The partially-run job
+            slice_time (float): Seconds the job ran since it last started or resumed
+        """
+        with self.mutex:
+            if self.current_policy == "MLFQ":
+                time_slice = self._time_slice(job)
+                if time_slice is not None and slice_time >= time_slice:
+                    job.level += 1
+
+        shard = getattr(self.local, "shard", None)
+        self._push(shard if shard is not None else self.injector, [job])
+        self._wake(1)
+
+    def should_preempt(self, job, slice_time):
+        """
+        Check whether a running job should give up its worker
+
+        Only the caller's shard and the injector are considered, so a better
+        job queued on another worker's shard does not preempt this one.
+
+        Args:
+            job: The running job, with remaining_time up to date
+            slice_time (float): Seconds the job has run since it last started or resumed
+
+        Returns:
+            True if the current policy is preemptive and a nearby queued job
+            should run instead, or, under RR and MLFQ, the job's time slice
+            is used up and another job waits
+        """
+        with self.mutex:
+            policy = self.current_policy
+            time_slice = self._time_slice(job)
+        if policy not in PREEMPTIVE_POLICIES or not self._has_jobs():
+            return False
+        if time_slice is not None and slice_time >= time_slice:
+            return True
+        if policy == "RR":
+            return False
+
+        head = self._best_head(getattr(self.local, "shard", None))
+        return head is not None and head[0] < self.order_keys[POLICY_ORDERS[policy]](job)
+
+    def get_time_slice(self, job):
+        """
+        Get how long a job may run while others wait under the current policy
+
+        Args:
+            job: The job about to run
+
+        Returns:
+            The time slice in seconds, or None if the job is not time-sliced
+        """
+        with self.mutex:
+            return self._time_slice(job)
+
+    def set_quantum(self, quantum):
+        """
+        Set the RR time slice
+
+        Args:
+            quantum (float): Time slice in seconds
+        """
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+        with self.mutex:
+            self.quantum = quantum
+
+    def get_job(self, place=None, block=True):
+        """
+        Get the next job for the calling worker (consumer operation)
+
+        The worker's own shard is served first unless the injector's head
+        is better; an empty shard is refilled from the injector, then by
+        stealing. Blocks until a job is available or the queue is closed.
+
+        Args:
+            place: Optional callable place(job, position) that reserves
+                resources for a job and returns a false value if the job may
+                not start yet; each shard is then searched BACKFILL_DEPTH
+                jobs deep, with positions counted across the whole search
+            block (bool): Whether to wait for a job; if False, None is
+                returned at once when no job can be handed out
+
+        Returns:
+            The next job or None if the queue is closed and empty
+        """
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = self.shards[next(self.shard_ids) % len(self.shards)]
+
+        while True:
+            generation = self.generation
+            if place is None:
+                job = self._next_job(shard)
+            else:
+                job = self._next_placeable(shard, place)
+            if job is not None or not block:
+                return job
+
+            with self.not_empty:
+                # Count ourselves before re-checking, so a producer that
+                # pushes after the check is sure to see a sleeper and notify
+                self.sleepers += 1
+                try:
+                    while not self._has_jobs() or (place is not None and
+                                                   self.generation == generation):
+                        if self.closed and not self._has_jobs():
+                            return None
+                        self.not_empty.wait()
+                finally:
+                    self.sleepers -= 1
+
+    def get_jobs(self, max_jobs, accept=None, share=1):
+        """
+        Take up to max_jobs more jobs from the calling worker's shard without blocking
+
+        Jobs are taken in key order while they beat the injector's head,
+        stopping at the first one accept turns down.
+
+        Args:
+            max_jobs (int): Most jobs to take
+            accept: Optional callable accept(job) returning a false value for
+                a job that may not join the batch
+            share (int): Take at most 1/share of the queued jobs, leaving
+                the rest to the other consumers
+
+        Returns:
+            List of jobs in key order, possibly empty
+        """
+        shard = getattr(self.local, "shard", None)
+        jobs = []
+        if shard is None:
+            return jobs
+        max_jobs = min(max_jobs, self.get_queue_size() // share)
+        injected = self.injector.peek()
+        with shard.lock:
+            heap = shard.heap
+            while len(jobs) < max_jobs and heap:
+                if injected is not None and heap[0][:2] > injected[:2]:
+                    break
+                if accept is not None and not accept(heap[0][2]):
+                    break
+                jobs.append(heapq.heappop(heap)[2])
+        return jobs
+
+    def wake(self):
+        """
+        Wake every blocked consumer, after resources were released
+        """
+        self.generation = next(self.generations)
+        if self.sleepers:
+            with self.not_empty:
+                self.not_empty.notify_all()
+
+    def reorder_queue(self, policy):
+        """
+        Switch the queue to the given policy
+
+        Each shard is re-keyed under its own lock, in O(n) overall.
+
+        Args:
+            policy (str): The scheduling policy to use
+        """
+        if policy not in POLICY_ORDERS:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+
+        with self.mutex:
+            self.current_policy = policy
+            self.policy_version += 1
+            key = self.order_keys[POLICY_ORDERS[policy]]
+            for shard in [self.injector] + self.shards:
+                with shard.lock:
+                    shard.heap[:] = [(key(job), seq, job) for _, seq, job in shard.heap]
+                    heapq.heapify(shard.heap)
+
+    def close(self):
+        """
+        Close the queue and wake every blocked consumer
+
+        Consumers drain any remaining jobs and then get None from get_job.
+        """
+        with self.mutex:
+            self.closed = True
+            self.not_empty.notify_all()
+
+    def get_job_list(self):
+        """
+        Get a list of all jobs in the queue
+
+        Returns:
+            List of jobs in policy order across every shard, which is the
+            order they would run in if no shard ran ahead of the others
+        """
+        entries = []
+        for shard in [self.injector] + self.shards:
+            with shard.lock:
+                entries.extend(shard.heap)
+        entries.sort(key=lambda entry: entry[:2])
+        return [entry[2] for entry in entries]
+
+    def get_work_ahead(self, exec_time, priority=0, arrival_time=None):
+        """
+        Get the queued work a new job would wait behind under the current policy
+
+        Args:
+            exec_time (float): Execution time of the prospective job
+            priority (int): Priority of the prospective job
+            arrival_time (float): Arrival time of the prospective job (defaults to now)
+
+        Returns:
+            Total remaining time of the queued jobs that sort before it, in O(n)
+        """
+        job = Job(None, exec_time, priority)
+        job.arrival_time = time.time() if arrival_time is None else arrival_time
+        if self.epoch is None:
+            return 0.0
+
+        with self.mutex:
+            key = self.order_keys[POLICY_ORDERS[self.current_policy]](job)
+        total = 0.0
+        for shard in [self.injector] + self.shards:
+            with shard.lock:
+                total += sum(entry[2].remaining_time for entry in shard.heap
+                             if entry[:2] < (key, math.inf))
+        return total
+
+    def get_queue_size(self):
+        """
+        Get the current size of the queue
+
+        Returns:
+            Number of jobs in the queue
+        """
+        return len(self.injector) + sum(len(shard) for shard in self.shards)
+
+    def get_current_policy(self):
+        """
+        Get the current scheduling policy
+
+        Returns:
+            Current policy name
+        """
+        with self.mutex:
+            return self.current_policy
+
+    def _push(self, shard, jobs):
+        """
+        Push jobs onto a shard keyed by the current policy
+
+        Args:
+            shard: The shard to push onto
+            jobs: List of jobs to push
+        """
+        with shard.lock:
+            # Read under the shard lock so a concurrent reorder_queue either
+            # re-keys these entries or has already switched the key
+            key = self.order_keys[POLICY_ORDERS[self.current_policy]]
+            heap = shard.heap
+            if len(jobs) * 4 >= len(heap):
+                heap.extend((key(job), next(self.sequence), job) for job in jobs)
+                heapq.heapify(heap)
+            else:
+                for job in jobs:
+                    heapq.heappush(heap, (key(job), next(self.sequence), job))
+
+    def _next_job(self, shard):
+        """
+        Take the calling worker's next job without blocking
+
+        Args:
+            shard: The worker's own shard
+
+        Returns:
+            The job to run, or None if every shard and the injector were empty
+        """
+        with shard.lock:
+            if shard.heap:
+                injected = self.injector.peek()
+                if injected is None or shard.heap[0][:2] < injected[:2]:
+                    return heapq.heappop(shard.heap)[2]
+
+        # Take a fair share of the injector, so every worker gets some
+        job = self._take(self.injector, shard, len(self.injector) // len(self.shards))
+        if job is not None:
+            return job
+
+        with shard.lock:
+            if shard.heap:
+                return heapq.heappop(shard.heap)[2]
+
+        # Steal the best half of the first non-empty shard after our own
+        start = self.shards.index(shard)
+        for victim in self.shards[start + 1:] + self.shards[:start]:
+            job = self._take(victim, shard, (len(victim) + 1) // 2)
+            if job is not None:
+                return job
+        return None
+
+    def _next_placeable(self, shard, place):
+        """
+        Take the best job that place accepts from the caller's shard, the
+        injector or another worker's shard, in that order, without blocking
+
+        Args:
+            shard: The worker's own shard
+            place: Callable that reserves resources for a job
+
+        Returns:
+            The job to run, or None if no job fits
+        """
+        start = self.shards.index(shard)
+        position = 0
+        for source in [shard, self.injector] + self.shards[start + 1:] + self.shards[:start]:
+            with source.lock:
+                entry, position = source.pop_placeable(place, position)
+            if entry is not None:
+                return entry[2]
+        return None
+
+    def _take(self, source, shard, count):
+        """
+        Move the best jobs of another shard into the caller's shard
+
+        The two locks are never held together, so takes cannot deadlock.
+
+        Args:
+            source: The injector or the shard to steal from
+            shard: The caller's shard
+            count (int): Number of jobs wanted, capped at batch_size
+
+        Returns:
+            The best job taken, for the caller to run, or None if source was empty
+        """
+        count = max(1, min(count, self.batch_size))
+        with source.lock:
+            taken = [heapq.heappop(source.heap) for _ in range(min(count, len(source.heap)))]
+        if not taken:
+            return None
+
+        if len(taken) > 1:
+            with shard.lock:
+                # Entries keep their keys and sequence numbers
+                for entry in taken[1:]:
+                    heapq.heappush(shard.heap, entry)
+            # Let an idle worker steal what we cannot run yet
+            self._wake(1)
+        return taken[0][2]
+
+    def _best_head(self, shard):
+        """
+        Get the better of a shard's head and the injector's head
+
+        Args:
+            shard: The caller's shard, or None
+
+        Returns:
+            The (key, sequence, job) entry, or None if both are empty
+        """
+        heads = [head for head in (self.injector.peek(), shard.peek() if shard else None)
+                 if head is not None]
+        return min(heads, key=lambda entry: entry[:2]) if heads else None
+
+    def _has_jobs(self):
+        return bool(len(self.injector)) or any(len(shard) for shard in self.shards)
+
+    def _wake(self, count):
+        """
+        Wake up to count idle workers, if there are any
+
+        Args:
+            count (int): Number of jobs that became available
+        """
+        self.generation = next(self.generations)
+        if self.sleepers:
+            with self.not_empty:
+                self.not_empty.notify(count)
+
+    def _set_epoch(self, arrival_time):
+        with self.mutex:
+            if self.epoch is None:
+                self.epoch = arrival_time
@@ -1,8 +1,11 @@
 # src/ui.py
 import cmd
+import sys
 import time
 import random
-from src.job import Job
+from src.job import Job, check_job_request
+from src.queueManager import POLICIES
+from src.profiler import PROFILER
 
 class CSUbatchUI(cmd.Cmd):
     """Command-line interface for CSUbatch scheduling system"""
@@ -19,7 +22,7 @@ Type 'help' to see available commands.
         
         Args:
             scheduler: The scheduler thread
-            dispatcher: The dispatcher thread
+            dispatcher: The dispatcher pool
             job_queue: The shared job queue
         """
         super().__init__()
@@ -32,12 +35,19 @@ Type 'help' to see available commands.
         Show help information
         """
         print("\nCSUbatch Help:")
-        print("  run <job_name> <cpu_time> <priority>: Submit a job")
+        print("  run <job_name> <cpu_time> <priority> [cpus] [memory_mb] [after=<id>,...]: Submit a job")
+        print("  runbatch <file>: Submit every job listed in a file ('-' for stdin)")
+        print("  replay <trace> [time_scale]: Submit the jobs of an SWF trace or CSV job log as they arrive")
         print("  list: Display the job queue")
         print("  fcfs: Change the scheduling policy to FCFS")
         print("  sjf: Change the scheduling policy to SJF")
         print("  priority: Change the scheduling policy to Priority")
+        print("  srtf: Change the scheduling policy to preemptive Shortest Remaining Time First")
+        print("  ppriority: Change the scheduling policy to preemptive Priority")
+        print("  rr [quantum]: Change the scheduling policy to Round Robin")
+        print("  mlfq: Change the scheduling policy to Multilevel Feedback Queue")
         print("  performance: Run automated performance test")
+        print("  profile [on|off|reset|dump [file]]: Show or control hot-path timings")
         print("  test <benchmark> <policy> <num_jobs> <priority_levels> <min_cpu> <max_cpu>: "
               "Run automated performance test")
         print("  quit: Exit CSUbatch")
@@ -47,33 +57,167 @@ Type 'help' to see available commands.
         """
         Submit a job
         
-        Format: run <job_name> <cpu_time> <priority>
+        Format: run <job_name> <cpu_time> <priority> [cpus] [memory_mb] [after=<id>,...]
+        The job waits until the jobs with the given ids have completed.
         """
-        args = arg.split()
+        try:
+            args, depends_on = self._split_dependencies(arg.split())
+        except ValueError:
+            print("Error: Invalid parameters")
+            print("Usage: run <job_name> <cpu_time> [priority] [cpus] [memory_mb] [after=<id>,...]")
+            return
         if len(args) < 2:
             print("Error: Missing parameters")
-            print("Usage: run <job_name> <cpu_time> [priority]")
+            print("Usage: run <job_name> <cpu_time> [priority] [cpus] [memory_mb] [after=<id>,...]")
             return
         
         try:
             job_name = args[0]
             cpu_time = float(args[1])
             priority = int(args[2]) if len(args) > 2 else 0
+            cpus = int(args[3]) if len(args) > 3 else 1
+            memory = float(args[4]) if len(args) > 4 else 0
+            check_job_request(cpu_time, cpus, memory)
            
-            job = self.scheduler.submit_job(job_name, cpu_time, priority)
+            expected_wait = self._calculate_expected_waiting_time(cpu_time, priority)
+            job = self.scheduler.submit_job(job_name, cpu_time, priority, cpus=cpus, memory=memory,
+                                            depends_on=depends_on)
             
            
             queue_size = self.job_queue.get_queue_size()
             policy = self.job_queue.get_current_policy()
             
-            print(f"\nJob {job_name} was submitted.")
+            print(f"\nJob {job_name} was submitted with id {job.job_id}.")
+            if depends_on:
+                print(f"Blocked until these jobs complete: {', '.join(map(str, depends_on))}")
             print(f"Total number of jobs in the queue: {queue_size}")
-            print(f"Expected waiting time: {self._calculate_expected_waiting_time(job):.2f} seconds")
+            print(f"Expected waiting time: {expected_wait:.2f} seconds")
             print(f"Scheduling Policy: {policy}\n")
             
         except ValueError:
             print("Error: Invalid parameters")
-            print("Usage: run <job_name> <cpu_time> [priority]")
+            print("Usage: run <job_name> <cpu_time> [priority] [cpus] [memory_mb] [after=<id>,...]")
+    
+    def do_runbatch(self, arg):
+        """
+        Submit every job listed in a file
+        
+        Format: runbatch <file>
+        Each line holds "<job_name> <cpu_time> [priority [cpus [memory_mb]]] [after=<id>,...]";
+        blank lines and lines starting with '#' are ignored. Use '-' to read from stdin.
+        """
+        path = arg.strip()
+        if not path:
+            print("Error: Missing parameters")
+            print("Usage: runbatch <file>")
+            return
+        
+        try:
+            stream = sys.stdin if path == "-" else open(path)
+        except OSError as e:
+            print(f"Error: Cannot open {path}: {e}")
+            return
+        
+        start_time = time.time()
+        try:
+            submitted = self.scheduler.submit_jobs(self._parse_job_specs(stream))
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        elapsed_time = time.time() - start_time
+        
+        print(f"\n{submitted} jobs were submitted in {elapsed_time * 1000:.1f} ms.")
+        print(f"Total number of jobs in the queue: {self.job_queue.get_queue_size()}")
+        print(f"Scheduling Policy: {self.job_queue.get_current_policy()}\n")
+    
+    def do_replay(self, arg):
+        """
+        Submit the jobs of a trace at their arrival times
+        
+        Format: replay <trace> [time_scale]
+        The trace is an SWF file (.swf or .swf.gz) or a CSV job log, streamed
+        as it is replayed. time_scale shrinks arrival and CPU times alike.
+        """
+        from performance.workload import open_workload, replay
+        
+        args = arg.split()
+        if not args:
+            print("Error: Missing parameters")
+            print("Usage: replay <trace> [time_scale]")
+            return
+        
+        try:
+            time_scale = float(args[1]) if len(args) > 1 else 1.0
+            if time_scale <= 0:
+                raise ValueError
+        except ValueError:
+            print(f"Error: Invalid time scale '{args[1]}'")
+            return
+        
+        print(f"\nReplaying {args[0]} at {time_scale}x time...")
+        start_time = time.time()
+        try:
+            submitted = replay(open_workload(args[0]), self.scheduler, time_scale)
+        except OSError as e:
+            print(f"Error: Cannot open {args[0]}: {e}")
+            return
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        elapsed_time = time.time() - start_time
+        
+        print(f"\n{submitted} jobs were submitted over {elapsed_time:.2f} seconds.")
+        print(f"Total number of jobs in the queue: {self.job_queue.get_queue_size()}")
+        print(f"Scheduling Policy: {self.job_queue.get_current_policy()}\n")
+    
+    def _parse_job_specs(self, lines):
+        """
+        Parse job specifications lazily, skipping and reporting invalid lines
+        
+        Args:
+            lines: Iterable of "<job_name> <cpu_time> [priority [cpus [memory_mb]]] [after=<id>,...]"
+                lines
+            
+        Yields:
+            (name, cpu_time, priority, cpus, memory, depends_on) tuples
+        """
+        for line_number, line in enumerate(lines, 1):
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                fields, depends_on = self._split_dependencies(fields)
+                if len(fields) < 2:
+                    raise ValueError
+                cpu_time = float(fields[1])
+                cpus = int(fields[3]) if len(fields) > 3 else 1
+                memory = float(fields[4]) if len(fields) > 4 else 0
+                check_job_request(cpu_time, cpus, memory)
+                yield (fields[0], cpu_time, int(fields[2]) if len(fields) > 2 else 0,
+                       cpus, memory, depends_on)
+            except ValueError:
+                print(f"Warning: Skipping invalid line {line_number}: {line.strip()}")
+    
+    def _split_dependencies(self, fields):
+        """
+        Separate the "after=<id>,..." field from the other fields of a job
+        
+        Args:
+            fields: List of fields
+        
+        Returns:
+            Tuple (remaining fields, list of job ids)
+        
+        Raises:
+            ValueError: If a job id is not an integer
+        """
+        remaining, depends_on = [], []
+        for field in fields:
+            if field.startswith("after="):
+                depends_on.extend(int(job_id) for job_id in field[len("after="):].split(",") if job_id)
+            else:
+                remaining.append(field)
+        return remaining, depends_on
     
     def do_list(self, arg):
         """
@@ -82,25 +226,37 @@ Type 'help' to see available commands.
         jobs = self.job_queue.get_job_list()
         queue_size = len(jobs)
         policy = self.job_queue.get_current_policy()
+        running_jobs = self.dispatcher.get_running_jobs()
+        # Taken from the queue by a worker, to run after its current job
+        leased_jobs = self.dispatcher.get_leased_jobs()
+        blocked_jobs = self.scheduler.get_blocked_jobs()
         
         print(f"\nTotal number of jobs in the queue: {queue_size}")
+        print(f"Leased jobs: {len(leased_jobs)}")
+        print(f"Blocked jobs: {len(blocked_jobs)}")
         print(f"Scheduling Policy: {policy}")
+        print(f"Running jobs: {len(running_jobs)} of {self.dispatcher.get_num_workers()} workers")
+        if self.dispatcher.resources is not None:
+            usage = self.dispatcher.resources.get_usage()
+            print(f"Resources in use: {usage['used_cpus']} of {usage['total_cpus']} CPUs, "
+                  f"{usage['used_memory']:.0f} of {usage['total_memory']:.0f} MB")
         
-        if queue_size > 0:
+        if queue_size > 0 or running_jobs or leased_jobs or blocked_jobs:
             print("\nName\tCPU_Time\tPri\tArrival_Time\t\tStatus")
             print("-------------------------------------------------------------------")
             
-           
-            current_job = self.dispatcher.get_current_job()
-            
-            
-            if current_job:
-                self._print_job_info(current_job, is_running=True)
+            for running_job in running_jobs:
+                self._print_job_info(running_job, is_running=True)
                 
+            for job in leased_jobs:
+                self._print_job_info(job, is_leased=True)
            
             for job in jobs:
                 self._print_job_info(job)
             
+            for job, depends_on in blocked_jobs:
+                self._print_job_info(job, depends_on=depends_on)
+            
         print("")
     
     def do_fcfs(self, arg):
@@ -124,6 +280,42 @@ Type 'help' to see available commands.
         self.scheduler.change_policy("Priority")
         print("\nScheduling policy is switched to Priority.\n")
     
+    def do_srtf(self, arg):
+        """
+        Change the scheduling policy to SRTF
+        """
+        self.scheduler.change_policy("SRTF")
+        print("\nScheduling policy is switched to SRTF.\n")
+    
+    def do_ppriority(self, arg):
+        """
+        Change the scheduling policy to PreemptivePriority
+        """
+        self.scheduler.change_policy("PreemptivePriority")
+        print("\nScheduling policy is switched to PreemptivePriority.\n")
+    
+    def do_rr(self, arg):
+        """
+        Change the scheduling policy to RR
+        
+        Format: rr [quantum]
+        """
+        if arg.strip():
+            try:
+                self.job_queue.set_quantum(float(arg))
+            except ValueError:
+                print("Error: Quantum must be a positive number")
+                return
+        self.scheduler.change_policy("RR")
+        print(f"\nScheduling policy is switched to RR (quantum: {self.job_queue.quantum} seconds).\n")
+    
+    def do_mlfq(self, arg):
+        """
+        Change the scheduling policy to MLFQ
+        """
+        self.scheduler.change_policy("MLFQ")
+        print("\nScheduling policy is switched to MLFQ.\n")
+    
     def do_test(self, arg):
         """
         Run automated performance test
@@ -144,7 +336,7 @@ Type 'help' to see available commands.
             min_cpu = float(args[4])
             max_cpu = float(args[5])
             
-            if policy not in ["FCFS", "SJF", "Priority"]:
+            if policy not in POLICIES:
                 print(f"Error: Unknown policy '{policy}'")
                 return
             
@@ -156,26 +348,19 @@ Type 'help' to see available commands.
             
             start_time = time.time()
             
-            # Submit jobs
-            for i in range(num_jobs):
-               
-                cpu_time = min_cpu + random.random() * (max_cpu - min_cpu)
-                
-                
-                priority = random.randint(1, priority_levels) if policy == "Priority" else 0
-                
-           
-                job_name = f"{benchmark}_{i+1}"
-                self.scheduler.submit_job(job_name, cpu_time, priority)
-                
-                # Sleep briefly to avoid overwhelming the system
-                time.sleep(0.01)
+            # Submit all jobs through the bulk path
+            specs = [
+                (f"{benchmark}_{i+1}",
+                 min_cpu + random.random() * (max_cpu - min_cpu),
+                 random.randint(1, priority_levels) if "Priority" in policy else 0)
+                for i in range(num_jobs)
+            ]
+            jobs = self.scheduler.submit_batch(specs)
             
             print(f"All {num_jobs} jobs submitted. Test running...")
             
-            # Wait for jobs to complete
-            while self.scheduler.stats["completed_jobs"] < num_jobs:
-                time.sleep(0.1)
+            # Wait for this test's jobs, whatever else completes meanwhile
+            self.scheduler.wait_for_jobs(jobs)
             
             # Calculate test results
             elapsed_time = time.time() - start_time
@@ -209,12 +394,16 @@ Type 'help' to see available commands.
             print(f"Throughput: {stats['throughput']:.2f} jobs per second")
             
             print("\nScheduling Policy Statistics:")
-            for policy in ["FCFS", "SJF", "Priority"]:
+            for policy in stats['policies']:
                 policy_stats = stats['policies'][policy]
                 if policy_stats['jobs'] > 0:
                     print(f"  {policy}:")
                     print(f"    Jobs completed: {policy_stats['jobs']}")
                     print(f"    Average turnaround time: {policy_stats['avg_response_time']:.2f} seconds")
+                    response = policy_stats['latency']['response_time']
+                    print(f"    Turnaround p50/p95/p99: {response['p50']:.2f} / "
+                          f"{response['p95']:.2f} / {response['p99']:.2f} seconds")
+                    print(f"    Maximum waiting time: {policy_stats['max_waiting_time']:.2f} seconds")
         
         print("\nThank you for using CSUbatch!\n")
         
@@ -224,6 +413,47 @@ Type 'help' to see available commands.
         
         return True
     
+    def do_profile(self, arg):
+        """
+        Show or control the in-process profiler
+        
+        Format: profile [on|off|reset|dump [file]]
+        Without arguments, prints a histogram summary of every timing,
+        largest total first. "dump" writes every timing as JSON to the file,
+        or prints it.
+        """
+        args = arg.split()
+        action = args[0] if args else None
+        
+        if action is None:
+            print()
+            for line in PROFILER.report():
+                print(line)
+            print()
+        elif action == "on":
+            PROFILER.enable()
+            print("\nProfiling is on.\n")
+        elif action == "off":
+            PROFILER.disable()
+            print("\nProfiling is off.\n")
+        elif action == "reset":
+            PROFILER.reset()
+            print("\nProfile timings were cleared.\n")
+        elif action == "dump":
+            if len(args) < 2:
+                print(PROFILER.dumps())
+                return
+            try:
+                with open(args[1], "w") as f:
+                    f.write(PROFILER.dumps())
+            except OSError as e:
+                print(f"Error: Cannot write {args[1]}: {e}")
+                return
+            print(f"\nProfile written to {args[1]}\n")
+        else:
+            print(f"Error: Unknown profile action '{action}'")
+            print("Usage: profile [on|off|reset|dump [file]]")
+    
     def do_performance(self, arg):
         """
         Run automated performance test in performance/test_runner.py
@@ -233,55 +463,58 @@ Type 'help' to see available commands.
         
             
 
-    def _calculate_expected_waiting_time(self, job):
+    def _calculate_expected_waiting_time(self, exec_time, priority=0):
         """
-        Calculate the expected waiting time for a job
+        Calculate the expected waiting time for a job about to be submitted
         
         Args:
-            job: The job to calculate waiting time for
+            exec_time: Execution time of the new job
+            priority: Priority of the new job
             
         Returns:
             Expected waiting time in seconds
         """
-     
-        jobs = self.job_queue.get_job_list()
+        # Queued work that would run before the new job, in O(log n)
+        waiting_time = self.job_queue.get_work_ahead(exec_time, priority)
         
         
-        policy = self.job_queue.get_current_policy()
-        
-        waiting_time = 0
-        
-        
-        current_job = self.dispatcher.get_current_job()
-        if current_job:
-           
-            elapsed = time.time() - current_job.start_time
-            remaining = max(0, current_job.exec_time - elapsed)
+        for running_job in self.dispatcher.get_running_jobs():
+            if running_job.remaining_time < running_job.exec_time:
+                # Preemptible runs keep remaining_time current
+                remaining = running_job.remaining_time
+            else:
+                elapsed = time.time() - running_job.start_time
+                remaining = max(0, running_job.exec_time - elapsed)
             waiting_time += remaining
         
-       
-        for queue_job in jobs:
-            if policy == "FCFS" and queue_job.arrival_time <= job.arrival_time:
-                waiting_time += queue_job.exec_time
-            elif policy == "SJF" and queue_job.exec_time <= job.exec_time:
-                waiting_time += queue_job.exec_time
-            elif policy == "Priority" and queue_job.priority >= job.priority:
-                waiting_time += queue_job.exec_time
+        # Leased jobs left the queue but still run before the new job
+        for leased_job in self.dispatcher.get_leased_jobs():
+            waiting_time += leased_job.remaining_time
         
-        return waiting_time
+        # Work ahead of the job is shared across all dispatcher workers
+        return waiting_time / self.dispatcher.get_num_workers()
     
-    def _print_job_info(self, job, is_running=False):
+    def _print_job_info(self, job, is_running=False, depends_on=None, is_leased=False):
         """
         Print job information
         
         Args:
             job: The job to print information for
             is_running: Whether the job is currently running
+            depends_on: Ids of the unfinished jobs a blocked job waits for
+            is_leased: Whether a worker has leased the job but not started it
         """
     
         arrival_time = time.strftime("%H:%M:%S", time.localtime(job.arrival_time)) if job.arrival_time else "N/A"
         
 
-        status = "Run" if is_running else job.status
+        if is_running:
+            status = "Run"
+        elif is_leased:
+            status = "Leased"
+        else:
+            status = job.status
+        if depends_on:
+            status += f" (after {','.join(map(str, depends_on))})"
         
         print(f"{job.name}\t{job.exec_time:.2f}\t\t{job.priority}\t{arrival_time}\t\t{status}")
\ No newline at end of file
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.analysis import (analyze_by_policy, analyze_run, confidence_interval, load_columns,
+                                  summarize, to_column)
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.result = {
+            "policy": "SJF",
+            "arrival_times": [0.0, 0.0, 0.0],
+            "start_times": [0.0, 2.0, 7.0],
+            "end_times": [2.0, 7.0, 15.0],
+            "exec_times": [2.0, 5.0, 8.0],
+            "response_times": [2.0, 7.0, 15.0],
+        }
+    
+    def test_summarize(self):
+        """Test summary statistics of a column"""
+        summary = summarize(to_column([1.0, 2.0, 3.0, 4.0, 5.0]))
+        
+        self.assertEqual(summary["count"], 5)
+        self.assertAlmostEqual(summary["mean"], 3.0)
+        self.assertAlmostEqual(summary["max"], 5.0)
+        self.assertAlmostEqual(summary["p50"], 3.0)
+        self.assertAlmostEqual(summary["p95"], 4.8)
+        self.assertAlmostEqual(summary["fairness"], 225.0 / (5 * 55.0))
+    
+    def test_summarize_empty(self):
+        """Test summarizing an empty column"""
+        summary = summarize(to_column([]))
+        self.assertEqual(summary["count"], 0)
+        self.assertEqual(summary["p99"], 0)
+    
+    def test_load_columns(self):
+        """Test deriving waiting, turnaround and slowdown columns"""
+        columns = load_columns(self.result)
+        
+        self.assertEqual(list(columns["waiting_time"]), [0.0, 2.0, 7.0])
+        self.assertEqual(list(columns["turnaround_time"]), [2.0, 7.0, 15.0])
+        self.assertEqual(list(columns["service_time"]), [2.0, 5.0, 8.0])
+        self.assertEqual(list(columns["slowdown"]), [1.0, 1.4, 1.875])
+    
+    def test_legacy_results(self):
+        """Test that results with only response times still load"""
+        metrics = analyze_run({"policy": "FCFS", "response_times": [1.0, 3.0]})
+        
+        self.assertEqual(list(metrics), ["turnaround_time"])
+        self.assertAlmostEqual(metrics["turnaround_time"]["mean"], 2.0)
+    
+    def test_analyze_by_policy(self):
+        """Test that runs of the same policy are pooled"""
+        metrics = analyze_by_policy([self.result, self.result])
+        
+        self.assertEqual(list(metrics), ["SJF"])
+        self.assertEqual(metrics["SJF"]["turnaround_time"]["count"], 6)
+        self.assertAlmostEqual(metrics["SJF"]["waiting_time"]["mean"], 3.0)
+    
+    def test_confidence_interval(self):
+        """Test the t-based 95% confidence interval of a mean"""
+        mean, half_width = confidence_interval([1.0, 2.0, 3.0, 4.0])
+        
+        self.assertAlmostEqual(mean, 2.5)
+        # t(3) = 3.182, sample standard deviation sqrt(5/3)
+        self.assertAlmostEqual(half_width, 3.182 * (5 / 3) ** 0.5 / 2)
+        self.assertEqual(confidence_interval([4.0]), (4.0, None))
+        # Between table entries the wider interval of fewer degrees is used
+        self.assertAlmostEqual(confidence_interval([0.0, 1.0] * 7)[1],
+                               2.179 * (14 / 13 * 0.25) ** 0.5 / 14 ** 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
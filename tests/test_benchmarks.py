@@ -0,0 +1,34 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.memory_benchmark import run_memory_benchmark
+from performance.queue_benchmark import measure_add_pop
+
+class TestBenchmarks(unittest.TestCase):
+    """Run the benchmarks on tiny inputs so they keep working as the queue changes"""
+
+    def test_memory_benchmark(self):
+        """Test that every job representation can be measured queued and unqueued"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_memory_benchmark(200)
+
+        self.assertEqual(len(results), 2)
+        for per_job, per_queued_job in results.values():
+            self.assertGreater(per_job, 0)
+            self.assertGreater(per_queued_job, per_job)
+
+    def test_add_pop_benchmark(self):
+        """Test that the add/get benchmark drains the queue under every ordering"""
+        for policy in ("FCFS", "SJF", "Priority", "RR", "MLFQ"):
+            result = measure_add_pop(500, policy)
+            self.assertEqual(result["num_jobs"], 500)
+            self.assertGreater(result["add_time"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
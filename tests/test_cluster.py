@@ -0,0 +1,133 @@
+import unittest
+import asyncio
+import threading
+import subprocess
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.cluster import Coordinator, WorkerAgent
+from src.client import JobClient
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class RecordingExecutor:
+    """Sleep through each job and record which jobs ran"""
+
+    preemptible = False
+
+    def __init__(self):
+        self.job_ids = []
+
+    def execute(self, job):
+        time.sleep(job.exec_time)
+        self.job_ids.append(job.job_id)
+
+    def shutdown(self):
+        pass
+
+
+class TestCluster(unittest.TestCase):
+    def setUp(self):
+        """Start a coordinator on a free port in a background event loop"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.coordinator = Coordinator(self.scheduler, self.job_queue, lease_timeout=0.5)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.port = asyncio.run_coroutine_threadsafe(
+            self.coordinator.start("127.0.0.1", 0), self.loop).result(10)[1]
+        self.agents = []
+
+    def tearDown(self):
+        """Stop the agents, the coordinator and its event loop"""
+        for agent in self.agents:
+            agent.stop()
+        for agent in self.agents:
+            agent.join()
+        asyncio.run_coroutine_threadsafe(self.coordinator.stop(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def start_agent(self, name, cpus=1):
+        """Start an in-process agent with a recording executor"""
+        agent = WorkerAgent(port=self.port, name=name, cpus=cpus, memory=1024,
+                            executor=RecordingExecutor())
+        agent.start()
+        self.agents.append(agent)
+        return agent
+
+    def test_agents_share_work(self):
+        """Test that jobs are spread over every agent and each runs once"""
+        first, second = self.start_agent("first", 2), self.start_agent("second", 2)
+        with JobClient(port=self.port) as client:
+            ids = client.submit_many([(f"job{i}", 0.05) for i in range(12)])
+
+        self.assertTrue(self.scheduler.wait_for_completions(12, timeout=10))
+        self.assertEqual(sorted(first.executor.job_ids + second.executor.job_ids), ids)
+        self.assertTrue(first.executor.job_ids and second.executor.job_ids)
+        self.assertEqual(self.coordinator.resources.get_usage()["used_cpus"], 0)
+
+    def test_placement_across_nodes(self):
+        """Test that a job only runs on an agent large enough for it"""
+        small, large = self.start_agent("small", 1), self.start_agent("large", 4)
+        with JobClient(port=self.port) as client:
+            wide = client.submit("wide", 0.05, cpus=4)
+            # Larger than every agent, so it runs alone on the largest
+            big = client.submit("big", 0.05, memory=2048)
+
+        self.assertTrue(self.scheduler.wait_for_completions(2, timeout=10))
+        self.assertEqual(large.executor.job_ids, [wide, big])
+        self.assertEqual(small.executor.job_ids, [])
+
+    def test_lease_expiry(self):
+        """Test that the jobs of a silent agent are queued again"""
+        with JobClient(port=self.port) as client:
+            dead = client.request({"op": "register", "name": "dead", "cpus": 1})["agent"]
+            job_id = client.submit("orphan", 0.05)
+            self.assertEqual(client.request({"op": "lease", "agent": dead})["job"]["job_id"], job_id)
+
+            agent = self.start_agent("alive")
+            self.assertTrue(self.scheduler.wait_for_completions(1, timeout=10))
+            self.assertEqual(agent.executor.job_ids, [job_id])
+
+            # The dropped agent can no longer report the job
+            client.sock.sendall(
+                b'{"op": "complete", "agent": "%s", "job_id": %d}\n' % (dead.encode(), job_id))
+            self.assertIn(b"Unknown agent", client.file.readline())
+        self.assertEqual(self.scheduler.get_performance_stats()["completed_jobs"], 1)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "agent processes are killed with SIGKILL")
+    def test_agent_processes(self):
+        """Test agents running as processes, one of which is killed mid-job"""
+        command = [sys.executable, os.path.join(PROJECT_ROOT, "src", "main.py"), "agent",
+                   "--port", str(self.port), "--executor", "inline", "--workers", "1",
+                   "--cpus", "1", "--memory", "1024"]
+        processes = [subprocess.Popen(command + ["--name", f"proc{i}"], stdout=subprocess.DEVNULL)
+                     for i in range(2)]
+        try:
+            with JobClient(port=self.port) as client:
+                client.submit_many([(f"job{i}", 0.2) for i in range(6)])
+
+            # Wait until both agents hold a lease, then kill one of them
+            deadline = time.time() + 20
+            while len(self.coordinator.get_running_jobs()) < 2 and time.time() < deadline:
+                time.sleep(0.02)
+            processes[0].kill()
+
+            self.assertTrue(self.scheduler.wait_for_completions(6, timeout=30))
+            self.assertEqual(self.job_queue.get_queue_size(), 0)
+        finally:
+            for process in processes:
+                process.kill()
+                process.wait()
+
+if __name__ == "__main__":
+    unittest.main()
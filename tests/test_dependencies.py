@@ -0,0 +1,107 @@
+import unittest
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job, JobStatus
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dependencies import DependencyTracker
+
+class TestDependencyTracker(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty tracker"""
+        self.tracker = DependencyTracker()
+
+    def test_chain(self):
+        """Test that each job in a chain is released by the one before it"""
+        jobs = [Job(f"job{i}", 1.0, job_id=i) for i in range(1, 4)]
+        self.assertTrue(self.tracker.add(jobs[0]))
+        self.assertFalse(self.tracker.add(jobs[1], [1]))
+        self.assertFalse(self.tracker.add(jobs[2], [2]))
+        self.assertEqual(jobs[2].state, JobStatus.BLOCKED)
+
+        self.assertEqual(self.tracker.complete(jobs[0]), [jobs[1]])
+        self.assertEqual(jobs[1].state, JobStatus.WAITING)
+        self.assertEqual(self.tracker.get_blocked_count(), 1)
+        self.assertEqual(self.tracker.complete(jobs[1]), [jobs[2]])
+        self.assertEqual(self.tracker.get_blocked_count(), 0)
+
+    def test_fan_in(self):
+        """Test that a job waits for every one of its dependencies"""
+        a, b = Job("a", 1.0, job_id=1), Job("b", 1.0, job_id=2)
+        join = Job("join", 1.0, job_id=3)
+        self.tracker.add_many([a, b, join], [[], [], [1, 2, 2]])
+        self.assertEqual(self.tracker.get_blocked_jobs(), [(join, [1, 2])])
+
+        self.assertEqual(self.tracker.complete(b), [])
+        self.assertEqual(self.tracker.get_blocked_jobs(), [(join, [1])])
+        self.assertEqual(self.tracker.complete(a), [join])
+
+    def test_completed_dependency(self):
+        """Test that a dependency that already completed does not block"""
+        done = Job("done", 1.0, job_id=1)
+        self.tracker.add(done)
+        self.tracker.complete(done)
+        self.assertTrue(self.tracker.add(Job("later", 1.0, job_id=2), [1]))
+
+    def test_invalid_dependency(self):
+        """Test that a job may only depend on jobs submitted before it"""
+        job = Job("job", 1.0, job_id=5)
+        for depends_on in ([5], [6], [-1]):
+            with self.assertRaises(ValueError):
+                self.tracker.validate([job], [depends_on])
+
+    def test_large_dag(self):
+        """Test that a 100k-job DAG is tracked and released in linear time"""
+        n = 100000
+        root = Job("root", 1.0, job_id=0)
+        chain = [Job(f"chain{i}", 1.0, job_id=i) for i in range(1, n // 2)]
+        fan = [Job(f"fan{i}", 1.0, job_id=i) for i in range(n // 2, n)]
+        start = time.perf_counter()
+        self.tracker.add(root)
+        self.tracker.add_many(chain, [[i - 1] for i in range(1, n // 2)])
+        self.tracker.add_many(fan, [[0]] * len(fan))
+        self.assertEqual(self.tracker.get_blocked_count(), n - 1)
+
+        ready = self.tracker.complete(root)
+        self.assertEqual(len(ready), len(fan) + 1)
+        for job in chain:
+            self.assertEqual(self.tracker.complete(job), [chain[job.job_id]] if job.job_id < len(chain) else [])
+        self.assertEqual(self.tracker.get_blocked_count(), 0)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+
+class TestSchedulerDependencies(unittest.TestCase):
+    def test_blocked_until_completion(self):
+        """Test that a dependent reaches the queue only when its dependency completes"""
+        scheduler = Scheduler(JobQueue())
+        build = scheduler.submit_job("build", 2)
+        deploy = scheduler.submit_job("deploy", 1, depends_on=[build.job_id])
+        scheduler.submit_jobs([("test", 1, 0, 1, 0, [build.job_id]), ("lint", 1)])
+
+        self.assertEqual([job.name for job in scheduler.job_queue.get_job_list()], ["build", "lint"])
+        self.assertEqual(deploy.status, "Blocked")
+        self.assertEqual(len(scheduler.get_blocked_jobs()), 2)
+
+        job = scheduler.job_queue.get_job()
+        job.end_time = time.time()
+        scheduler.register_job_completion(job)
+        # Arrival is the submit time, so time spent blocked counts as waiting
+        self.assertEqual([job.name for job in scheduler.job_queue.get_job_list()],
+                         ["deploy", "lint", "test"])
+        self.assertEqual(deploy.status, "Waiting")
+        self.assertEqual(scheduler.get_blocked_jobs(), [])
+
+    def test_unknown_dependency(self):
+        """Test that submitting a job after an unknown id fails"""
+        scheduler = Scheduler(JobQueue())
+        with self.assertRaises(ValueError):
+            scheduler.submit_job("orphan", 1, depends_on=[42])
+        self.assertEqual(scheduler.job_queue.get_queue_size(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from src.job import Job
 from src.queueManager import JobQueue
 from src.scheduler import Scheduler
-from src.dispatcher import Dispatcher
+from src.dispatcher import Dispatcher, DispatcherPool
+from src.resources import ResourcePool, Node
+from src.executor import SubprocessExecutor
 
 class TestDispatcher(unittest.TestCase):
     def setUp(self):
@@ -60,5 +62,191 @@ class TestDispatcher(unittest.TestCase):
             # Restore original method
             self.dispatcher.execute_job = original_execute
 
+class TestDispatcherPool(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.pool = DispatcherPool(self.job_queue, self.scheduler, num_workers=4)
+        
+        # Replace the subprocess launch with a short sleep
+        for worker in self.pool.workers:
+            worker.execute_job = lambda job: time.sleep(job.exec_time)
+    
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.pool.stop()
+        self.pool.join()
+    
+    def test_default_worker_count(self):
+        """Test that the pool defaults to one worker per CPU"""
+        pool = DispatcherPool(self.job_queue, self.scheduler)
+        self.assertEqual(pool.get_num_workers(), os.cpu_count() or 1)
+    
+    def test_workers_run_jobs_concurrently(self):
+        """Test that every worker drains the shared queue"""
+        self.pool.start()
+        for i in range(4):
+            self.scheduler.submit_job(f"job{i}", 0.3)
+        
+        time.sleep(0.1)
+        running = self.pool.get_running_jobs()
+        self.assertEqual(len(running), 4)
+        self.assertTrue(all(job.status == "Running" for job in running))
+        
+        deadline = time.time() + 5
+        while self.scheduler.stats["completed_jobs"] < 4 and time.time() < deadline:
+            time.sleep(0.05)
+        
+        self.assertEqual(self.scheduler.stats["completed_jobs"], 4)
+        self.assertEqual(self.pool.get_running_jobs(), [])
+    
+    def test_stop_wakes_idle_workers(self):
+        """Test that stopping the pool unblocks workers waiting on an empty queue"""
+        self.pool.start()
+        self.pool.stop()
+        self.pool.join(timeout=2)
+        self.assertFalse(any(worker.is_alive() for worker in self.pool.workers))
+
+class TestLeases(unittest.TestCase):
+    def setUp(self):
+        """Set up a worker that has only seen short jobs"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.resources = ResourcePool([Node("node", 2)])
+        self.dispatcher = Dispatcher(self.job_queue, self.scheduler, resources=self.resources,
+                                     lease_target=0.01)
+        self.dispatcher.mean_duration = 0.001
+
+    def test_lease_batch(self):
+        """Test that short jobs are leased several at a time in policy order"""
+        self.job_queue.add_jobs([Job(f"job{i}", 0.001) for i in range(5)])
+        
+        job = self.dispatcher.next_job()
+        self.assertEqual(job.name, "job0")
+        self.assertEqual([queued.name for queued in self.dispatcher.get_leased_jobs()],
+                         ["job1", "job2", "job3", "job4"])
+        self.assertEqual(self.job_queue.get_queue_size(), 0)
+        # Only the first job holds capacity until it hands it on
+        self.assertEqual(self.resources.get_usage()["used_cpus"], 1)
+        
+        self.resources.transfer(job, self.dispatcher.get_leased_jobs()[0])
+        self.assertEqual(self.dispatcher.next_job().name, "job1")
+        self.assertEqual(self.resources.get_usage()["used_cpus"], 1)
+
+    def test_policy_read_once_per_change(self):
+        """Test that leasing reads the policy only after it changes, and never the queue size"""
+        reads = []
+        get_current_policy = self.job_queue.get_current_policy
+        self.job_queue.get_current_policy = lambda: reads.append("policy") or get_current_policy()
+        self.job_queue.get_queue_size = lambda: reads.append("size")
+        self.job_queue.add_jobs([Job(f"job{i}", 0.001) for i in range(20)])
+        
+        for _ in range(2):
+            job = self.dispatcher.next_job()
+            self.resources.release(job)
+            self.dispatcher.leased.clear()
+        self.assertEqual(reads, ["policy"])
+        
+        self.job_queue.reorder_queue("SJF")
+        self.resources.release(self.dispatcher.next_job())
+        self.assertEqual(reads, ["policy", "policy"])
+        self.assertEqual(self.dispatcher.current_policy(), "SJF")
+    
+    def test_larger_job_ends_lease(self):
+        """Test that a lease stops at a job larger than the capacity it reuses"""
+        self.job_queue.add_jobs([Job("small", 0.001), Job("wide", 0.001, cpus=2),
+                                 Job("after", 0.001)])
+        
+        self.assertEqual(self.dispatcher.next_job().name, "small")
+        self.assertEqual(self.dispatcher.get_leased_jobs(), [])
+        self.assertEqual(self.job_queue.get_queue_size(), 2)
+
+    def test_policy_change_returns_lease(self):
+        """Test that leased jobs go back to the queue when the policy changes"""
+        self.job_queue.add_jobs([Job(f"job{i}", 0.005 - i * 0.001) for i in range(4)])
+        first = self.dispatcher.next_job()
+        self.assertEqual(len(self.dispatcher.get_leased_jobs()), 3)
+        self.resources.transfer(first, self.dispatcher.get_leased_jobs()[0])
+        
+        self.job_queue.reorder_queue("SJF")
+        self.job_queue.add_job(Job("shortest", 0.0001))
+        self.assertEqual(self.dispatcher.next_job().name, "shortest")
+        self.assertEqual([job.name for job in self.dispatcher.get_leased_jobs()],
+                         ["job3", "job2", "job1"])
+        self.assertEqual(self.resources.get_usage()["used_cpus"], 1)
+
+    def test_stop_returns_lease(self):
+        """Test that a stopped worker puts its leased jobs back"""
+        self.job_queue.add_jobs([Job(f"job{i}", 0.001) for i in range(3)])
+        first = self.dispatcher.next_job()
+        self.resources.transfer(first, self.dispatcher.get_leased_jobs()[0])
+        
+        self.dispatcher.return_leased()
+        self.assertEqual(self.dispatcher.get_leased_jobs(), [])
+        self.assertEqual(self.resources.get_usage()["used_cpus"], 0)
+        self.assertEqual([self.job_queue.get_job().name for _ in range(2)], ["job1", "job2"])
+
+    def test_pool_runs_leased_jobs(self):
+        """Test that a pool of leasing workers runs every short job once"""
+        pool = DispatcherPool(self.job_queue, self.scheduler, num_workers=2,
+                              resources=self.resources, lease_target=0.05)
+        ran = []
+        for worker in pool.workers:
+            worker.execute_job = lambda job: ran.append(job.name)
+        self.job_queue.add_jobs([Job(f"job{i}", 0.001) for i in range(50)])
+        pool.start()
+        try:
+            self.assertTrue(self.scheduler.wait_for_completions(50, timeout=10))
+        finally:
+            pool.stop()
+            pool.join()
+        self.assertEqual(sorted(ran), sorted(f"job{i}" for i in range(50)))
+        self.assertEqual(self.resources.get_usage()["used_cpus"], 0)
+
+    def test_pool_leased_jobs(self):
+        """Test that the pool reports the jobs its workers leased but did not start"""
+        pool = DispatcherPool(self.job_queue, self.scheduler, num_workers=2,
+                              resources=self.resources, lease_target=0.01)
+        for worker in pool.workers:
+            worker.mean_duration = 0.001
+        self.job_queue.add_jobs([Job(f"job{i}", 0.001) for i in range(6)])
+        
+        self.assertEqual(pool.workers[0].next_job().name, "job0")
+        self.assertEqual(pool.workers[1].next_job().name, "job3")
+        self.assertEqual([job.name for job in pool.get_leased_jobs()], ["job1", "job2", "job4"])
+        self.assertEqual(self.job_queue.get_queue_size(), 1)
+
+class TestPreemption(unittest.TestCase):
+    def setUp(self):
+        """Set up a single worker running real subprocesses"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.pool = DispatcherPool(self.job_queue, self.scheduler, num_workers=1,
+                                   executor=SubprocessExecutor())
+        self.completed = []
+        self.scheduler.register_job_completion = self.completed.append
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.pool.stop()
+        self.pool.join()
+
+    @unittest.skipUnless(SubprocessExecutor.preemptible, "SIGSTOP not available")
+    def test_short_job_preempts_long_job(self):
+        """Test that under SRTF a short job runs before a long job finishes"""
+        self.scheduler.change_policy("SRTF")
+        self.pool.start()
+        long_job = self.scheduler.submit_job("long", 1.0)
+        time.sleep(0.3)
+        self.scheduler.submit_job("short", 0.1)
+
+        deadline = time.time() + 15
+        while len(self.completed) < 2 and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.assertEqual([job.name for job in self.completed], ["short", "long"])
+        self.assertEqual(long_job.remaining_time, 0.0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
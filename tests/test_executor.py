@@ -0,0 +1,62 @@
+import unittest
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.executor import create_executor, InlineExecutor, ProcessPoolExecutorBackend
+
+class TestExecutor(unittest.TestCase):
+    def test_create_executor(self):
+        """Test creating executors by name"""
+        executor = create_executor("inline")
+        self.assertIsInstance(executor, InlineExecutor)
+        
+        with self.assertRaises(ValueError):
+            create_executor("INVALID")
+    
+    def test_inline_executor(self):
+        """Test that the inline executor runs for the job's execution time"""
+        executor = create_executor("inline")
+        start = time.time()
+        executor.execute(Job("test_job", 0.1))
+        self.assertAlmostEqual(time.time() - start, 0.1, delta=0.05)
+    
+    def test_pool_executor(self):
+        """Test that the warm pool runs jobs in worker processes"""
+        executor = create_executor("pool", 2)
+        try:
+            self.assertIsInstance(executor, ProcessPoolExecutorBackend)
+            start = time.time()
+            executor.execute(Job("test_job", 0.1))
+            self.assertAlmostEqual(time.time() - start, 0.1, delta=0.1)
+        finally:
+            executor.shutdown()
+    
+    def test_subprocess_executor(self):
+        """Test that the subprocess executor runs the benchmark script"""
+        executor = create_executor("subprocess")
+        executor.execute(Job("test_job", 0.0))
+        executor.shutdown()
+
+    @unittest.skipUnless(create_executor("subprocess").preemptible, "SIGSTOP not available")
+    def test_suspend_and_resume(self):
+        """Test that a suspended job does no work until it is resumed"""
+        executor = create_executor("subprocess")
+        job = Job("test_job", 0.3)
+        try:
+            executor.start(job)
+            time.sleep(0.1)
+            executor.suspend(job)
+            self.assertFalse(executor.wait(job, 0.5))
+            
+            executor.start(job)
+            self.assertTrue(executor.wait(job, 10))
+        finally:
+            executor.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import urllib.request
+import urllib.error
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool
+from src.exporter import MetricsExporter
+
+def parse(text):
+    """Map each sample line of a metrics page to its value"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+class TestMetricsExporter(unittest.TestCase):
+    def setUp(self):
+        """Set up a queue, a scheduler and two sleeping dispatcher workers"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.pool = DispatcherPool(self.job_queue, self.scheduler, num_workers=2)
+        for worker in self.pool.workers:
+            worker.execute_job = lambda job: time.sleep(job.exec_time)
+        self.exporter = MetricsExporter(self.scheduler, self.job_queue, self.pool)
+
+    def tearDown(self):
+        """Stop the exporter and the workers"""
+        self.exporter.stop()
+        self.pool.stop()
+        self.pool.join()
+
+    def test_queue_length_by_policy(self):
+        """Test that queued jobs are reported under the current policy"""
+        self.scheduler.submit_batch([(f"job{i}", 1.0, 0, 1, 0) for i in range(3)])
+        self.scheduler.change_policy("SJF")
+
+        samples = parse(self.exporter.render())
+        self.assertEqual(samples['csubatch_queue_length{policy="SJF"}'], 3)
+        self.assertEqual(samples['csubatch_queue_length{policy="FCFS"}'], 0)
+        self.assertEqual(samples["csubatch_jobs_submitted_total"], 3)
+        self.assertEqual(samples["csubatch_running_jobs"], 0)
+        self.assertEqual(samples["csubatch_dispatcher_busy_seconds_total"], 0)
+
+    def test_completions_and_utilization(self):
+        """Test the completion counter, response-time histogram and busy time"""
+        self.scheduler.start_time = time.time()
+        self.pool.start()
+        self.scheduler.submit_batch([(f"job{i}", 0.1, 0, 1, 0) for i in range(4)])
+        self.assertTrue(self.scheduler.wait_for_completions(4, timeout=5))
+
+        samples = parse(self.exporter.render())
+        self.assertEqual(samples["csubatch_jobs_completed_total"], 4)
+        self.assertEqual(samples['csubatch_response_time_seconds_count{policy="FCFS"}'], 4)
+        self.assertEqual(samples['csubatch_response_time_seconds_bucket{policy="FCFS",le="+Inf"}'], 4)
+        self.assertEqual(samples['csubatch_response_time_seconds_bucket{policy="FCFS",le="0.01"}'], 0)
+        self.assertEqual(samples['csubatch_response_time_seconds_bucket{policy="FCFS",le="1"}'], 4)
+        self.assertGreaterEqual(samples["csubatch_dispatcher_busy_seconds_total"], 0.35)
+        self.assertEqual(samples["csubatch_dispatcher_workers"], 2)
+        self.assertGreater(samples["csubatch_dispatcher_utilization"], 0)
+        self.assertLessEqual(samples["csubatch_dispatcher_utilization"], 1)
+
+    def test_http_endpoint(self):
+        """Test that the metrics page is served on localhost"""
+        host, port = self.exporter.start(port=0)
+        self.assertEqual(host, "127.0.0.1")
+
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+            samples = parse(response.read().decode())
+        self.assertEqual(samples["csubatch_jobs_completed_total"], 0)
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(f"http://{host}:{port}/missing", timeout=5)
+        self.assertEqual(context.exception.code, 404)
+        context.exception.close()
+
+if __name__ == "__main__":
+    unittest.main()
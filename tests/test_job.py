@@ -7,7 +7,7 @@ import os
 # Add the src directory to the path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.job import Job
+from src.job import Job, JobStatus
 
 class TestJob(unittest.TestCase):
     def test_job_initialization(self):
@@ -49,6 +49,28 @@ class TestJob(unittest.TestCase):
         
         job.start_time = time.time()
         self.assertIsNone(job.get_response_time())
+    
+    def test_status_enum(self):
+        """Test that status is stored as an integer enum but reads as a label"""
+        job = Job("test_job", 5.0)
+        self.assertEqual(job.state, JobStatus.WAITING)
+        
+        job.status = "Running"
+        self.assertEqual(job.state, JobStatus.RUNNING)
+        self.assertEqual(job.status, "Running")
+        
+        job.status = JobStatus.COMPLETED
+        self.assertEqual(job.status, "Completed")
+        
+        with self.assertRaises(ValueError):
+            job.status = "Unknown"
+    
+    def test_slots(self):
+        """Test that jobs have no per-instance __dict__"""
+        job = Job("test_job", 5.0)
+        self.assertFalse(hasattr(job, "__dict__"))
+        with self.assertRaises(AttributeError):
+            job.unknown_attribute = 1
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+import unittest
+import tempfile
+import shutil
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.journal import Journal
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        """Set up a scheduler journaling to a temporary directory"""
+        self.directory = tempfile.mkdtemp()
+        self.journal = Journal(self.directory, flush_interval=0.001)
+        self.scheduler = Scheduler(JobQueue())
+        self.scheduler.recover(self.journal)
+
+    def tearDown(self):
+        """Close the journal and remove the directory"""
+        self.journal.close()
+        shutil.rmtree(self.directory)
+
+    def run_job(self, scheduler):
+        """Pop, start and complete the next job, as a dispatcher would"""
+        job = scheduler.job_queue.get_job()
+        job.status = "Running"
+        job.start_time = time.time()
+        scheduler.register_job_start(job)
+        job.status = "Completed"
+        job.end_time = job.start_time + 0.5
+        scheduler.register_job_completion(job)
+        return job
+
+    def restart(self, **kwargs):
+        """Close the journal and recover a fresh scheduler from it"""
+        self.journal.close()
+        self.journal = Journal(self.directory, flush_interval=0.001, **kwargs)
+        scheduler = Scheduler(JobQueue())
+        recovered = scheduler.recover(self.journal)
+        return scheduler, recovered
+
+    def test_recover_pending_jobs(self):
+        """Test that jobs not completed before a restart are queued again"""
+        self.scheduler.change_policy("SJF")
+        first = self.scheduler.submit_job("first", 3, cpus=2, memory=512.0)
+        self.scheduler.submit_jobs([("second", 2), ("third", 1)])
+        self.assertEqual(self.run_job(self.scheduler).name, "third")
+
+        scheduler, recovered = self.restart()
+        self.assertEqual(recovered, 2)
+        self.assertEqual(scheduler.job_queue.get_current_policy(), "SJF")
+        self.assertEqual([job.name for job in scheduler.job_queue.get_job_list()],
+                         ["second", "first"])
+        restored = scheduler.job_queue.get_job_list()[1]
+        self.assertEqual(restored.job_id, first.job_id)
+        self.assertEqual(restored.arrival_time, first.arrival_time)
+        self.assertEqual((restored.cpus, restored.memory), (2, 512.0))
+
+        stats = scheduler.get_performance_stats()
+        self.assertEqual(stats["total_jobs"], 3)
+        self.assertEqual(stats["completed_jobs"], 1)
+        self.assertEqual(stats["policies"]["SJF"]["jobs"], 1)
+
+        # New jobs must not reuse recovered ids
+        new = scheduler.submit_job("fourth", 1)
+        self.assertGreater(new.job_id, max(job.job_id for job in scheduler.job_queue.get_job_list()
+                                           if job is not new))
+
+    def test_recover_dependencies(self):
+        """Test that blocked jobs stay blocked on jobs not completed before a restart"""
+        first = self.scheduler.submit_job("first", 1)
+        second = self.scheduler.submit_job("second", 1, depends_on=[first.job_id])
+        third = self.scheduler.submit_job("third", 1, depends_on=[first.job_id, second.job_id])
+        self.assertEqual(self.run_job(self.scheduler).name, "first")
+
+        scheduler, recovered = self.restart()
+        self.assertEqual(recovered, 2)
+        self.assertEqual([job.name for job in scheduler.job_queue.get_job_list()], ["second"])
+        self.assertEqual([(job.name, depends_on) for job, depends_on in scheduler.get_blocked_jobs()],
+                         [("third", [second.job_id])])
+
+        self.assertEqual(self.run_job(scheduler).name, "second")
+        self.assertEqual(self.run_job(scheduler).job_id, third.job_id)
+        # Completed ids are not handed out again, so they can still be named
+        self.assertGreater(scheduler.submit_job("fourth", 1, depends_on=[first.job_id]).job_id,
+                           third.job_id)
+
+    def test_flush(self):
+        """Test that flush makes every record durable"""
+        self.scheduler.submit_job("job", 1)
+        self.assertTrue(self.journal.flush(timeout=5))
+        logs = [name for name in os.listdir(self.directory) if name.endswith(".log")]
+        with open(os.path.join(self.directory, logs[0])) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_compaction(self):
+        """Test that compaction replaces old logs with a snapshot"""
+        self.journal.compact_every = 10
+        for i in range(25):
+            self.scheduler.submit_job(f"job{i}", 1)
+        for _ in range(20):
+            self.run_job(self.scheduler)
+        self.journal.compact()
+
+        logs = [name for name in os.listdir(self.directory) if name.endswith(".log")]
+        self.assertEqual(len(logs), 1)
+
+        scheduler, recovered = self.restart()
+        self.assertEqual(recovered, 5)
+        self.assertEqual(scheduler.get_performance_stats()["completed_jobs"], 20)
+
+    def test_truncated_record(self):
+        """Test that a torn final record from a crash is ignored"""
+        self.scheduler.submit_job("kept", 1)
+        self.journal.flush()
+        log = [name for name in os.listdir(self.directory) if name.endswith(".log")][0]
+        with open(os.path.join(self.directory, log), "a") as f:
+            f.write('["S",99,"torn",1')
+
+        scheduler, recovered = self.restart()
+        self.assertEqual(recovered, 1)
+        self.assertEqual(scheduler.job_queue.get_job().name, "kept")
+
+if __name__ == '__main__':
+    unittest.main()
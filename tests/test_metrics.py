@@ -0,0 +1,81 @@
+import unittest
+import threading
+import random
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.metrics import Histogram, MetricsRecorder
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        """Test that percentiles are within the bucket error"""
+        histogram = Histogram()
+        values = [i / 100.0 for i in range(1, 10001)]  # 0.01s .. 100s
+        random.shuffle(values)
+        for value in values:
+            histogram.record(value)
+        
+        self.assertEqual(histogram.count, 10000)
+        self.assertAlmostEqual(histogram.mean(), 50.005, places=3)
+        self.assertAlmostEqual(histogram.percentile(50), 50.0, delta=50.0 * 0.03)
+        self.assertAlmostEqual(histogram.percentile(95), 95.0, delta=95.0 * 0.03)
+        self.assertAlmostEqual(histogram.percentile(99), 99.0, delta=99.0 * 0.03)
+        self.assertEqual(histogram.percentile(100), 100.0)
+    
+    def test_empty(self):
+        """Test that an empty histogram reports zeros"""
+        summary = Histogram().summary()
+        self.assertEqual(summary["count"], 0)
+        self.assertEqual(summary["p99"], 0)
+        self.assertEqual(summary["max"], 0)
+    
+    def test_merge(self):
+        """Test merging two histograms"""
+        first = Histogram()
+        second = Histogram()
+        first.record(1.0)
+        second.record(3.0)
+        first.merge(second)
+        
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.total, 4.0)
+        self.assertEqual(first.min, 1.0)
+        self.assertEqual(first.max, 3.0)
+
+    def test_cumulative_counts(self):
+        """Test counting values below bucket bounds"""
+        histogram = Histogram()
+        for value in (0.5, 2.0, 2.0, 40.0):
+            histogram.record(value)
+
+        self.assertEqual(histogram.cumulative_counts([0.1, 1, 5, 10, 100]), [0, 1, 3, 3, 4])
+        self.assertEqual(Histogram().cumulative_counts([1, 10]), [0, 0])
+
+class TestMetricsRecorder(unittest.TestCase):
+    def test_concurrent_updates_not_lost(self):
+        """Test that counters from many threads are merged without loss"""
+        metrics = MetricsRecorder()
+        
+        def worker():
+            for _ in range(10000):
+                metrics.increment("completed_jobs")
+                metrics.observe("response_time", 0.5, "FCFS")
+        
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(metrics.counter("completed_jobs"), 80000)
+        self.assertEqual(metrics.histogram("response_time", "FCFS").count, 80000)
+        
+        counters, histograms = metrics.snapshot()
+        self.assertEqual(counters["completed_jobs"], 80000)
+        self.assertEqual(histograms[("response_time", "FCFS")].count, 80000)
+
+if __name__ == '__main__':
+    unittest.main()
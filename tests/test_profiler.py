@@ -0,0 +1,115 @@
+import unittest
+import threading
+import json
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool
+from src.executor import SubprocessExecutor
+from src.profiler import PROFILER, Profiler
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        """Start every test with an empty, disabled profiler"""
+        PROFILER.disable()
+        PROFILER.reset()
+
+    def tearDown(self):
+        """Leave the shared profiler disabled and empty"""
+        PROFILER.disable()
+        PROFILER.reset()
+
+    def test_disabled_records_nothing(self):
+        """Test that queue operations record nothing while profiling is off"""
+        queue = JobQueue()
+        queue.add_job(Job("job1", 1.0))
+        queue.get_job()
+
+        self.assertEqual(PROFILER.dump()["timings"], {})
+        self.assertEqual(PROFILER.get_elapsed(), 0.0)
+
+    def test_queue_lock_timings(self):
+        """Test lock wait and hold timings of queue operations"""
+        queue = JobQueue()
+        PROFILER.enable()
+        queue.add_jobs([Job(f"job{i}", 1.0) for i in range(3)])
+        for _ in range(3):
+            queue.get_job()
+        queue.get_jobs(2)
+        PROFILER.disable()
+
+        timings = PROFILER.dump()["timings"]
+        self.assertEqual(timings["queue.add_jobs.lock_wait"]["count"], 1)
+        self.assertEqual(timings["queue.get_job.lock_wait"]["count"], 3)
+        self.assertEqual(timings["queue.get_job.lock_hold"]["count"], 3)
+        self.assertEqual(timings["queue.get_jobs.lock_hold"]["count"], 1)
+
+    def test_condition_wait_is_not_held(self):
+        """Test that time blocked on an empty queue does not count as holding its lock"""
+        queue = JobQueue()
+        PROFILER.enable()
+        consumer = threading.Thread(target=queue.get_job)
+        consumer.start()
+        time.sleep(0.2)
+        queue.add_job(Job("job1", 1.0))
+        consumer.join(5)
+
+        hold = PROFILER.dump()["timings"]["queue.get_job.lock_hold"]
+        # Held once before waiting and once after waking
+        self.assertEqual(hold["count"], 2)
+        self.assertLess(hold["max"], 0.1)
+
+    def test_dispatch_timings(self):
+        """Test spawn, completion and gap timings of dispatched subprocess jobs"""
+        job_queue = JobQueue()
+        scheduler = Scheduler(job_queue)
+        pool = DispatcherPool(job_queue, scheduler, num_workers=1, executor=SubprocessExecutor(),
+                              lease_target=0)
+        PROFILER.enable()
+        scheduler.submit_jobs([("job1", 0.01), ("job2", 0.01)])
+        pool.start()
+        try:
+            self.assertTrue(scheduler.wait_for_completions(2, timeout=20))
+        finally:
+            pool.stop()
+            pool.join()
+
+        timings = PROFILER.dump()["timings"]
+        self.assertEqual(timings["executor.spawn"]["count"], 2)
+        self.assertEqual(timings["executor.overhead"]["count"], 2)
+        self.assertEqual(timings["dispatch.complete"]["count"], 2)
+        self.assertEqual(timings["dispatch.gap"]["count"], 1)
+        self.assertGreaterEqual(timings["dispatch.next_job"]["count"], 2)
+
+    def test_dump_and_report(self):
+        """Test the machine-readable dump and the text report of a private profiler"""
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("outer"):
+            profiler.record("inner", 0.002)
+            profiler.record("inner", 0.004)
+        profiler.disable()
+
+        profile = json.loads(profiler.dumps())
+        self.assertFalse(profile["enabled"])
+        self.assertGreater(profile["elapsed"], 0)
+        self.assertEqual(profile["timings"]["inner"]["count"], 2)
+        self.assertAlmostEqual(profile["timings"]["inner"]["total"], 0.006)
+        self.assertIn("buckets", profile["timings"]["inner"]["histogram"])
+
+        report = profiler.report()
+        self.assertEqual(len(report), 4)
+        self.assertTrue(report[2].lstrip().startswith("inner"))
+
+        profiler.reset()
+        self.assertEqual(profiler.dump()["timings"], {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 import unittest
 import time
 import threading
+import random
 import sys
 import os
 
@@ -9,7 +10,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.job import Job
-from src.queueManager import JobQueue
+from src.queueManager import JobQueue, KeySumIndex
 
 class TestJobQueue(unittest.TestCase):
     def test_add_get_job(self):
@@ -113,6 +114,259 @@ class TestJobQueue(unittest.TestCase):
         self.assertEqual(retrieved2.name, "job1")  # priority 2
         self.assertEqual(retrieved3.name, "job2")  # priority 1
     
+    def test_submit_after_policy_switch(self):
+        """Test that jobs submitted after a policy switch land in policy order"""
+        queue = JobQueue()
+        queue.reorder_queue("SJF")
+        
+        queue.add_job(Job("job1", 5.0))
+        queue.add_job(Job("job2", 2.0))
+        queue.add_job(Job("job3", 8.0))
+        
+        self.assertEqual([job.name for job in queue.get_job_list()], ["job2", "job1", "job3"])
+        self.assertEqual(queue.get_job().name, "job2")
+        self.assertEqual(queue.get_job().name, "job1")
+        self.assertEqual(queue.get_job().name, "job3")
+    
+    def test_policy_switch_mid_drain(self):
+        """Test switching policy while jobs are being drained"""
+        queue = JobQueue()
+        queue.add_job(Job("job1", 5.0, 1))
+        queue.add_job(Job("job2", 2.0, 3))
+        queue.add_job(Job("job3", 8.0, 2))
+        queue.add_job(Job("job4", 1.0, 1))
+        
+        self.assertEqual(queue.get_job().name, "job1")  # FCFS head
+        queue.reorder_queue("Priority")
+        self.assertEqual(queue.get_job().name, "job2")  # priority 3
+        queue.reorder_queue("SJF")
+        self.assertEqual(queue.get_job().name, "job4")  # 1.0
+        self.assertEqual(queue.get_job().name, "job3")
+        self.assertEqual(queue.get_queue_size(), 0)
+    
+    def test_stable_tie_breaking(self):
+        """Test that equal keys are served in submission order"""
+        queue = JobQueue()
+        queue.reorder_queue("Priority")
+        for i in range(5):
+            queue.add_job(Job(f"job{i}", 1.0, 2))
+        
+        self.assertEqual([queue.get_job().name for _ in range(5)],
+                         [f"job{i}" for i in range(5)])
+    
+    def test_policy_switch_rebuilds_one_heap(self):
+        """Test that each queued job has one heap entry and switching back keeps ties in order"""
+        queue = JobQueue()
+        queue.add_jobs([Job(f"job{i}", float(5 - i), i % 2) for i in range(5)])
+        self.assertEqual(len(queue.heap), 5)
+        
+        queue.reorder_queue("SJF")
+        self.assertEqual([job.name for job in queue.get_job_list()],
+                         ["job4", "job3", "job2", "job1", "job0"])
+        queue.reorder_queue("Priority")
+        self.assertEqual([job.name for job in queue.get_job_list()],
+                         ["job1", "job3", "job0", "job2", "job4"])
+        queue.reorder_queue("FCFS")
+        self.assertEqual(len(queue.heap), 5)
+        self.assertEqual([queue.get_job().name for _ in range(5)], [f"job{i}" for i in range(5)])
+    
+    def test_unknown_policy(self):
+        """Test that an unknown policy is rejected"""
+        queue = JobQueue()
+        with self.assertRaises(ValueError):
+            queue.reorder_queue("INVALID")
+        self.assertEqual(queue.get_current_policy(), "FCFS")
+    
+    def test_work_ahead(self):
+        """Test the queued work a new job would wait behind under each policy"""
+        queue = JobQueue()
+        queue.add_job(Job("job1", 5.0, 1))
+        queue.add_job(Job("job2", 2.0, 3))
+        queue.add_job(Job("job3", 8.0, 2))
+        
+        # FCFS: a job arriving now waits for everything queued
+        self.assertEqual(queue.get_work_ahead(4.0, 2), 15.0)
+        
+        queue.reorder_queue("SJF")
+        self.assertEqual(queue.get_work_ahead(4.0), 2.0)
+        self.assertEqual(queue.get_work_ahead(5.0), 7.0)  # ties run first
+        
+        queue.reorder_queue("Priority")
+        self.assertEqual(queue.get_work_ahead(4.0, 2), 10.0)
+        
+        # Dequeued jobs no longer count
+        self.assertEqual(queue.get_job().name, "job2")
+        self.assertEqual(queue.get_work_ahead(4.0, 2), 8.0)
+
+    def test_work_ahead_kept_current(self):
+        """Test that the wait index follows adds and takes once it has been built"""
+        queue = JobQueue()
+        queue.reorder_queue("SJF")
+        self.assertIsNone(queue.wait_index)
+        queue.add_jobs([Job(f"job{i}", float(i % 7 + 1)) for i in range(50)])
+        self.assertIsNone(queue.wait_index)  # nothing has asked yet
+
+        queue.get_work_ahead(3.0)
+        queue.add_job(Job("late", 2.5))
+        queue.add_jobs([Job(f"batch{i}", 0.5) for i in range(3)])
+        for _ in range(10):
+            queue.get_job()
+
+        expected = sum(job.remaining_time for job in queue.get_job_list() if job.remaining_time <= 3.0)
+        self.assertEqual(queue.get_work_ahead(3.0), expected)
+
+        # Orderings that share a key keep the index; others drop it until asked again
+        queue.reorder_queue("SRTF")
+        self.assertIsNotNone(queue.wait_index)
+        queue.reorder_queue("FCFS")
+        self.assertIsNone(queue.wait_index)
+
+    def test_add_jobs(self):
+        """Test adding a batch of jobs in one call"""
+        queue = JobQueue()
+        queue.add_job(Job("job0", 4.0))
+        queue.reorder_queue("SJF")
+        
+        added = queue.add_jobs([Job("job1", 5.0), Job("job2", 2.0), Job("job3", 8.0)])
+        
+        self.assertEqual(added, 3)
+        self.assertEqual(queue.get_queue_size(), 4)
+        self.assertEqual(queue.get_work_ahead(6.0), 11.0)
+        self.assertEqual([queue.get_job().name for _ in range(4)], ["job2", "job0", "job1", "job3"])
+    
+    def test_get_jobs(self):
+        """Test taking a batch from the head of the queue"""
+        queue = JobQueue()
+        queue.reorder_queue("SJF")
+        queue.add_jobs([Job("job0", 3.0), Job("job1", 1.0), Job("job2", 2.0), Job("job3", 4.0)])
+        
+        self.assertEqual([job.name for job in queue.get_jobs(2)], ["job1", "job2"])
+        # The batch stops at the first job refused rather than skipping it
+        self.assertEqual(queue.get_jobs(2, lambda job: job.exec_time > 3.5), [])
+        self.assertEqual([job.name for job in queue.get_jobs(5)], ["job0", "job3"])
+        self.assertEqual(queue.get_queue_size(), 0)
+        
+        # With a share, peers are left their part of the queue
+        queue.add_jobs([Job(f"job{i}", 1.0) for i in range(7)])
+        self.assertEqual(len(queue.get_jobs(5, share=3)), 2)
+        self.assertEqual(queue.get_queue_size(), 5)
+    
+    def test_add_jobs_bounded(self):
+        """Test that a batch larger than a bounded queue waits for room"""
+        queue = JobQueue(max_size=2)
+        consumed = []
+        
+        def consumer():
+            for _ in range(5):
+                consumed.append(queue.get_job().name)
+        
+        consumer_thread = threading.Thread(target=consumer)
+        consumer_thread.start()
+        queue.add_jobs([Job(f"job{i}", 1.0) for i in range(5)])
+        consumer_thread.join(2)
+        
+        self.assertEqual(consumed, [f"job{i}" for i in range(5)])
+    
+    def test_requeue_by_remaining_time(self):
+        """Test that a preempted job is queued again by its remaining time"""
+        queue = JobQueue()
+        queue.reorder_queue("SRTF")
+        queue.add_job(Job("job1", 3.0))
+
+        preempted = Job("job2", 8.0)
+        preempted.arrival_time = 0.0
+        preempted.remaining_time = 1.0
+        queue.requeue(preempted)
+
+        self.assertEqual(queue.get_work_ahead(2.0), 1.0)
+        self.assertEqual(queue.get_job(), preempted)
+        self.assertEqual(preempted.arrival_time, 0.0)
+
+    def test_should_preempt(self):
+        """Test preemption decisions under each preemptive policy"""
+        queue = JobQueue(quantum=0.5)
+        running = Job("running", 4.0, 2)
+        running.remaining_time = 2.0
+        queue.add_job(Job("short", 1.0, 1))
+
+        # Non-preemptive policies never preempt
+        self.assertFalse(queue.should_preempt(running, 10.0))
+
+        queue.reorder_queue("SRTF")
+        self.assertTrue(queue.should_preempt(running, 0.0))
+        running.remaining_time = 1.0  # ties keep the running job
+        self.assertFalse(queue.should_preempt(running, 0.0))
+
+        queue.reorder_queue("PreemptivePriority")
+        self.assertFalse(queue.should_preempt(running, 0.0))
+        queue.add_job(Job("urgent", 5.0, 3))
+        self.assertTrue(queue.should_preempt(running, 0.0))
+
+        queue.reorder_queue("RR")
+        self.assertFalse(queue.should_preempt(running, 0.4))
+        self.assertTrue(queue.should_preempt(running, 0.5))
+
+        # Nothing to switch to
+        queue.get_job()
+        queue.get_job()
+        self.assertFalse(queue.should_preempt(running, 0.5))
+
+    def test_round_robin_order(self):
+        """Test that RR serves requeued jobs after those already waiting"""
+        queue = JobQueue()
+        queue.reorder_queue("RR")
+        queue.add_job(Job("job1", 3.0))
+        queue.add_job(Job("job2", 3.0))
+
+        job1 = queue.get_job()
+        queue.requeue(job1)
+        self.assertEqual([queue.get_job().name for _ in range(2)], ["job2", "job1"])
+
+    def test_aging(self):
+        """Test that waiting raises a job's effective priority without re-sorting"""
+        queue = JobQueue(aging_rate=0.5)
+        queue.reorder_queue("Priority")
+        for name, priority, arrival in [("old", 1, 0.0), ("new", 3, 3.0), ("newer", 2, 5.0)]:
+            job = Job(name, 1.0, priority)
+            job.arrival_time = arrival
+            queue.add_job(job)
+        
+        # Effective priorities at t=5: old 1+2.5, new 3+1, newer 2+0
+        self.assertEqual([job.name for job in queue.get_job_list()], ["new", "old", "newer"])
+        
+        # Without aging the oldest, lowest-priority job always runs last
+        queue = JobQueue()
+        queue.reorder_queue("Priority")
+        for name, priority, arrival in [("old", 1, 0.0), ("new", 3, 3.0), ("newer", 2, 5.0)]:
+            job = Job(name, 1.0, priority)
+            job.arrival_time = arrival
+            queue.add_job(job)
+        self.assertEqual([job.name for job in queue.get_job_list()], ["new", "newer", "old"])
+    
+    def test_mlfq_demotion(self):
+        """Test that MLFQ moves a job down a level when it uses its whole slice"""
+        queue = JobQueue(quantum=1.0, level_wait=10.0)
+        queue.reorder_queue("MLFQ")
+        job = Job("cpu_bound", 10.0)
+        queue.add_job(job)
+        self.assertEqual(queue.get_job(), job)
+        self.assertEqual(queue.get_time_slice(job), 1.0)
+        
+        queue.requeue(job, 0.5)  # preempted early: keeps its level
+        self.assertEqual(job.level, 0)
+        queue.get_job()
+        queue.requeue(job, 1.0)
+        self.assertEqual(job.level, 1)
+        self.assertEqual(queue.get_time_slice(job), 2.0)
+        
+        # A fresh job now runs first, unless it arrives level_wait seconds later
+        fresh = Job("fresh", 1.0)
+        fresh.arrival_time = job.arrival_time + 5.0
+        late = Job("late", 1.0)
+        late.arrival_time = job.arrival_time + 15.0
+        queue.add_jobs([fresh, late])
+        self.assertEqual([j.name for j in queue.get_job_list()], ["fresh", "cpu_bound", "late"])
+    
     def test_synchronization(self):
         """Test that the queue properly handles concurrent access"""
         queue = JobQueue()
@@ -150,5 +404,29 @@ class TestJobQueue(unittest.TestCase):
         # Queue should be empty
         self.assertEqual(queue.get_queue_size(), 0)
 
+class TestKeySumIndex(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """Test prefix sums against a linear scan across block splits and merges"""
+        random.seed(7)
+        index = KeySumIndex()
+        index.BLOCK_SIZE = 4
+        entries = {}
+        
+        for seq in range(2000):
+            if entries and random.random() < 0.4:
+                item = random.choice(sorted(entries))
+                index.remove(item)
+                del entries[item]
+            else:
+                item = (random.randint(0, 20), seq)
+                entries[item] = random.random()
+                index.insert(item, entries[item])
+            
+            probe = (random.randint(0, 20), random.randint(0, seq))
+            expected = sum(value for key, value in entries.items() if key < probe)
+            self.assertAlmostEqual(index.sum_before(probe), expected)
+        
+        self.assertEqual(len(index), len(entries))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+# tests/test_resources.py
+import unittest
+import time
+import threading
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool
+from src.resources import ResourcePool, Node, ReservationProfile
+from performance.simulator import simulate
+
+class TestResourcePool(unittest.TestCase):
+    def test_best_fit(self):
+        """Test that a job goes to the node it fills most tightly"""
+        big, small = Node("big", 8, 1024), Node("small", 2, 1024)
+        pool = ResourcePool([big, small])
+
+        self.assertIs(pool.place(Job("a", 1.0, cpus=2)), small)
+        self.assertIs(pool.place(Job("b", 1.0, cpus=2)), big)
+        self.assertIsNone(pool.place(Job("c", 1.0, cpus=4, memory=2048)))
+        self.assertEqual(pool.get_usage()["used_cpus"], 4)
+
+    def test_release(self):
+        """Test that released capacity can be placed again"""
+        pool = ResourcePool([Node("node", 4, 1000)])
+        job = Job("a", 1.0, cpus=3, memory=600)
+        self.assertTrue(pool.place(job))
+        self.assertIsNone(pool.place(Job("b", 1.0, cpus=1, memory=500)))
+
+        pool.release(job)
+        self.assertTrue(pool.place(Job("b", 1.0, cpus=1, memory=500)))
+        self.assertEqual(pool.get_usage()["used_memory"], 500)
+
+    def test_oversized_job_runs_alone(self):
+        """Test that a job larger than every node waits for an idle node"""
+        pool = ResourcePool([Node("node", 4)])
+        small = Job("small", 1.0)
+        pool.place(small)
+        huge = Job("huge", 1.0, cpus=16)
+        self.assertIsNone(pool.place(huge))
+
+        pool.release(small)
+        self.assertTrue(pool.place(huge))
+        self.assertIsNone(pool.place(Job("other", 1.0)))
+        pool.release(huge)
+        self.assertEqual(pool.get_usage()["used_cpus"], 0)
+
+    def test_backfill_past_head(self):
+        """Test that the queue hands out a later job when the head does not fit"""
+        pool = ResourcePool([Node("node", 4)])
+        queue = JobQueue()
+        running = Job("running", 5.0, cpus=2)
+        pool.place(running)
+        for job in (Job("wide", 1.0, cpus=4), Job("narrow", 1.0, cpus=2)):
+            queue.add_job(job)
+
+        self.assertEqual(queue.get_job(pool.place).name, "narrow")
+        self.assertEqual([job.name for job in queue.get_job_list()], ["wide"])
+
+class TestReservationProfile(unittest.TestCase):
+    def test_earliest_start(self):
+        """Test finding the first gap a request fits for its whole duration"""
+        # 1 CPU free now, 2 more at t=5, all 4 at t=8
+        profile = ReservationProfile(0.0, 1, 100, [(5.0, 2, 0), (8.0, 1, 0)])
+        self.assertEqual(profile.earliest_start(1, 50, 10.0), 0.0)
+        self.assertEqual(profile.earliest_start(3, 50, 1.0), 5.0)
+        self.assertEqual(profile.earliest_start(4, 50, 1.0), 8.0)
+        self.assertIsNone(profile.earliest_start(5, 50, 1.0))
+
+    def test_reserve(self):
+        """Test that a reservation blocks overlapping requests only"""
+        profile = ReservationProfile(0.0, 2, 100, [(4.0, 2, 0)])
+        profile.reserve(4.0, 6.0, 4, 0)
+        self.assertTrue(profile.fits_now(2, 0, 4.0))
+        self.assertFalse(profile.fits_now(1, 0, 5.0))
+        self.assertEqual(profile.earliest_start(1, 0, 5.0), 10.0)
+
+class TestBackfilling(unittest.TestCase):
+    def setUp(self):
+        """A 2-CPU job runs until t=10 when a 4-CPU job arrives, then small jobs"""
+        self.workload = [("long", 10.0, 0, 0.0, 2), ("wide", 5.0, 0, 1.0, 4),
+                         ("short", 2.0, 0, 2.0, 1), ("tall", 20.0, 0, 3.0, 1)]
+
+    def wait_of(self, results, name):
+        return results["waiting_times"][results["execution_order"].index(name)]
+
+    def test_easy_never_delays_the_reservation(self):
+        """Test that EASY backfills only jobs that end before the reservation"""
+        results = simulate(self.workload, "FCFS", num_workers=4, nodes=[Node("node", 4)],
+                           backfill="easy")
+        self.assertEqual(self.wait_of(results, "wide"), 9.0)
+        self.assertEqual(self.wait_of(results, "short"), 0.0)
+        self.assertEqual(self.wait_of(results, "tall"), 12.0)
+
+    def test_greedy_can_delay_large_jobs(self):
+        """Test that greedy backfilling lets a long small job delay a wide one"""
+        results = simulate(self.workload, "FCFS", num_workers=4, nodes=[Node("node", 4)],
+                           backfill="greedy")
+        self.assertEqual(self.wait_of(results, "tall"), 0.0)
+        self.assertEqual(self.wait_of(results, "wide"), 22.0)
+
+    def test_no_backfill(self):
+        """Test that jobs start strictly in order without backfilling"""
+        results = simulate(self.workload, "FCFS", num_workers=4, nodes=[Node("node", 4)],
+                           backfill="none")
+        self.assertEqual(results["execution_order"], ["long", "wide", "short", "tall"])
+
+class TestPacking(unittest.TestCase):
+    def test_small_jobs_run_alongside_large(self):
+        """Test that workers pack jobs onto the budget without exceeding it"""
+        job_queue = JobQueue()
+        scheduler = Scheduler(job_queue)
+        resources = ResourcePool([Node("node", 4, 1000)])
+        pool = DispatcherPool(job_queue, scheduler, num_workers=4, resources=resources)
+        lock = threading.Lock()
+        running, peaks = [], []
+
+        def execute(job):
+            with lock:
+                running.append(job)
+                peaks.append((sum(j.cpus for j in running), sum(j.memory for j in running),
+                              sorted(j.name for j in running)))
+            time.sleep(job.exec_time)
+            with lock:
+                running.remove(job)
+
+        for worker in pool.workers:
+            worker.execute_job = execute
+        pool.start()
+        try:
+            scheduler.submit_job("large", 0.3, cpus=3, memory=800)
+            scheduler.submit_job("wide", 0.1, cpus=2)
+            for i in range(3):
+                scheduler.submit_job(f"small{i}", 0.1, memory=100)
+            self.assertTrue(scheduler.wait_for_completions(5, timeout=5))
+        finally:
+            pool.stop()
+            pool.join()
+
+        self.assertTrue(all(cpus <= 4 and memory <= 1000 for cpus, memory, _ in peaks))
+        self.assertIn(["large", "small0"], [names for _, _, names in peaks])
+        self.assertEqual(resources.get_usage()["used_cpus"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
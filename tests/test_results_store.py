@@ -0,0 +1,125 @@
+import unittest
+import tempfile
+import contextlib
+import io
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.results_store import ResultsStore
+from performance.simulator import simulate
+from performance.analysis import analyze_by_policy
+from performance.test_runner import PerformanceTestRunner
+from performance.workload import SyntheticWorkload
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        """Create a store in a scratch directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(self.directory.name)
+
+    def tearDown(self):
+        """Close the store and remove the scratch directory"""
+        self.store.close()
+        self.directory.cleanup()
+
+    def run_policies(self, count):
+        """Append count simulated runs of SJF and FCFS, with timestamps in run order"""
+        results = []
+        for i in range(count):
+            for policy in ("SJF", "FCFS"):
+                result = simulate(SyntheticWorkload(50, seed=i, rate=2.0), policy)
+                result["timestamp"] = f"2026-01-01T00:00:{i:02d}"
+                self.store.append(result)
+                results.append(result)
+        return results
+
+    def test_round_trip(self):
+        """Test that a stored run loads back with its columns and scalars"""
+        result = simulate([("a", 2.0, 0, 0.0), ("b", 1.0, 0, 0.5)], "FCFS", name="small")
+        record = self.store.append(result)
+        loaded = self.store.load(record)
+
+        self.assertEqual(record["run_id"], 0)
+        self.assertEqual(loaded["name"], "small")
+        self.assertEqual(loaded["execution_order"], ["a", "b"])
+        self.assertEqual(list(loaded["end_times"]), [2.0, 3.0])
+        self.assertEqual(list(self.store.metric(record, "waiting_time")), [0.0, 1.5])
+        self.assertEqual(self.store.latest("FCFS")["avg_response_time"], result["avg_response_time"])
+        self.assertIsNone(self.store.latest("SJF"))
+
+    def test_query_last_runs(self):
+        """Test a percentile over the most recent runs of one policy"""
+        results = self.run_policies(5)
+        expected = analyze_by_policy([result for result in results[-6:] if result["policy"] == "SJF"])
+
+        summary = self.store.query("turnaround_time", "SJF", last=3)
+        self.assertEqual(summary["runs"], 3)
+        self.assertEqual(summary["count"], 150)
+        self.assertAlmostEqual(summary["p95"], expected["SJF"]["turnaround_time"]["p95"])
+
+        self.assertEqual(len(self.store.runs()), 10)
+        self.assertEqual(len(self.store.runs(since="2026-01-01T00:00:03")), 4)
+        self.assertEqual(self.store.get_policies(), ["SJF", "FCFS"])
+        with self.assertRaises(ValueError):
+            self.store.query("makespan")
+
+    def test_reopen_and_concurrent_reader(self):
+        """Test that runs persist and a reader sees runs appended after it opened"""
+        reader = ResultsStore(self.directory.name)
+        self.run_policies(2)
+
+        self.assertEqual(len(reader.runs(policy="FCFS")), 2)
+        reopened = ResultsStore(self.directory.name)
+        self.assertEqual([record["run_id"] for record in reopened.runs()], [0, 1, 2, 3])
+        reader.close()
+        reopened.close()
+
+    def test_uncommitted_rows_dropped(self):
+        """Test that rows of an append that never reached the index are overwritten"""
+        self.run_policies(1)
+        with open(os.path.join(self.directory.name, "end_times.f64"), "ab") as f:
+            f.write(b"\0" * 24)  # an append interrupted before its index line
+
+        record = self.store.append(simulate([("late", 1.0, 0, 0.0)], "SJF"))
+        self.assertEqual(record["offset"], 100)
+        self.assertEqual(list(self.store.load(record)["end_times"]), [1.0])
+
+    def test_rejects_results_without_columns(self):
+        """Test that a run without per-job timings is refused"""
+        with self.assertRaises(ValueError):
+            self.store.append({"policy": "FCFS", "response_times": [1.0]})
+
+    def test_import_legacy_json(self):
+        """Test that a JSON results file from before the store imports once"""
+        path = os.path.join(os.path.dirname(__file__), "..", "results",
+                            "performance_results_20250420_175103.json")
+        self.assertEqual(self.store.import_json(path), 3)
+        self.assertEqual(self.store.import_json(path), 0)
+
+        self.assertEqual(self.store.get_policies(), ["FCFS", "SJF", "Priority"])
+        latest = self.store.latest("SJF")
+        self.assertEqual(latest["test_type"], "policy_comparison")
+        self.assertEqual(latest["source"], "performance_results_20250420_175103.json")
+        self.assertEqual(len(latest["execution_order"]), 10)
+        self.assertEqual(len(latest["end_times"]), 0)
+        self.assertEqual(self.store.query("turnaround_time", "SJF")["runs"], 1)
+
+    def test_runner_saves_to_store(self):
+        """Test that the performance test runner appends its runs to the store"""
+        runner = PerformanceTestRunner(simulate=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            runner.configure_tests()
+            runner.results = {"policy_comparison": [runner.run_single_test(config)
+                                                    for config in runner.test_configs]}
+            runner.save_results(self.directory.name)
+
+        self.assertEqual(self.store.get_policies(), ["FCFS", "SJF", "Priority"])
+        latest = self.store.latest("SJF")
+        self.assertEqual(latest["execution_order"][0], "job_1")
+        self.assertEqual(len(latest["exec_times"]), 10)
+
+if __name__ == "__main__":
+    unittest.main()
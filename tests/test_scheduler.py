@@ -1,6 +1,7 @@
 # tests/test_scheduler.py
 import unittest
 import time
+import threading
 import sys
 import os
 
@@ -33,6 +34,34 @@ class TestScheduler(unittest.TestCase):
         self.assertEqual(self.job_queue.get_queue_size(), 1)
         self.assertEqual(self.scheduler.stats["total_jobs"], 1)
     
+    def test_submit_jobs(self):
+        """Test submitting jobs in bulk"""
+        specs = ((f"job{i}", float(i % 3 + 1), i % 2) for i in range(25))
+        
+        submitted = self.scheduler.submit_jobs(specs, batch_size=10)
+        
+        self.assertEqual(submitted, 25)
+        self.assertEqual(self.job_queue.get_queue_size(), 25)
+        self.assertEqual(self.scheduler.stats["total_jobs"], 25)
+    
+    def test_invalid_jobs_rejected(self):
+        """Test that every submission path rejects non-finite or out-of-range jobs"""
+        invalid = [("nan", float("nan"), 0, 1, 0), ("inf", float("inf"), 0, 1, 0),
+                   ("negative", -5.0, 0, 1, 0), ("no_cpus", 1.0, 0, 0, 0),
+                   ("inf_cpus", 1.0, 0, float("inf"), 0), ("nan_memory", 1.0, 0, 1, float("nan")),
+                   ("negative_memory", 1.0, 0, 1, -1)]
+        for spec in invalid:
+            name, exec_time, priority, cpus, memory = spec
+            with self.assertRaises(ValueError):
+                self.scheduler.submit_job(name, exec_time, priority, cpus=cpus, memory=memory)
+            with self.assertRaises(ValueError):
+                self.scheduler.submit_jobs([spec])
+            with self.assertRaises(ValueError):
+                self.scheduler.submit_batch([("valid", 1.0), spec])
+        
+        self.assertEqual(self.job_queue.get_queue_size(), 0)
+        self.assertEqual(self.scheduler.stats["total_jobs"], 0)
+    
     def test_change_policy(self):
         """Test changing the scheduling policy"""
         self.assertTrue(self.scheduler.change_policy("FCFS"))
@@ -74,6 +103,80 @@ class TestScheduler(unittest.TestCase):
         self.assertEqual(stats["total_jobs"], 1)
         self.assertEqual(stats["completed_jobs"], 1)
         self.assertGreater(stats["avg_response_time"], 0)
+        # start() records the start time, so throughput counts the job
+        self.assertGreater(stats["throughput"], 0)
+    
+    def test_max_waiting_time(self):
+        """Test that the longest wait is reported per policy"""
+        self.scheduler.change_policy("SJF")
+        for name, waited in [("job1", 2.0), ("job2", 7.0)]:
+            job = Job(name, 1.0)
+            job.arrival_time = 100.0
+            job.start_time = 100.0 + waited
+            job.end_time = job.start_time + 1.0
+            self.scheduler.register_job_completion(job)
+
+        stats = self.scheduler.get_performance_stats()
+        self.assertEqual(stats["policies"]["SJF"]["max_waiting_time"], 7.0)
+        self.assertEqual(stats["policies"]["FCFS"]["max_waiting_time"], 0)
+        self.assertEqual(stats["max_waiting_time"], 7.0)
+
+    def test_events_reach_listeners(self):
+        """Test that submit, policy and completion events are delivered"""
+        events = []
+        delivered = threading.Event()
+        
+        def listener(event_type, payload):
+            events.append(event_type)
+            if event_type == "complete":
+                delivered.set()
+        
+        self.scheduler.add_listener(listener)
+        job = self.scheduler.submit_job("test_job", 1.0)
+        self.scheduler.change_policy("SJF")
+        job.end_time = time.time()
+        self.scheduler.register_job_completion(job)
+        
+        self.assertTrue(delivered.wait(1))
+        self.assertEqual(events, ["submit", "policy", "complete"])
+    
+    def test_wait_for_completions(self):
+        """Test blocking until jobs complete"""
+        self.assertFalse(self.scheduler.wait_for_completions(1, timeout=0.05))
+        
+        job = Job("test_job", 1.0)
+        job.arrival_time = time.time()
+        job.end_time = time.time()
+        threading.Timer(0.05, self.scheduler.register_job_completion, [job]).start()
+        
+        self.assertTrue(self.scheduler.wait_for_completions(1, timeout=1))
+    
+    def test_wait_for_jobs(self):
+        """Test blocking until specific jobs complete, ignoring other completions"""
+        jobs = self.scheduler.submit_batch([("first", 1.0), ("second", 1.0)])
+        other = self.scheduler.submit_job("other", 1.0)
+        
+        def complete(job):
+            job.arrival_time = job.end_time = time.time()
+            job.status = "Completed"
+            self.scheduler.register_job_completion(job)
+        
+        complete(jobs[0])
+        threading.Timer(0.02, complete, [other]).start()
+        self.assertFalse(self.scheduler.wait_for_jobs(jobs, timeout=0.1))
+        
+        threading.Timer(0.02, complete, [jobs[1]]).start()
+        self.assertTrue(self.scheduler.wait_for_jobs(jobs, timeout=1))
+        self.assertTrue(self.scheduler.wait_for_jobs(jobs, timeout=0))
+        self.assertEqual(self.scheduler.completion_watches, [])
+    
+    def test_prompt_shutdown(self):
+        """Test that stopping the scheduler wakes it immediately"""
+        start = time.time()
+        self.scheduler.stop()
+        self.scheduler.join(1)
+        self.assertFalse(self.scheduler.is_alive())
+        self.assertLess(time.time() - start, 0.05)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,145 @@
+import unittest
+import asyncio
+import tempfile
+import threading
+import shutil
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.server import JobServer
+from src.client import JobClient, AsyncJobClient, ServerError
+from src.profiler import PROFILER
+
+class TestJobServer(unittest.TestCase):
+    def setUp(self):
+        """Start a server on a free port in a background event loop"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.server = JobServer(self.scheduler, self.job_queue)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.port = self.call(self.server.start("127.0.0.1", 0))[1]
+
+    def tearDown(self):
+        """Stop the server and its event loop"""
+        self.call(self.server.stop())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def call(self, coroutine):
+        """Run a coroutine on the server loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def test_submit(self):
+        """Test that a submitted job reaches the queue"""
+        with JobClient(port=self.port) as client:
+            job_id = client.submit("job1", 2.5, 3)
+
+        jobs = self.job_queue.get_job_list()
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].job_id, job_id)
+        self.assertEqual(jobs[0].name, "job1")
+        self.assertEqual(jobs[0].exec_time, 2.5)
+        self.assertEqual(jobs[0].priority, 3)
+
+    def test_pipelined_submissions(self):
+        """Test that pipelined requests are answered in order"""
+        with JobClient(port=self.port) as client:
+            ids = client.submit_many([(f"job{i}", 1, i) for i in range(200)])
+            listing = client.list_jobs(limit=5)
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 200)
+        self.assertEqual(listing["queue_size"], 200)
+        self.assertEqual([job["name"] for job in listing["queued"]],
+                         [f"job{i}" for i in range(5)])
+
+    def test_policy_and_stats(self):
+        """Test policy changes and statistics requests"""
+        with JobClient(port=self.port) as client:
+            client.change_policy("SJF")
+            self.assertEqual(client.list_jobs()["policy"], "SJF")
+            with self.assertRaises(ServerError):
+                client.change_policy("LIFO")
+            client.submit("job1", 1)
+            self.assertEqual(client.stats()["total_jobs"], 1)
+
+    def test_profile(self):
+        """Test switching the profiler on and reading its timings remotely"""
+        try:
+            with JobClient(port=self.port) as client:
+                self.assertFalse(client.profile(reset=True)["enabled"])
+                client.profile(enabled=True)
+                client.submit("job1", 1)
+                profile = client.profile(enabled=False)
+        finally:
+            PROFILER.disable()
+            PROFILER.reset()
+
+        self.assertFalse(profile["enabled"])
+        self.assertEqual(profile["timings"]["queue.add_jobs.lock_hold"]["count"], 1)
+
+    def test_invalid_requests(self):
+        """Test that bad requests get errors without closing the connection"""
+        with JobClient(port=self.port) as client:
+            with self.assertRaises(ServerError):
+                client.request({"op": "explode"})
+            with self.assertRaises(ServerError):
+                client.request({"op": "submit", "name": "job1"})
+            client.sock.sendall(b"not json\n")
+            self.assertIn(b'"ok":false', client.file.readline())
+            self.assertEqual(client.submit("job1", 1), self.job_queue.get_job_list()[0].job_id)
+
+    def test_non_finite_submissions(self):
+        """Test that non-finite or out-of-range exec times, cpus and memory are rejected"""
+        with JobClient(port=self.port) as client:
+            for field, value in (("exec_time", "NaN"), ("exec_time", 1e999),
+                                 ("cpus", "NaN"), ("cpus", 1e999),
+                                 ("memory", "NaN"), ("memory", 1e999),
+                                 ("exec_time", -5), ("cpus", 0), ("memory", -1)):
+                request = {"op": "submit", "name": "job1", "exec_time": 1, field: value}
+                with self.assertRaises(ServerError):
+                    client.request(request)
+            self.assertEqual(self.job_queue.get_queue_size(), 0)
+            self.assertEqual(client.submit("job1", 1), self.job_queue.get_job_list()[0].job_id)
+
+    def test_async_client(self):
+        """Test concurrent submissions from the asyncio client"""
+        async def submit_all():
+            client = await AsyncJobClient.connect(port=self.port)
+            ids = await asyncio.gather(*[client.submit(f"job{i}", 1) for i in range(50)])
+            await client.close()
+            return ids
+
+        loop = asyncio.new_event_loop()
+        try:
+            ids = loop.run_until_complete(submit_all())
+        finally:
+            loop.close()
+        self.assertEqual(len(set(ids)), 50)
+        self.assertEqual(self.job_queue.get_queue_size(), 50)
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "Unix sockets not available")
+    def test_unix_socket(self):
+        """Test serving on a Unix socket"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "csubatch.sock")
+            server = JobServer(self.scheduler, self.job_queue)
+            self.call(server.start(path=path))
+            with JobClient(path=path) as client:
+                client.submit("job1", 1)
+            self.call(server.stop())
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(self.job_queue.get_queue_size(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# tests/test_sharded_queue.py
+import unittest
+import threading
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.shardedQueue import ShardedJobQueue
+
+def make_job(name, exec_time, priority=0, arrival_time=0.0):
+    job = Job(name, exec_time, priority)
+    job.arrival_time = arrival_time
+    return job
+
+class TestShardedJobQueue(unittest.TestCase):
+    def test_policy_ordering(self):
+        """Test that a single worker sees jobs in policy order"""
+        queue = ShardedJobQueue(num_shards=2)
+        queue.add_jobs([make_job("job1", 5.0, 1, 1.0),
+                        make_job("job2", 2.0, 3, 2.0),
+                        make_job("job3", 8.0, 2, 3.0)])
+
+        queue.reorder_queue("SJF")
+        self.assertEqual(queue.get_job().name, "job2")
+        queue.reorder_queue("Priority")
+        self.assertEqual(queue.get_job().name, "job3")
+        self.assertEqual(queue.get_job().name, "job1")
+        self.assertEqual(queue.get_queue_size(), 0)
+
+    def test_injector_head_beats_local_shard(self):
+        """Test that a better injected job runs before the worker's own queue"""
+        queue = ShardedJobQueue(num_shards=1, batch_size=4)
+        queue.reorder_queue("SJF")
+        queue.add_jobs([make_job(f"long{i}", 10.0 + i) for i in range(8)])
+        self.assertEqual(queue.get_job().name, "long0")  # takes a batch into the shard
+
+        queue.add_jobs([make_job("short", 1.0)])
+        self.assertEqual(queue.get_job().name, "short")
+        self.assertEqual(queue.get_job().name, "long1")
+
+    def test_work_stealing(self):
+        """Test that an idle worker steals from another worker's shard"""
+        queue = ShardedJobQueue(num_shards=2)
+        queue.add_job(make_job("first", 1.0, arrival_time=1.0))
+        self.assertEqual(queue.get_job().name, "first")
+        # Jobs added by a worker go to its own shard
+        for i in range(4):
+            queue.add_job(make_job(f"job{i}", 1.0, arrival_time=2.0 + i))
+
+        stolen = []
+        thief = threading.Thread(target=lambda: stolen.append(queue.get_job()))
+        thief.start()
+        thief.join(1)
+        self.assertEqual(stolen[0].name, "job0")
+        self.assertEqual(queue.get_queue_size(), 3)
+        self.assertEqual([job.name for job in queue.get_job_list()], ["job1", "job2", "job3"])
+
+    def test_close_wakes_consumers(self):
+        """Test that closing the queue releases blocked workers"""
+        queue = ShardedJobQueue(num_shards=2)
+        results = []
+        workers = [threading.Thread(target=lambda: results.append(queue.get_job()))
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+
+        queue.close()
+        for worker in workers:
+            worker.join(1)
+            self.assertFalse(worker.is_alive())
+        self.assertEqual(results, [None, None, None])
+
+    def test_should_preempt(self):
+        """Test SRTF preemption against the worker's shard and the injector"""
+        queue = ShardedJobQueue(num_shards=2)
+        queue.reorder_queue("SRTF")
+        running = make_job("running", 5.0)
+        running.remaining_time = 3.0
+        self.assertFalse(queue.should_preempt(running, 0.5))
+
+        queue.add_job(make_job("long", 4.0))
+        self.assertFalse(queue.should_preempt(running, 0.5))
+        queue.add_job(make_job("short", 1.0))
+        self.assertTrue(queue.should_preempt(running, 0.5))
+
+    def test_placement(self):
+        """Test that a worker waiting for resources is woken when they are freed"""
+        queue = ShardedJobQueue(num_shards=2)
+        free = [2]
+
+        def place(job, position=0):
+            if job.cpus > free[0]:
+                return False
+            free[0] -= job.cpus
+            return True
+
+        queue.add_jobs([make_job("wide", 1.0), make_job("narrow", 2.0)])
+        queue.get_job_list()[0].cpus = 4
+        self.assertEqual(queue.get_job(place).name, "narrow")
+
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(queue.get_job(place)))
+        waiter.start()
+        waiter.join(0.1)
+        self.assertTrue(waiter.is_alive())
+
+        free[0] = 4
+        queue.wake()
+        waiter.join(1)
+        self.assertEqual(results[0].name, "wide")
+
+    def test_concurrent_producers_and_consumers(self):
+        """Test that every job is delivered exactly once under contention"""
+        queue = ShardedJobQueue(num_shards=4, batch_size=8)
+        num_producers, jobs_per_producer = 4, 500
+        received = []
+        lock = threading.Lock()
+
+        def produce(p):
+            for i in range(jobs_per_producer):
+                queue.add_job(Job(f"p{p}_{i}", 1.0))
+
+        def consume():
+            while True:
+                job = queue.get_job()
+                if job is None:
+                    break
+                with lock:
+                    received.append(job.name)
+
+        consumers = [threading.Thread(target=consume) for _ in range(4)]
+        producers = [threading.Thread(target=produce, args=(p,)) for p in range(num_producers)]
+        for thread in consumers + producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        queue.close()
+        for thread in consumers:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertEqual(len(received), num_producers * jobs_per_producer)
+        self.assertEqual(len(set(received)), num_producers * jobs_per_producer)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import time
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job import Job
+from src.queueManager import JobQueue, POLICIES
+from performance.simulator import Simulator, SimulationQueue, simulate
+from performance.workload import SyntheticWorkload
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        # All jobs arrive together so only the policy decides the order
+        self.workload = [
+            ("job1", 5.0, 1, 0.0),
+            ("job2", 2.0, 3, 0.0),
+            ("job3", 8.0, 2, 0.0),
+        ]
+    
+    def test_policy_order(self):
+        """Test that the simulated order follows the queue policy"""
+        self.assertEqual(simulate(self.workload, "FCFS")["execution_order"],
+                         ["job1", "job2", "job3"])
+        self.assertEqual(simulate(self.workload, "SJF")["execution_order"],
+                         ["job2", "job1", "job3"])
+        self.assertEqual(simulate(self.workload, "Priority")["execution_order"],
+                         ["job2", "job3", "job1"])
+    
+    def test_virtual_clock(self):
+        """Test response times and duration on the virtual clock"""
+        results = simulate(self.workload, "SJF")
+        
+        self.assertEqual(results["num_jobs"], 3)
+        self.assertEqual(results["response_times"], [2.0, 7.0, 15.0])
+        self.assertEqual(results["waiting_times"], [0.0, 2.0, 7.0])
+        self.assertEqual(results["test_duration"], 15.0)
+        self.assertAlmostEqual(results["avg_response_time"], 8.0)
+        self.assertAlmostEqual(results["throughput"], 0.2)
+    
+    def test_multiple_workers(self):
+        """Test that simulated workers run jobs in parallel"""
+        results = simulate(self.workload, "FCFS", num_workers=2)
+        
+        # job1 and job2 start at once, job3 takes the worker job2 frees at t=2
+        self.assertEqual(results["response_times"], [2.0, 5.0, 10.0])
+        self.assertEqual(results["test_duration"], 10.0)
+    
+    def test_idle_gaps(self):
+        """Test that the clock jumps over periods with no work"""
+        results = simulate([("job1", 1.0, 0, 0.0), ("job2", 1.0, 0, 100.0)])
+        
+        self.assertEqual(results["response_times"], [1.0, 1.0])
+        self.assertEqual(results["test_duration"], 101.0)
+    
+    def test_preemption(self):
+        """Test that short and urgent jobs preempt a long running job"""
+        workload = [("long", 8.0, 1, 0.0), ("short", 1.0, 5, 1.0), ("mid", 3.0, 3, 2.0)]
+        
+        # Without preemption every job waits for the long one
+        self.assertEqual(simulate(workload, "SJF")["response_times"], [8.0, 8.0, 10.0])
+        
+        for policy in ("SRTF", "PreemptivePriority"):
+            results = simulate(workload, policy)
+            self.assertEqual(results["response_times"], [1.0, 3.0, 12.0])
+            self.assertEqual(results["preemptions"], 1)
+            self.assertEqual(results["test_duration"], 12.0)
+    
+    def test_round_robin(self):
+        """Test that RR shares the worker one quantum at a time"""
+        workload = [("long", 8.0, 1, 0.0), ("short", 1.0, 5, 1.0), ("mid", 3.0, 3, 2.0)]
+        results = simulate(workload, "RR", quantum=1.0)
+        
+        self.assertEqual(results["execution_order"], ["long", "short", "mid"])
+        self.assertEqual(results["response_times"], [1.0, 6.0, 12.0])
+        self.assertEqual(results["start_times"], [0.0, 1.0, 3.0])
+    
+    def test_aging_bounds_starvation(self):
+        """Test that aging bounds the wait of a low-priority job under constant load"""
+        stream = [(f"high{i}", 1.0, 5, i * 0.9) for i in range(100)]
+        workload = sorted(stream + [("low", 2.0, 1, 0.5)], key=lambda job: job[3])
+        
+        starved = simulate(workload, "Priority")
+        aged = simulate(workload, "Priority", aging_rate=0.5)
+        
+        self.assertGreater(starved["latency"]["waiting_time"]["max"], 80.0)
+        self.assertLess(aged["latency"]["waiting_time"]["max"], 20.0)
+    
+    def test_mlfq(self):
+        """Test that MLFQ lets short jobs overtake a long CPU-bound job"""
+        workload = [("long", 10.0, 0, 0.0), ("short", 0.5, 0, 1.5)]
+        results = simulate(workload, "MLFQ", quantum=1.0)
+        
+        # long uses its 1s slice at level 0, then short preempts its 2s slice
+        self.assertEqual(results["response_times"], [0.5, 10.5])
+        self.assertEqual(results["preemptions"], 1)
+    
+    def test_simulation_queue_order(self):
+        """Test that the lock-free simulation queue serves jobs like a JobQueue"""
+        for policy in POLICIES:
+            orders = []
+            for queue in (JobQueue(aging_rate=0.1), SimulationQueue(aging_rate=0.1)):
+                queue.reorder_queue(policy)
+                for i in range(200):
+                    job = Job(f"job{i}", float(i * 7 % 13 + 1), i % 4)
+                    job.arrival_time = float(i % 50)
+                    queue.add_job(job)
+                orders.append([queue.get_job().name for _ in range(200)])
+            self.assertEqual(orders[0], orders[1], policy)
+    
+    def test_scale(self):
+        """Test that a 20k-job workload simulates within a time bound under each kind of policy"""
+        workload = list(SyntheticWorkload(20000, seed=1, rate=3.6))
+        for policy in ("FCFS", "SRTF", "RR"):
+            start_time = time.perf_counter()
+            results = simulate(workload, policy, num_workers=4)
+            elapsed = time.perf_counter() - start_time
+            
+            self.assertEqual(results["num_jobs"], 20000)
+            # About 0.5 s here; the bound leaves room for slow machines
+            self.assertLess(elapsed, 5.0, policy)
+    
+    def test_unknown_policy(self):
+        """Test that an unknown policy is rejected"""
+        with self.assertRaises(ValueError):
+            Simulator("INVALID")
+
+if __name__ == '__main__':
+    unittest.main()
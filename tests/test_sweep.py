@@ -0,0 +1,61 @@
+import unittest
+import tempfile
+import json
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from performance.sweep import make_grid, run_sweep, aggregate, save_sweep, SWEEP_METRICS
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        """Set up a small grid"""
+        self.grid = make_grid(["FCFS", "SJF"], [1, 2], [0.5, 0.9], 3, num_jobs=200)
+    
+    def test_grid(self):
+        """Test that the grid covers every combination and seed"""
+        self.assertEqual(len(self.grid), 2 * 2 * 2 * 3)
+        self.assertEqual({point["seed"] for point in self.grid}, {0, 1, 2})
+        with self.assertRaises(ValueError):
+            make_grid(["INVALID"], [1], [0.5], 1)
+    
+    def test_process_pool_matches_serial(self):
+        """Test that runs in a process pool match runs in this process"""
+        serial = run_sweep(self.grid, processes=1)
+        parallel = run_sweep(self.grid, processes=2)
+        
+        for a, b in zip(serial, parallel):
+            del a["wall_time"], b["wall_time"]
+        self.assertEqual(serial, parallel)
+    
+    def test_aggregate(self):
+        """Test aggregation over seeds and the columnar results file"""
+        runs = run_sweep(self.grid, processes=1)
+        summary = aggregate(runs)
+        
+        self.assertEqual(len(summary), 8)
+        self.assertTrue(all(row["seeds"] == 3 for row in summary))
+        for row in summary:
+            group = [run["avg_response_time"] for run in runs
+                     if (run["policy"], run["workers"], run["load"]) == (row["policy"], row["workers"], row["load"])]
+            self.assertAlmostEqual(row["avg_response_time"], sum(group) / 3)
+            self.assertGreater(row["avg_response_time_ci"], 0)
+        
+        # The same seeds give every policy the same jobs, and SJF wins on average
+        by_point = {(row["policy"], row["workers"], row["load"]): row for row in summary}
+        self.assertLess(by_point[("SJF", 1, 0.9)]["avg_response_time"],
+                        by_point[("FCFS", 1, 0.9)]["avg_response_time"])
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = save_sweep(runs, summary, {"seeds": 3}, os.path.join(directory, "sweep.json"))
+            with open(path) as f:
+                saved = json.load(f)
+        self.assertEqual(len(saved["runs"]["policy"]), 24)
+        self.assertEqual(saved["summary"]["policy"], [row["policy"] for row in summary])
+        for metric in SWEEP_METRICS:
+            self.assertEqual(len(saved["summary"][f"{metric}_ci"]), 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import contextlib
+import io
+import tempfile
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from src.dispatcher import DispatcherPool
+from src.ui import CSUbatchUI
+
+class TestCSUbatchUI(unittest.TestCase):
+    def setUp(self):
+        """Set up a UI over a queue and workers that are never started"""
+        self.job_queue = JobQueue()
+        self.scheduler = Scheduler(self.job_queue)
+        self.ui = CSUbatchUI(self.scheduler, DispatcherPool(self.job_queue, self.scheduler),
+                             self.job_queue)
+
+    def run_command(self, line):
+        """Run one command line and return what it printed"""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.ui.onecmd(line)
+        return output.getvalue()
+
+    def test_run(self):
+        """Test submitting a job"""
+        output = self.run_command("run job1 2 1")
+        self.assertIn("Job job1 was submitted", output)
+        self.assertEqual(self.job_queue.get_queue_size(), 1)
+
+    def test_run_invalid_dependency(self):
+        """Test that a non-integer after= id is reported instead of raised"""
+        output = self.run_command("run job1 1 after=abc")
+        self.assertIn("Error: Invalid parameters", output)
+        self.assertIn("Usage: run", output)
+        self.assertEqual(self.job_queue.get_queue_size(), 0)
+
+    def test_run_invalid_values(self):
+        """Test that NaN, infinite and negative times are rejected"""
+        for line in ("run job1 nan", "run job1 inf", "run job1 -5", "run job1 1 0 0",
+                     "run job1 1 0 1 nan"):
+            self.assertIn("Error: Invalid parameters", self.run_command(line))
+        self.assertEqual(self.job_queue.get_queue_size(), 0)
+        self.assertIn("Expected waiting time: 0.00", self.run_command("run job1 1"))
+
+    def test_runbatch_skips_invalid_lines(self):
+        """Test that runbatch submits the valid lines of a file and skips the rest"""
+        path = os.path.join(tempfile.mkdtemp(), "jobs.txt")
+        with open(path, "w") as f:
+            f.write("good1 1\nnan_time nan\ninf_time inf\nnegative -5\n"
+                    "nan_memory 1 0 1 nan\ngood2 2 1\n")
+        output = self.run_command(f"runbatch {path}")
+
+        self.assertEqual(output.count("Warning: Skipping invalid line"), 4)
+        self.assertEqual([job.name for job in self.job_queue.get_job_list()], ["good1", "good2"])
+
+if __name__ == '__main__':
+    unittest.main()
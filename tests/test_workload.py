@@ -0,0 +1,168 @@
+import unittest
+import itertools
+import statistics
+import tempfile
+import gzip
+import sys
+import os
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.queueManager import JobQueue
+from src.scheduler import Scheduler
+from performance.workload import (SWFTrace, CSVTrace, SyntheticWorkload, open_workload,
+                                  write_csv, replay)
+from performance.simulator import simulate
+
+SWF_TRACE = """; Version: 2.2
+; Computer: test cluster
+1 100 5 30 4 -1 2048 4 60 -1 1 1 1 -1 2 -1 -1 -1
+2 110 0 -1 -1 -1 -1 8 120 1024 5 1 1 -1 1 -1 -1 -1
+3 125 3 -1 2 -1 -1 -1 45 -1 0 2 1 -1 -1 -1 -1 -1
+
+4 140 0 10 1 -1 -1 1 20 512 1 2 1 -1 0 -1 -1 -1
+"""
+
+class TestTraces(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory for trace files"""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        self.directory.cleanup()
+
+    def path(self, name):
+        """Get the path of a file in the scratch directory"""
+        return os.path.join(self.directory.name, name)
+
+    def test_swf(self):
+        """Test that SWF lines become jobs relative to the first submit"""
+        path = self.path("trace.swf.gz")
+        with gzip.open(path, "wt") as stream:
+            stream.write(SWF_TRACE)
+
+        trace = open_workload(path)
+        # The cancelled job is skipped, an unknown run time falls back to the request
+        self.assertEqual(list(trace), [("job1", 30.0, 2, 0.0), ("job3", 45.0, 0, 25.0),
+                                       ("job4", 10.0, 0, 40.0)])
+        self.assertEqual(list(trace), list(trace))
+
+        jobs = list(SWFTrace(path, with_resources=True))
+        self.assertEqual(jobs[0][4:], (4, 8.0))
+        self.assertEqual(jobs[1][4:], (2, 0.0))
+        self.assertEqual(jobs[2][4:], (1, 0.5))
+
+    def test_swf_out_of_order(self):
+        """Test that a trace whose submit times go backwards is rejected"""
+        path = self.path("trace.swf")
+        with open(path, "w") as stream:
+            stream.write("1 50 0 10 1\n2 40 0 10 1\n")
+        with self.assertRaises(ValueError):
+            list(SWFTrace(path))
+
+    def test_csv(self):
+        """Test reading a job log with its own column names"""
+        path = self.path("log.csv")
+        with open(path, "w") as stream:
+            stream.write("id,submitted,runtime,cores\n"
+                         "a,0,1.5,2\n"
+                         "b,0.5,2.5,1\n"
+                         "c,oops,1,1\n")
+        trace = CSVTrace(path, {"name": "id", "arrival_time": "submitted",
+                                "exec_time": "runtime", "cpus": "cores"})
+        self.assertEqual(list(trace), [("a", 1.5, 0, 0.0, 2), ("b", 2.5, 0, 0.5, 1)])
+
+        with self.assertRaises(ValueError):
+            list(CSVTrace(path))
+
+    def test_csv_round_trip(self):
+        """Test that a written workload reads back unchanged"""
+        workload = SyntheticWorkload(200, seed=3, priorities={1: 1, 5: 1})
+        path = self.path("workload.csv")
+
+        self.assertEqual(write_csv(workload, path), 200)
+        self.assertEqual(list(CSVTrace(path)), [job + (1, 0.0) for job in workload])
+        self.assertEqual(simulate(CSVTrace(path), "SJF", 2)["num_jobs"], 200)
+
+
+class TestSyntheticWorkload(unittest.TestCase):
+    def test_seeded(self):
+        """Test that a seed fixes the jobs and arrivals are sorted"""
+        jobs = list(SyntheticWorkload(500, seed=1, arrivals="bursty", runtime="pareto"))
+
+        self.assertEqual(jobs, list(SyntheticWorkload(500, seed=1, arrivals="bursty", runtime="pareto")))
+        self.assertNotEqual(jobs, list(SyntheticWorkload(500, seed=2, arrivals="bursty", runtime="pareto")))
+        arrivals = [job[3] for job in jobs]
+        self.assertEqual(arrivals, sorted(arrivals))
+
+    def test_rates_and_tails(self):
+        """Test the mean rate, burstiness and tail of the generated jobs"""
+        poisson = list(SyntheticWorkload(20000, seed=1, rate=4.0, runtime="exponential"))
+        bursty = list(SyntheticWorkload(20000, seed=1, rate=4.0, arrivals="bursty", runtime="pareto"))
+
+        for jobs in (poisson, bursty):
+            self.assertAlmostEqual(len(jobs) / jobs[-1][3], 4.0, delta=0.6)
+
+        def variation(jobs):
+            gaps = [b[3] - a[3] for a, b in zip(jobs, jobs[1:])]
+            return statistics.pstdev(gaps) / statistics.mean(gaps)
+
+        # Exponential gaps have a coefficient of variation of 1; bursts raise it
+        self.assertAlmostEqual(variation(poisson), 1.0, delta=0.05)
+        self.assertGreater(variation(bursty), 1.5)
+
+        exponential = max(job[1] for job in poisson)
+        pareto = max(job[1] for job in bursty)
+        self.assertGreater(pareto, 5 * exponential)
+
+    def test_priority_mix(self):
+        """Test that priorities follow the given weights"""
+        jobs = list(SyntheticWorkload(10000, seed=1, priorities={1: 3, 5: 1}))
+        counts = {level: sum(1 for job in jobs if job[2] == level) for level in (1, 5)}
+
+        self.assertEqual(sum(counts.values()), 10000)
+        self.assertAlmostEqual(counts[1] / 10000, 0.75, delta=0.02)
+
+    def test_endless(self):
+        """Test that a workload without a job count can be sliced"""
+        jobs = list(itertools.islice(SyntheticWorkload(None, seed=1), 10))
+        self.assertEqual(jobs, list(SyntheticWorkload(10, seed=1)))
+
+    def test_invalid(self):
+        """Test that unknown distributions are rejected"""
+        with self.assertRaises(ValueError):
+            SyntheticWorkload(10, runtime="gaussian")
+        with self.assertRaises(ValueError):
+            SyntheticWorkload(10, arrivals="periodic")
+
+
+class TestReplay(unittest.TestCase):
+    def test_replay_on_virtual_clock(self):
+        """Test that jobs are submitted at their scaled arrival times, in batches"""
+        job_queue = JobQueue()
+        scheduler = Scheduler(job_queue)
+        now = [0.0]
+        batches = []
+        submit_batch = scheduler.submit_batch
+
+        def record(specs):
+            batches.append((now[0], [spec[0] for spec in specs]))
+            return submit_batch(specs)
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        scheduler.submit_batch = record
+        workload = [("a", 4.0, 0, 10.0), ("b", 2.0, 0, 10.0), ("c", 6.0, 1, 30.0, 2, 64.0)]
+        submitted = replay(workload, scheduler, 0.5, clock=lambda: now[0], sleep=sleep)
+
+        self.assertEqual(submitted, 3)
+        self.assertEqual(batches, [(0.0, ["a", "b"]), (10.0, ["c"])])
+        jobs = [job_queue.get_job() for _ in range(3)]
+        self.assertEqual([job.exec_time for job in jobs], [2.0, 1.0, 3.0])
+        self.assertEqual((jobs[2].cpus, jobs[2].memory), (2, 64.0))
+
+if __name__ == "__main__":
+    unittest.main()